@@ -1,11 +1,15 @@
 """Contains classes which define and implement molecule-operator data units."""
 
 import builtins
+import collections
 import collections.abc
 import io
 import pickle
+import sys
 import typing
+import weakref
 
+import numpy
 import rdkit
 import rdkit.Chem
 import rdkit.Chem.rdchem
@@ -52,30 +56,77 @@ def _loads(string_in: bytes) -> typing.Any:
     #     """
 
 
+# molecules restored from pickles, so that loading the same molecule again
+# (e.g. products returned by worker processes) shares one object and blob
+_loaded_mols: weakref.WeakValueDictionary[
+    tuple[type, str], interfaces.MolDatRDKit
+] = weakref.WeakValueDictionary()
+
+
 @typing.final
 class MolDatBasicV1(interfaces.MolDatRDKit):
     """
-    Version of MolDatRDKit which caches only SMILES and blob.
+    Version of MolDatRDKit which caches SMILES and blob.
+
+    InChIKey and element data are cached on first use.
 
     Speeds: 5
     """
 
-    __slots__ = ("_blob", "_smiles")
+    __slots__ = (
+        "_atomic_numbers",
+        "_blob",
+        "_element_counts",
+        "_inchikey",
+        "smiles",
+        "uid",
+        "__weakref__",
+    )
+    _atomic_numbers: numpy.ndarray
     _blob: bytes
-    _smiles: str
+    _element_counts: numpy.ndarray
+    _inchikey: str
+    smiles: str
+    uid: str
 
     def __init__(
         self,
         molecule: rdkit.Chem.rdchem.Mol | str | bytes,
         sanitize: bool = True,
         neutralize: bool = False,
+        assign_stereo: bool = True,
     ) -> None:
-        rdkitmol = self._processinput(molecule, sanitize, neutralize)
+        rdkitmol = self._processinput(
+            molecule, sanitize, neutralize, assign_stereo
+        )
         self._buildfrommol(rdkitmol)
 
     def _buildfrommol(self, in_val: rdkit.Chem.rdchem.Mol) -> None:
         self._blob = in_val.ToBinary()
-        self._smiles = rdkit.Chem.rdmolfiles.MolToSmiles(in_val)
+        # interned so that every copy of a molecule shares one uid object;
+        # uid lookups and comparisons then mostly resolve by identity.  Both
+        # are plain slots rather than properties since they are read
+        # constantly during expansion
+        self.smiles = self.uid = sys.intern(
+            rdkit.Chem.rdmolfiles.MolToSmiles(in_val)
+        )
+
+    @property
+    def atomic_numbers(self) -> numpy.ndarray:
+        # left unset until first use, which also keeps older pickles loadable
+        try:
+            return self._atomic_numbers
+        except AttributeError:
+            self._atomic_numbers = super().atomic_numbers
+            return self._atomic_numbers
+
+    @property
+    def element_counts(self) -> numpy.ndarray:
+        try:
+            return self._element_counts
+        except AttributeError:
+            self._element_counts = super().element_counts
+            return self._element_counts
 
     @property
     def blob(self) -> bytes:
@@ -83,19 +134,50 @@ class MolDatBasicV1(interfaces.MolDatRDKit):
 
     @property
     def inchikey(self) -> str:
-        return rdkit.Chem.rdinchi.MolToInchiKey(self.rdkitmol)
+        try:
+            return self._inchikey
+        except AttributeError:
+            self._inchikey = rdkit.Chem.rdinchi.MolToInchiKey(self.rdkitmol)
+            return self._inchikey
 
     @property
     def rdkitmol(self) -> rdkit.Chem.rdchem.Mol:
         return rdkit.Chem.rdchem.Mol(self._blob)
 
-    @property
-    def smiles(self) -> str:
-        return self._smiles
-
-    @property
-    def uid(self) -> interfaces.Identifier:
-        return self._smiles
+    @classmethod
+    def _from_cached(
+        cls, blob: bytes, smiles: str, inchikey: typing.Optional[str]
+    ) -> "MolDatBasicV1":
+        loaded = _loaded_mols.get((cls, smiles))
+        if loaded is not None:
+            return typing.cast(MolDatBasicV1, loaded)
+        self = cls.__new__(cls)
+        self._blob = blob
+        self.smiles = self.uid = sys.intern(smiles)
+        if inchikey is not None:
+            self._inchikey = inchikey
+        _loaded_mols[cls, self.smiles] = self
+        return self
+
+    def __setstate__(self, state: tuple[None, dict[str, typing.Any]]) -> None:
+        # pickles written before __reduce__ was added hold the default slot
+        # state, with the SMILES string under its old "_smiles" slot
+        slots = state[1]
+        self._blob = slots["_blob"]
+        self.smiles = self.uid = sys.intern(slots["_smiles"])
+        _loaded_mols.setdefault((type(self), self.smiles), self)
+
+    def __reduce__(self):
+        # cached values are restored directly on load; element data is
+        # cheap to recompute and is left out of the pickle
+        try:
+            inchikey: typing.Optional[str] = self._inchikey
+        except AttributeError:
+            inchikey = None
+        return (
+            MolDatBasicV1._from_cached,
+            (self._blob, self.smiles, inchikey),
+        )
 
     def __repr__(self) -> str:
         return f"MolDatBasic('{self.smiles}')"
@@ -109,50 +191,113 @@ class MolDatBasicV2(interfaces.MolDatRDKit):
     Speeds: 1,3,4,6
     """
 
-    __slots__ = ("_blob", "_inchikey", "_rdkitmol", "_smiles")
+    __slots__ = (
+        "_atomic_numbers",
+        "_blob",
+        "_element_counts",
+        "_inchikey",
+        "_rdkitmol",
+        "smiles",
+        "uid",
+        "__weakref__",
+    )
+    _atomic_numbers: numpy.ndarray
     _blob: typing.Optional[bytes]
+    _element_counts: numpy.ndarray
     _inchikey: typing.Optional[str]
     _rdkitmol: rdkit.Chem.rdchem.Mol
-    _smiles: str
+    smiles: str
+    uid: str
 
     def __init__(
         self,
         molecule: rdkit.Chem.rdchem.Mol | str | bytes,
         sanitize: bool = True,
         neutralize: bool = False,
+        assign_stereo: bool = True,
     ) -> None:
         self._blob = None
         self._inchikey = None
-        rdkitmol = self._processinput(molecule, sanitize, neutralize)
+        rdkitmol = self._processinput(
+            molecule, sanitize, neutralize, assign_stereo
+        )
         self._buildfrommol(rdkitmol)
 
     def _buildfrommol(self, in_val: rdkit.Chem.rdchem.Mol) -> None:
         self._rdkitmol = in_val
-        self._smiles = rdkit.Chem.rdmolfiles.MolToSmiles(in_val)
+        self.smiles = self.uid = sys.intern(
+            rdkit.Chem.rdmolfiles.MolToSmiles(in_val)
+        )
+
+    @property
+    def atomic_numbers(self) -> numpy.ndarray:
+        try:
+            return self._atomic_numbers
+        except AttributeError:
+            self._atomic_numbers = super().atomic_numbers
+            return self._atomic_numbers
+
+    @property
+    def element_counts(self) -> numpy.ndarray:
+        try:
+            return self._element_counts
+        except AttributeError:
+            self._element_counts = super().element_counts
+            return self._element_counts
 
     @property
     def blob(self) -> bytes:
         if self._blob is None:
-            self._blob = self._rdkitmol.ToBinary()
+            self._blob = self.rdkitmol.ToBinary()
         return self._blob
 
     @property
     def inchikey(self) -> str:
         if self._inchikey is None:
-            self._inchikey = rdkit.Chem.rdinchi.MolToInchiKey(self._rdkitmol)
+            self._inchikey = rdkit.Chem.rdinchi.MolToInchiKey(self.rdkitmol)
         return self._inchikey
 
     @property
     def rdkitmol(self) -> rdkit.Chem.rdchem.Mol:
-        return self._rdkitmol
-
-    @property
-    def smiles(self) -> str:
-        return self._smiles
-
-    @property
-    def uid(self) -> str:
-        return self._smiles
+        # unset after unpickling until first use
+        try:
+            return self._rdkitmol
+        except AttributeError:
+            assert self._blob is not None
+            self._rdkitmol = rdkit.Chem.rdchem.Mol(self._blob)
+            return self._rdkitmol
+
+    @classmethod
+    def _from_cached(
+        cls, blob: bytes, smiles: str, inchikey: typing.Optional[str]
+    ) -> "MolDatBasicV2":
+        loaded = _loaded_mols.get((cls, smiles))
+        if loaded is not None:
+            return typing.cast(MolDatBasicV2, loaded)
+        self = cls.__new__(cls)
+        self._blob = blob
+        self._inchikey = inchikey
+        self.smiles = self.uid = sys.intern(smiles)
+        _loaded_mols[cls, self.smiles] = self
+        return self
+
+    def __setstate__(self, state: tuple[None, dict[str, typing.Any]]) -> None:
+        # pickles written before __reduce__ was added hold the default slot
+        # state, with the SMILES string under its old "_smiles" slot
+        slots = state[1]
+        self._blob = slots.get("_blob")
+        self._inchikey = slots.get("_inchikey")
+        if "_rdkitmol" in slots:
+            self._rdkitmol = slots["_rdkitmol"]
+        self.smiles = self.uid = sys.intern(slots["_smiles"])
+        _loaded_mols.setdefault((type(self), self.smiles), self)
+
+    def __reduce__(self):
+        # the RDKit molecule is rebuilt from the blob only when accessed
+        return (
+            MolDatBasicV2._from_cached,
+            (self.blob, self.smiles, self._inchikey),
+        )
 
     def __repr__(self) -> str:
         return f'MolDatBasic("{self.smiles}")'
@@ -191,11 +336,13 @@ class OpDatBasic(interfaces.OpDatRDKit):
         "_drop_errors",
         "_rdkitrxn",
         "_smarts",
+        "_template_elements",
         "_templates",
         "_uid",
     )
 
     _rdkitrxn: rdkit.Chem.rdChemReactions.ChemicalReaction
+    _template_elements: tuple[tuple[tuple[int, int], ...], ...]
     _templates: typing.Optional[tuple[rdkit.Chem.rdchem.Mol, ...]]
     _engine: interfaces.NetworkEngine
 
@@ -266,6 +413,18 @@ class OpDatBasic(interfaces.OpDatRDKit):
         if self._templates is None:
             self._templates = self._build_templates()
         if isinstance(mol, interfaces.MolDatRDKit):
+            # most molecules do not fit most templates; one lacking enough
+            # atoms of an element the template names is rejected without a
+            # substructure match
+            try:
+                template_elements = self._template_elements
+            except AttributeError:
+                template_elements = self._build_template_elements()
+                self._template_elements = template_elements
+            element_counts = mol.element_counts
+            for proton_number, num_atoms in template_elements[arg]:
+                if element_counts[proton_number] < num_atoms:
+                    return False
             tempmol = mol.rdkitmol
             if self._kekulize:
                 tempmol = rdkit.Chem.rdchem.Mol(tempmol)
@@ -279,6 +438,26 @@ class OpDatBasic(interfaces.OpDatRDKit):
     def _build_templates(self) -> tuple[rdkit.Chem.rdchem.Mol, ...]:
         return tuple(self._rdkitrxn.GetReactants())
 
+    def _build_template_elements(
+        self,
+    ) -> tuple[tuple[tuple[int, int], ...], ...]:
+        # RDKit only sets the atomic number of a query atom when every match
+        # must be that element (e.g. not for [C,N] or [!C]); hydrogens are
+        # skipped since molecules usually keep them implicit
+        template_elements = []
+        for template in self._rdkitrxn.GetReactants():
+            counts: collections.Counter[int] = collections.Counter(
+                atom.GetAtomicNum() for atom in template.GetAtoms()
+            )
+            template_elements.append(
+                tuple(
+                    (proton_number, num_atoms)
+                    for proton_number, num_atoms in counts.items()
+                    if proton_number > 1
+                )
+            )
+        return tuple(template_elements)
+
     def _attempt_reaction(
         self, mols: collections.abc.Iterable[rdkit.Chem.rdchem.Mol]
     ) -> collections.abc.Iterable[rdkit.Chem.rdchem.Mol]:
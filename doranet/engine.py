@@ -6,6 +6,7 @@ import gzip
 import os
 import pickle
 import typing
+import weakref
 import xml.dom.minidom
 
 import rdkit.Chem
@@ -83,6 +84,58 @@ class _rdkit_op_init(typing.NamedTuple):
         )
 
 
+class _rdkit_mol_init:
+    """
+    Molecule initializer which reuses live molecules with the same structure.
+
+    Sanitized molecules are pooled by canonical SMILES, so a molecule built
+    again (e.g. the same product from another reaction) is replaced by the
+    instance already in use.  Those built from SMILES strings are also looked
+    up by the input string first, which skips RDKit parsing altogether.  Both
+    pools hold weak references, so molecules are dropped once nothing else
+    refers to them, and neither is pickled.
+    """
+
+    __slots__ = ("_moltype", "_by_input", "_by_smiles")
+
+    def __init__(self, moltype: type[interfaces.MolDatRDKit]) -> None:
+        self._moltype = moltype
+        self._by_input: weakref.WeakValueDictionary[
+            str, interfaces.MolDatRDKit
+        ] = weakref.WeakValueDictionary()
+        self._by_smiles: weakref.WeakValueDictionary[
+            str, interfaces.MolDatRDKit
+        ] = weakref.WeakValueDictionary()
+
+    def __call__(
+        self,
+        molecule: typing.Union[rdkit.Chem.rdchem.Mol, str, bytes],
+        sanitize: bool = True,
+        neutralize: bool = False,
+        assign_stereo: bool = True,
+    ) -> interfaces.MolDatRDKit:
+        if not sanitize or neutralize or not assign_stereo:
+            return self._moltype(
+                molecule=molecule,
+                sanitize=sanitize,
+                neutralize=neutralize,
+                assign_stereo=assign_stereo,
+            )
+        if isinstance(molecule, str):
+            mol = self._by_input.get(molecule)
+            if mol is None:
+                mol = self._pooled(self._moltype(molecule=molecule))
+                self._by_input[molecule] = mol
+            return mol
+        return self._pooled(self._moltype(molecule=molecule))
+
+    def _pooled(self, mol: interfaces.MolDatRDKit) -> interfaces.MolDatRDKit:
+        return self._by_smiles.setdefault(mol.smiles, mol)
+
+    def __reduce__(self):
+        return type(self), (self._moltype,)
+
+
 @dataclasses.dataclass(frozen=True, slots=True)
 class _cartesian_op_init:
     _engine: interfaces.NetworkEngine
@@ -120,6 +173,7 @@ class NetworkEngineBasic(interfaces.NetworkEngine):
 
     __slots__ = (
         "_Mol",
+        "_mol_init",
         "_Op",
         "_Rxn",
         "_speed",
@@ -147,6 +201,7 @@ class NetworkEngineBasic(interfaces.NetworkEngine):
             case _:
                 raise ValueError(f"speed = {speed} is invalid")
 
+        self._mol_init = _rdkit_mol_init(self._Mol)
         self._Op = datatypes.OpDatBasic
         self._speed = speed
         if np != 1:
@@ -160,10 +215,9 @@ class NetworkEngineBasic(interfaces.NetworkEngine):
         molecule: typing.Union[rdkit.Chem.rdchem.Mol, str, bytes],
         sanitize: bool = True,
         neutralize: bool = False,
+        assign_stereo: bool = True,
     ) -> interfaces.MolDatRDKit:
-        return self._Mol(
-            molecule=molecule, sanitize=sanitize, neutralize=neutralize
-        )
+        return self._mol_init(molecule, sanitize, neutralize, assign_stereo)
 
     def Op(
         self,
@@ -190,7 +244,7 @@ class NetworkEngineBasic(interfaces.NetworkEngine):
 
     @property
     def mol(self):
-        return interfaces.MoleculeTypes(self._Mol)
+        return interfaces.MoleculeTypes(self._mol_init)
 
     @property
     def op(self):
@@ -217,6 +271,7 @@ class NetworkEngineBasic(interfaces.NetworkEngine):
             interfaces.ReactionFilterTypes(
                 filters.ReactionFilterMaxAtoms.from_num,
                 filters.GenerationFilter,
+                filters.ReactionFilterMaxElements.from_limits,
             ),
         )
 
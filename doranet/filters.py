@@ -1,35 +1,20 @@
 """Contains classes which implement various filter components."""
 
+import abc
 import collections.abc
 import dataclasses
+import functools
+import operator
+import time
 import typing
 
+import numpy
 import rdkit
 import rdkit.Chem
-import rdkit.Chem.rdqueries
+import rdkit.Chem.rdmolfiles
 
 from doranet import interfaces, metadata
 
-# class AlwaysTrueFilter(interfaces.ReactionFilter):
-#     def __call__(self, operator, reactants, products):
-#         return True
-
-
-# class ChainFilter(interfaces.ReactionFilter):
-#     def __init__(
-#         self, filters: collections.abc.Iterable[interfaces.ReactionFilter]
-#     ):
-#         self._filters = filters
-
-#     def __call__(self, operator, reactants, products):
-#         return all(
-#             (
-#                 filter(operator, reactants, products)
-#                 for filter in self._filters
-#             )  # yo
-#         )
-
-
 # class LessThanNElementTypeFilter(interfaces.ReactionFilter):
 #     def __init__(self, n: int, proton_number: int):
 #         self._n = n
@@ -100,6 +85,9 @@ from doranet import interfaces, metadata
 @dataclasses.dataclass(frozen=True)
 class MolFilterMetaVal(interfaces.MolFilter):
     __slots__ = ("key", "val")
+
+    cost: typing.ClassVar[float] = 0.1
+
     key: collections.abc.Hashable
     val: typing.Any
 
@@ -124,6 +112,9 @@ class MolFilterMetaVal(interfaces.MolFilter):
 @dataclasses.dataclass(frozen=True)
 class MolFilterMetaExist(interfaces.MolFilter):
     __slots__ = ("key",)
+
+    cost: typing.ClassVar[float] = 0.1
+
     key: collections.abc.Hashable
 
     def __call__(
@@ -163,11 +154,31 @@ class MolFilterMetaFunc(interfaces.MolFilter):
         return interfaces.MetaKeyPacket(frozenset(), frozenset((self.key,)))
 
 
+# below this many molecules, numpy call overhead outweighs per-item lookups
+_MIN_VECTOR_BATCH = 48
+
+
 @typing.final
 @dataclasses.dataclass(frozen=True, slots=True)
 class MolFilterIndex(interfaces.MolFilter):
+    cost: typing.ClassVar[float] = 0.1
+
     indices: collections.abc.Container[interfaces.MolIndex]
     whitelist: bool = False
+    _sorted_indices: typing.Optional[numpy.ndarray] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # immutable index collections are also kept as a sorted array, so
+        # that batches are tested with one searchsorted call; mutable ones
+        # may change after construction and always go through `in`
+        sorted_indices = None
+        if isinstance(self.indices, (frozenset, tuple, range)):
+            sorted_indices = numpy.sort(
+                numpy.fromiter(self.indices, dtype=numpy.int64)
+            )
+        object.__setattr__(self, "_sorted_indices", sorted_indices)
 
     def __call__(
         self,
@@ -179,6 +190,31 @@ class MolFilterIndex(interfaces.MolFilter):
             return self.whitelist
         return not self.whitelist
 
+    def filter_batch(
+        self,
+        mols: collections.abc.Sequence[
+            interfaces.DataPacket[interfaces.MolDatBase]
+        ],
+        op: typing.Optional[interfaces.DataPacket[interfaces.OpDatBase]] = None,
+        arg_num: typing.Optional[int] = None,
+    ) -> list[bool]:
+        sorted_indices = self._sorted_indices
+        if (
+            sorted_indices is None
+            or not len(sorted_indices)
+            or len(mols) < _MIN_VECTOR_BATCH
+        ):
+            return [self(mol, op, arg_num) for mol in mols]
+        ids = numpy.fromiter(
+            (mol.i for mol in mols), dtype=numpy.int64, count=len(mols)
+        )
+        pos = numpy.searchsorted(sorted_indices, ids)
+        pos[pos == len(sorted_indices)] = 0
+        listed = sorted_indices[pos] == ids
+        if not self.whitelist:
+            listed = ~listed
+        return listed.tolist()
+
     @property
     def meta_required(self) -> interfaces.MetaKeyPacket:
         return interfaces.MetaKeyPacket()
@@ -220,10 +256,17 @@ class BundleFilterCoreactants(interfaces.BundleFilter):
 @dataclasses.dataclass(frozen=True)
 class CoreactantFilter(interfaces.RecipeFilter):
     __slots__ = ("coreactants",)
+
+    cost: typing.ClassVar[float] = 0.1
+
     coreactants: collections.abc.Container[interfaces.MolIndex]
 
     def __call__(self, recipe: interfaces.RecipeExplicit) -> bool:
-        return not all(mol.i in self.coreactants for mol in recipe.reactants)
+        coreactants = self.coreactants
+        for mol in recipe.reactants:  # noqa: SIM110
+            if mol.i not in coreactants:
+                return True
+        return False
 
     @property
     def meta_required(self) -> interfaces.MetaKeyPacket:
@@ -235,52 +278,589 @@ class CoreactantFilter(interfaces.RecipeFilter):
 class GenerationFilter(metadata.ReactionFilterBase):
     __slots__ = ("max_gens", "gen_key")
 
+    cost: typing.ClassVar[float] = 0.1
+
     max_gens: int
     gen_key: collections.abc.Hashable
 
     def __call__(self, recipe: interfaces.ReactionExplicit) -> bool:
-        return all(
-            mol.meta is not None
-            and self.gen_key in mol.meta
-            and mol.meta[self.gen_key] + 1 < self.max_gens
-            for mol in recipe.reactants
-        )
+        gen_key = self.gen_key
+        max_gens = self.max_gens
+        for mol in recipe.reactants:
+            meta = mol.meta
+            if (
+                meta is None
+                or gen_key not in meta
+                or not meta[gen_key] + 1 < max_gens
+            ):
+                return False
+        return True
 
     @property
     def meta_required(self) -> interfaces.MetaKeyPacket:
         return interfaces.MetaKeyPacket(frozenset((self.gen_key,)))
 
 
+@typing.final
+@dataclasses.dataclass(frozen=True, slots=True)
+class AlwaysTrueFilter(metadata.ReactionFilterBase):
+    cost: typing.ClassVar[float] = 0.0
+    selectivity: typing.ClassVar[float] = 1.0
+
+    def __call__(self, recipe: interfaces.ReactionExplicit) -> bool:
+        return True
+
+    def is_always_true(self) -> bool:
+        return True
+
+
+@functools.lru_cache(maxsize=128)
+def _atomnum_query_mol(proton_number: int) -> rdkit.Chem.rdchem.Mol:
+    # single-atom pattern; matched atom by atom, no generic query atoms kept
+    return rdkit.Chem.rdmolfiles.MolFromSmarts(f"[#{proton_number}]")
+
+
+@functools.lru_cache(maxsize=128)
+def _bounded_match_params(
+    max_matches: int,
+) -> rdkit.Chem.rdchem.SubstructMatchParameters:
+    params = rdkit.Chem.rdchem.SubstructMatchParameters()
+    params.maxMatches = max_matches
+    params.uniquify = False
+    return params
+
+
+# concrete molecule types already known to implement MolDatRDKit; an exact
+# type lookup is much cheaper than isinstance() against the ABC per product
+_rdkit_mol_types: set[type] = set()
+
+
+def _register_rdkit_mol_type(item: interfaces.MolDatBase) -> None:
+    if not isinstance(item, interfaces.MolDatRDKit):
+        raise NotImplementedError(
+            f"""Counting # of atoms in non-RDKit molecules is not yet
+                supported (found {repr(item)})"""
+        )
+    _rdkit_mol_types.add(type(item))
+
+
+class _ReactionFilterProducts(metadata.ReactionFilterBase):
+    """
+    Reaction filter which tests each product molecule independently.
+
+    The same product is generated by many reactions over an expansion, so
+    results are memoized per molecule uid.  The memo is cleared once it
+    holds `max_cache_size` molecules.
+
+    Filters with per-element limits also check each operator once: if a
+    product template adds more atoms of an element than allowed, every
+    reaction of that operator is rejected without looking at its products.
+    """
+
+    __slots__ = ("_product_cache", "_operator_cache")
+
+    _product_cache: dict[interfaces.Identifier, bool]
+    _operator_cache: typing.Optional[dict[interfaces.Identifier, bool]]
+    max_cache_size: typing.ClassVar[int] = 100_000
+
+    @abc.abstractmethod
+    def _product_passes(self, item: interfaces.MolDatBase) -> bool: ...
+
+    def _element_limits(self) -> tuple[tuple[int, int], ...]:
+        return ()
+
+    def _operator_passes(self, op: interfaces.OpDatBase) -> bool:
+        if not isinstance(op, interfaces.OpDatRDKit):
+            return True
+        limits = self._element_limits()
+        for template in op.rdkitrxn.GetProducts():
+            # unmapped template atoms are copied verbatim into the product;
+            # hydrogens are skipped since they may end up implicit
+            counts = collections.Counter(
+                atom.GetAtomicNum()
+                for atom in template.GetAtoms()
+                if atom.GetAtomMapNum() == 0 and atom.GetAtomicNum() != 1
+            )
+            for proton_number, max_atoms in limits:
+                if counts[proton_number] > max_atoms:
+                    return False
+        return True
+
+    def _get_operator_cache(
+        self,
+    ) -> typing.Optional[dict[interfaces.Identifier, bool]]:
+        try:
+            return self._operator_cache
+        except AttributeError:
+            cache = {} if self._element_limits() else None
+            object.__setattr__(self, "_operator_cache", cache)
+            return cache
+
+    def _get_product_cache(self) -> dict[interfaces.Identifier, bool]:
+        try:
+            return self._product_cache
+        except AttributeError:
+            cache: dict[interfaces.Identifier, bool] = {}
+            object.__setattr__(self, "_product_cache", cache)
+            return cache
+
+    def __call__(self, recipe: interfaces.ReactionExplicit) -> bool:
+        operator_cache = self._get_operator_cache()
+        if operator_cache is not None:
+            op = recipe.operator.item
+            op_uid = op.uid
+            op_passes = operator_cache.get(op_uid)
+            if op_passes is None:
+                op_passes = operator_cache[op_uid] = self._operator_passes(op)
+            if not op_passes:
+                return False
+        cache = self._get_product_cache()
+        for mol in recipe.products:
+            item = mol.item
+            uid = item.uid
+            passes = cache.get(uid)
+            if passes is None:
+                if len(cache) >= self.max_cache_size:
+                    cache.clear()
+                passes = cache[uid] = self._product_passes(item)
+            if not passes:
+                return False
+        return True
+
+    def filter_batch(
+        self, recipes: collections.abc.Sequence[interfaces.ReactionExplicit]
+    ) -> list[bool]:
+        # same logic as __call__, but with the memo and bound methods hoisted
+        # out of the loop so the whole batch runs in a single frame
+        cache = self._get_product_cache()
+        cache_get = cache.get
+        product_passes = self._product_passes
+        max_cache_size = self.max_cache_size
+        operator_cache = self._get_operator_cache()
+        results = []
+        append = results.append
+        for recipe in recipes:
+            if operator_cache is not None:
+                op = recipe.operator.item
+                op_uid = op.uid
+                op_passes = operator_cache.get(op_uid)
+                if op_passes is None:
+                    op_passes = operator_cache[op_uid] = self._operator_passes(
+                        op
+                    )
+                if not op_passes:
+                    append(False)
+                    continue
+            passed = True
+            for mol in recipe.products:
+                item = mol.item
+                uid = item.uid
+                passes = cache_get(uid)
+                if passes is None:
+                    if len(cache) >= max_cache_size:
+                        cache.clear()
+                    passes = cache[uid] = product_passes(item)
+                if not passes:
+                    passed = False
+                    break
+            append(passed)
+        return results
+
+
 @dataclasses.dataclass(frozen=True, slots=True)
-class ReactionFilterMaxAtoms(metadata.ReactionFilterBase):
+class ReactionFilterMaxAtoms(_ReactionFilterProducts):
     max_atoms: int
-    query: typing.Any
+    query: typing.Any = None
+    proton_number: typing.Optional[int] = None
+    _match: typing.Optional[
+        tuple[rdkit.Chem.rdchem.Mol, rdkit.Chem.rdchem.SubstructMatchParameters]
+    ] = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # resolved once here so that matching a product needs no cache lookups
+        match = None
+        if self.proton_number is not None:
+            match = (
+                _atomnum_query_mol(self.proton_number),
+                _bounded_match_params(max(self.max_atoms + 1, 1)),
+            )
+        object.__setattr__(self, "_match", match)
 
     @classmethod
     def from_num(
         cls, max_atoms: int, proton_number: typing.Optional[int] = None
     ) -> "ReactionFilterMaxAtoms":
-        if proton_number is None:
-            return ReactionFilterMaxAtoms(max_atoms, None)
-        return ReactionFilterMaxAtoms(
-            max_atoms,
-            rdkit.Chem.rdqueries.AtomNumEqualsQueryAtom(proton_number),
+        return ReactionFilterMaxAtoms(max_atoms, proton_number=proton_number)
+
+    def _product_passes(self, item: interfaces.MolDatBase) -> bool:
+        if type(item) not in _rdkit_mol_types:
+            _register_rdkit_mol_type(item)
+        max_atoms = self.max_atoms
+        rdkitmol = item.rdkitmol  # type: ignore [attr-defined]
+        # a molecule with few enough atoms in total cannot exceed the limit
+        # for any single element, so skip the query match
+        if rdkitmol.GetNumAtoms() <= max_atoms:
+            return True
+        match = self._match
+        if match is not None:
+            # matching stops in C++ as soon as one atom too many is found
+            return len(rdkitmol.GetSubstructMatches(*match)) <= max_atoms
+        query = self.query
+        return query is not None and (
+            len(rdkitmol.GetAtomsMatchingQuery(query)) <= max_atoms
         )
 
-    def __call__(self, recipe: interfaces.ReactionExplicit):
-        for mol in recipe.products:
-            if not isinstance(mol.item, interfaces.MolDatRDKit):
-                raise NotImplementedError(
-                    f"""Counting # of atoms in non-RDKit molecules is not yet
-                        supported (found {repr(mol)})"""
+    def _element_limits(self) -> tuple[tuple[int, int], ...]:
+        if self.proton_number is None:
+            return ()
+        return ((self.proton_number, self.max_atoms),)
+
+    def __reduce__(self):
+        # match arguments are rebuilt on load rather than pickled
+        return (
+            ReactionFilterMaxAtoms,
+            (self.max_atoms, self.query, self.proton_number),
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ReactionFilterMaxElements(_ReactionFilterProducts):
+    """
+    Reject reactions whose products exceed per-element atom limits.
+
+    Equivalent to a conjunction of ReactionFilterMaxAtoms filters, one per
+    element, but each product molecule is only loaded once.
+
+    Parameters
+    ----------
+    limits : tuple[tuple[int, int], ...]
+        Pairs of (proton number, maximum # of atoms of that element).  If an
+        element appears more than once, the lowest limit is used.
+    """
+
+    limits: tuple[tuple[int, int], ...]
+    _matches: tuple[
+        tuple[
+            int,
+            rdkit.Chem.rdchem.Mol,
+            rdkit.Chem.rdchem.SubstructMatchParameters,
+        ],
+        ...,
+    ] = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        merged: dict[int, int] = {}
+        for proton_number, max_atoms in self.limits:
+            merged[proton_number] = min(
+                max_atoms, merged.get(proton_number, max_atoms)
+            )
+        # tightest limits first; once a product has no more atoms than a
+        # limit, every later limit passes as well
+        limits = tuple(sorted(merged.items(), key=lambda item: item[::-1]))
+        object.__setattr__(self, "limits", limits)
+        object.__setattr__(
+            self,
+            "_matches",
+            tuple(
+                (
+                    max_atoms,
+                    _atomnum_query_mol(proton_number),
+                    _bounded_match_params(max(max_atoms + 1, 1)),
                 )
-            if (
-                len(mol.item.rdkitmol.GetAtomsMatchingQuery(self.query))
-                > self.max_atoms
-            ):
+                for proton_number, max_atoms in limits
+            ),
+        )
+
+    @classmethod
+    def from_limits(
+        cls, limits: collections.abc.Mapping[int, int]
+    ) -> "ReactionFilterMaxElements":
+        return ReactionFilterMaxElements(tuple(limits.items()))
+
+    def _product_passes(self, item: interfaces.MolDatBase) -> bool:
+        if type(item) not in _rdkit_mol_types:
+            _register_rdkit_mol_type(item)
+        rdkitmol = item.rdkitmol  # type: ignore [attr-defined]
+        num_atoms = rdkitmol.GetNumAtoms()
+        for max_atoms, query_mol, params in self._matches:
+            if num_atoms <= max_atoms:
+                break
+            if len(rdkitmol.GetSubstructMatches(query_mol, params)) > max_atoms:
                 return False
         return True
 
+    def _element_limits(self) -> tuple[tuple[int, int], ...]:
+        return self.limits
+
+    def __reduce__(self):
+        return (ReactionFilterMaxElements, (self.limits,))
+
+
+def _fuse_element_limits(
+    filters: tuple[metadata.ReactionFilterBase, ...],
+) -> tuple[metadata.ReactionFilterBase, ...]:
+    # per-element limits are merged into one filter which takes the place of
+    # the first of them, so that each product is only loaded once
+    fusable = [
+        f
+        for f in filters
+        if isinstance(f, ReactionFilterMaxElements)
+        or (
+            isinstance(f, ReactionFilterMaxAtoms)
+            and f.proton_number is not None
+        )
+    ]
+    if len(fusable) <= 1:
+        return filters
+    limits: list[tuple[int, int]] = []
+    for f in fusable:
+        if isinstance(f, ReactionFilterMaxElements):
+            limits.extend(f.limits)
+        else:
+            assert f.proton_number is not None
+            limits.append((f.proton_number, f.max_atoms))
+    fused = ReactionFilterMaxElements(tuple(limits))
+    fusable_ids = {id(f) for f in fusable}
+    fused_filters: list[metadata.ReactionFilterBase] = []
+    for f in filters:
+        if id(f) not in fusable_ids:
+            fused_filters.append(f)
+        elif fused is not None:
+            fused_filters.append(fused)
+            fused = None
+    return tuple(fused_filters)
+
+
+def _filter_rank(cost: float, selectivity: float) -> float:
+    # expected cost per rejected reaction; running filters in ascending
+    # order of this rank minimizes expected total cost for independent
+    # filters
+    if selectivity >= 1.0:
+        return float("inf")
+    return cost / (1.0 - selectivity)
+
+
+class ChainFilter(metadata.ReactionFilterBase):
+    """
+    Logical AND of an arbitrary number of reaction filters.
+
+    Filters are evaluated in order and evaluation stops at the first filter
+    which rejects the reaction.
+
+    Parameters
+    ----------
+    filters : collections.abc.Iterable[metadata.ReactionFilterBase]
+        Reaction filters which must all pass.  Nested conjunctions are
+        inlined, filters which compare equal are only evaluated once, and
+        filters which always pass are dropped.  Per-element atom limits are
+        fused into a single ReactionFilterMaxElements.  If any filter always
+        rejects, the chain is reduced to that filter alone.
+    reorder : typing.Literal["static", "adaptive", False] (default: False)
+        If "static", filters are sorted once using their `cost` and
+        `selectivity` hints so that cheap filters likely to reject run first.
+        If "adaptive", filters are additionally re-sorted every
+        `adapt_interval` calls based on measured evaluation time and
+        rejection rate. If False, user-provided order is kept.
+    adapt_interval : int (default: 1024)
+        Number of calls between re-sorts in adaptive mode.
+    """
+
+    __slots__ = ("_filters", "_stats", "_num_calls", "_adapt_interval")
+
+    _filters: tuple[metadata.ReactionFilterBase, ...]
+    _stats: typing.Optional[list[list[float]]]
+    _num_calls: int
+    _adapt_interval: int
+
+    def __init__(
+        self,
+        filters: collections.abc.Iterable[metadata.ReactionFilterBase],
+        reorder: typing.Literal["static", "adaptive", False] = False,
+        adapt_interval: int = 1024,
+    ) -> None:
+        filters = tuple(
+            f
+            for f in _unique_filters(_flatten_and(filters))
+            if not f.is_always_true()
+        )
+        filters = _fuse_element_limits(filters)
+        for f in filters:
+            if f.is_always_false():
+                # nothing else in the chain can change the outcome
+                filters = (f,)
+                reorder = False
+                break
+        if reorder is True:
+            reorder = "static"
+        if reorder not in ("static", "adaptive", False):
+            raise ValueError(f"Unknown reorder mode {reorder!r}")
+        if reorder:
+            filters = tuple(
+                sorted(
+                    filters, key=lambda f: _filter_rank(f.cost, f.selectivity)
+                )
+            )
+        self._filters = filters
+        self._stats = None
+        if reorder == "adaptive":
+            # per filter: [total seconds, calls, rejections]
+            self._stats = [[0.0, 0, 0] for _ in filters]
+        self._num_calls = 0
+        self._adapt_interval = adapt_interval
+        if (
+            type(self) is ChainFilter
+            and self._stats is None
+            and len(filters) <= _MAX_UNROLLED_CHAIN
+        ):
+            # swap in a subclass whose __call__ is unrolled for this length;
+            # longer chains and user subclasses keep the generic loop below
+            self.__class__ = _unrolled_chain_type(len(filters))
+
+    def __call__(self, recipe: interfaces.ReactionExplicit) -> bool:
+        if self._stats is not None:
+            return self._call_adaptive(recipe)
+        for f in self._filters:  # noqa: SIM110
+            if not f(recipe):
+                return False
+        return True
+
+    def _call_adaptive(self, recipe: interfaces.ReactionExplicit) -> bool:
+        perf_counter = time.perf_counter
+        stats = self._stats
+        assert stats is not None
+        result = True
+        for f, stat in zip(self._filters, stats, strict=True):
+            t0 = perf_counter()
+            passed = f(recipe)
+            stat[0] += perf_counter() - t0
+            stat[1] += 1
+            if not passed:
+                stat[2] += 1
+                result = False
+                break
+        self._num_calls += 1
+        if self._num_calls % self._adapt_interval == 0:
+            self._resort()
+        return result
+
+    def _resort(self) -> None:
+        stats = self._stats
+        assert stats is not None
+        order = sorted(
+            range(len(self._filters)),
+            key=lambda i: (
+                stats[i][0] / stats[i][2] if stats[i][2] else float("inf")
+            ),
+        )
+        self._filters = tuple(self._filters[i] for i in order)
+        # halve old measurements so that the order tracks recent behavior
+        self._stats = [
+            [stats[i][0] / 2, stats[i][1] // 2, stats[i][2] // 2] for i in order
+        ]
+
+    def filter_batch(
+        self, recipes: collections.abc.Sequence[interfaces.ReactionExplicit]
+    ) -> list[bool]:
+        results = [True] * len(recipes)
+        # indices of recipes which have passed every filter so far
+        remaining = list(range(len(recipes)))
+        for f in self._filters:
+            if not remaining:
+                break
+            passed = f.filter_batch([recipes[i] for i in remaining])
+            still_remaining = []
+            for i, ok in zip(remaining, passed, strict=True):
+                if ok:
+                    still_remaining.append(i)
+                else:
+                    results[i] = False
+            remaining = still_remaining
+        return results
+
+    @property
+    def filters(self) -> tuple[metadata.ReactionFilterBase, ...]:
+        return self._filters
+
+    def is_always_true(self) -> bool:
+        return not self._filters
+
+    def is_always_false(self) -> bool:
+        return any(f.is_always_false() for f in self._filters)
+
+    def __reduce__(self):
+        # unrolled subclasses are generated at runtime and cannot be pickled
+        # by reference, so always rebuild through ChainFilter
+        reorder = False if self._stats is None else "adaptive"
+        return (ChainFilter, (self._filters, reorder, self._adapt_interval))
+
+    @property
+    def meta_required(self) -> interfaces.MetaKeyPacket:
+        return functools.reduce(
+            operator.add,
+            (f.meta_required for f in self._filters),
+            interfaces.MetaKeyPacket(),
+        )
+
+
+def _flatten_and(
+    filters: collections.abc.Iterable[metadata.ReactionFilterBase],
+) -> collections.abc.Iterator[metadata.ReactionFilterBase]:
+    # nested conjunctions are inlined so that each reaction pays a single
+    # level of dispatch; adaptive chains keep their own statistics
+    for f in filters:
+        if isinstance(f, ChainFilter) and f._stats is None:
+            yield from f._filters
+        elif isinstance(f, metadata.ReactionFilterAnd):
+            yield from _flatten_and((f._filter1, f._filter2))
+        else:
+            yield f
+
+
+def _unique_filters(
+    filters: collections.abc.Iterable[metadata.ReactionFilterBase],
+) -> collections.abc.Iterator[metadata.ReactionFilterBase]:
+    # filters are pure predicates, so a repeated filter cannot reject anything
+    # the first occurrence did not; equal filters are only evaluated once
+    seen_keys: set[collections.abc.Hashable] = set()
+    for f in filters:
+        try:
+            key: collections.abc.Hashable = (type(f), f)
+            hash(key)
+        except TypeError:
+            key = id(f)
+        if key not in seen_keys:
+            seen_keys.add(key)
+            yield f
+
+
+# chains are rarely longer than this, and past it the per-step saving of an
+# unrolled __call__ no longer outweighs generating and keeping another class
+_MAX_UNROLLED_CHAIN = 8
+
+
+@functools.cache
+def _unrolled_chain_type(n: int) -> type[ChainFilter]:
+    names = [f"f{i}" for i in range(n)]
+    lines = ["def __call__(self, recipe):"]
+    if names:
+        lines.append(f"    {', '.join(names)}, = self._filters")
+    for name in names:
+        lines.append(f"    if not {name}(recipe):")
+        lines.append("        return False")
+    lines.append("    return True")
+    namespace: dict[str, typing.Any] = {}
+    exec("\n".join(lines), namespace)
+    return type(ChainFilter)(
+        ChainFilter.__name__,
+        (ChainFilter,),
+        {
+            "__slots__": (),
+            "__call__": namespace["__call__"],
+            "__module__": ChainFilter.__module__,
+            "__qualname__": ChainFilter.__qualname__,
+        },
+    )
+
 
 def ReplaceNewValue(
     key: collections.abc.Hashable, old_value: typing.Any, new_value: typing.Any
@@ -289,6 +869,8 @@ def ReplaceNewValue(
 
 
 class ReplaceBlacklist:
+    __slots__ = ("_blacklist_keys",)
+
     def __init__(
         self,
         blacklist_keys: collections.abc.Collection[collections.abc.Hashable],
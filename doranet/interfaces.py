@@ -4,11 +4,14 @@ import abc
 import base64
 import collections
 import collections.abc
+import concurrent.futures
 import dataclasses
 import enum
 import functools
 import gzip
+import heapq
 import itertools
+import math
 import operator
 import os
 import pickle
@@ -181,6 +184,11 @@ class MolDatRDKit(MolDatBase):
     MolDat, and thus must be subclassed only by implementations with
     @typing.final.
 
+    The uid is compared and hashed constantly during expansion, so
+    implementations should compute it (and the canonical SMILES) once at
+    construction and store it in a slot.  InChIKey generation is costly and
+    should be cached on first use.
+
     Parameters
     ----------
     molecule : rdkit.Chem.rdchem.Mol | str
@@ -193,7 +201,9 @@ class MolDatRDKit(MolDatBase):
 
     Attributes
     ----------
+    atomic_numbers : numpy.ndarray
     blob : bytes
+    element_counts : numpy.ndarray
     inchikey : str
     rdkitmol : rdkit.Chem.rdchem.Mol
     smiles : str
@@ -205,6 +215,11 @@ class MolDatRDKit(MolDatBase):
         Should be True if you want hydrogens to be added/subtracted to
         neutralize a molecule and input is a SMILES string or non-neutralized
         molecule.
+    assign_stereo : bool (default: True)
+        Whether sanitization also assigns and cleans up stereochemistry.  CIP
+        ranking dominates sanitization time for long molecules; when False,
+        stereochemistry is only perceived on demand (e.g. when writing
+        SMILES), and invalid stereo flags are kept on the stored molecule.
     """
 
     __slots__ = ()
@@ -215,6 +230,7 @@ class MolDatRDKit(MolDatBase):
         molecule: typing.Union[rdkit.Chem.rdchem.Mol, str],
         sanitize: bool = True,
         neutralize: bool = False,
+        assign_stereo: bool = True,
     ) -> None: ...
 
     @property
@@ -256,6 +272,47 @@ class MolDatRDKit(MolDatBase):
         """
         return engine.mol.rdkit(rdkit.Chem.rdchem.Mol(data), sanitize=False)
 
+    @property
+    def atomic_numbers(self) -> numpy.ndarray:
+        """
+        Atomic numbers of the atoms in the molecule.
+
+        Implementations may cache this value, so the returned array must not
+        be modified.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of dtype uint8 with one entry per atom, in RDKit atom order.
+        """
+        rdkitmol = self.rdkitmol
+        atomic_numbers = numpy.fromiter(
+            (atom.GetAtomicNum() for atom in rdkitmol.GetAtoms()),
+            dtype=numpy.uint8,
+            count=rdkitmol.GetNumAtoms(),
+        )
+        atomic_numbers.flags.writeable = False
+        return atomic_numbers
+
+    @property
+    def element_counts(self) -> numpy.ndarray:
+        """
+        Number of atoms of each element in the molecule.
+
+        Implementations may cache this value, so the returned array must not
+        be modified.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of dtype uint16 and length 119, indexed by atomic number.
+        """
+        element_counts = numpy.bincount(
+            self.atomic_numbers, minlength=119
+        ).astype(numpy.uint16)
+        element_counts.flags.writeable = False
+        return element_counts
+
     @property
     @abc.abstractmethod
     def inchikey(self) -> str:
@@ -300,6 +357,7 @@ class MolDatRDKit(MolDatBase):
         molecule: rdkit.Chem.rdchem.Mol | str | bytes,
         sanitize: bool = True,
         neutralize: bool = False,
+        assign_stereo: bool = True,
     ) -> rdkit.Chem.rdchem.Mol:
         if isinstance(molecule, bytes):
             rdkitmol = rdkit.Chem.rdchem.Mol(molecule)
@@ -313,16 +371,24 @@ class MolDatRDKit(MolDatBase):
             # print(MolToSmiles(rdkitmol))
             if sanitize:
                 rdkit.Chem.rdmolops.SanitizeMol(rdkitmol)
-                rdkit.Chem.rdmolops.AssignStereochemistry(
-                    rdkitmol, True, True, True
-                )
+                if assign_stereo:
+                    rdkit.Chem.rdmolops.AssignStereochemistry(
+                        rdkitmol, True, True, True
+                    )
             if neutralize:
                 raise NotImplementedError("No neutralize function coded")
         elif isinstance(molecule, str):
-            if sanitize:
+            if sanitize and assign_stereo:
                 rdkitmol = rdkit.Chem.rdmolfiles.MolFromSmiles(
                     molecule, sanitize=True
                 )
+            elif sanitize:
+                # the parser assigns stereochemistry whenever it sanitizes
+                rdkitmol = rdkit.Chem.rdmolfiles.MolFromSmiles(
+                    molecule, sanitize=False
+                )
+                if rdkitmol is not None:
+                    rdkit.Chem.rdmolops.SanitizeMol(rdkitmol)
             else:
                 rdkitmol = rdkit.Chem.rdmolfiles.MolFromSmiles(
                     molecule, sanitize=False
@@ -357,6 +423,8 @@ class OpDatBase(DataUnit):
         Generate reactions from molecules.
     __len__:
         Number of arguments in operator.
+    call_batch:
+        Generate reactions for many sets of reactants, optionally in parallel.
     compat:
         Check compatibility of molecules with operator argument.
     """
@@ -396,6 +464,43 @@ class OpDatBase(DataUnit):
             Number of arguments in operator.
         """
 
+    def call_batch(
+        self,
+        reactant_sets: collections.abc.Iterable[
+            collections.abc.Sequence[MolDatBase]
+        ],
+        executor: typing.Optional[concurrent.futures.Executor] = None,
+        chunksize: int = 8,
+    ) -> list[tuple[tuple[MolDatBase, ...], ...]]:
+        """
+        React many sets of reactants using internal operator.
+
+        Parameters
+        ----------
+        reactant_sets : collections.abc.Iterable[Sequence[MolDatBase]]
+            Reactants for each call of the operator.
+        executor : typing.Optional[concurrent.futures.Executor] (default: None)
+            Executor which the calls are distributed over; the operator and
+            reactants must be picklable if it uses other processes.  If None,
+            calls are made in this thread.
+        chunksize : int (default: 8)
+            Number of reactant sets sent to a worker at once.
+
+        Returns
+        -------
+        list[tuple[tuple[MolDatBase, ...], ...]]
+            Reaction product sets for each set of reactants, in order.
+        """
+        if executor is None:
+            return [_react(self, reactants) for reactants in reactant_sets]
+        return list(
+            executor.map(
+                functools.partial(_react, self),
+                reactant_sets,
+                chunksize=chunksize,
+            )
+        )
+
     @abc.abstractmethod
     def compat(self, mol: MolDatBase, arg: int) -> bool:
         """
@@ -419,6 +524,12 @@ class OpDatBase(DataUnit):
         """
 
 
+def _react(
+    op: OpDatBase, reactants: collections.abc.Sequence[MolDatBase]
+) -> tuple[tuple[MolDatBase, ...], ...]:
+    return tuple(tuple(products) for products in op(*reactants))
+
+
 class OpDatRDKit(OpDatBase):
     """
     Interface representing an RDKit SMARTS operator.
@@ -508,6 +619,22 @@ class OpDatRDKit(OpDatBase):
         """
 
 
+# bit assigned to each metadata key the first time a MetaKeyPacket uses it
+_META_KEY_BITS: dict[collections.abc.Hashable, int] = {}
+
+
+def _meta_key_mask(
+    keys: collections.abc.Iterable[collections.abc.Hashable],
+) -> int:
+    mask = 0
+    for key in keys:
+        bit = _META_KEY_BITS.get(key)
+        if bit is None:
+            bit = _META_KEY_BITS[key] = 1 << len(_META_KEY_BITS)
+        mask |= bit
+    return mask
+
+
 @typing.final
 @dataclasses.dataclass(frozen=True, slots=True)
 class MetaKeyPacket:
@@ -552,6 +679,56 @@ class MetaKeyPacket:
     molecule_keys: collections.abc.Set[collections.abc.Hashable] = frozenset()
     live_operator: bool = False
     live_molecule: bool = False
+    _operator_mask: int = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+    _molecule_mask: int = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # keysets are also encoded as bitmasks so that coverage checks are
+        # integer operations rather than set comparisons
+        object.__setattr__(
+            self, "_operator_mask", _meta_key_mask(self.operator_keys)
+        )
+        object.__setattr__(
+            self, "_molecule_mask", _meta_key_mask(self.molecule_keys)
+        )
+
+    def __reduce__(self) -> tuple[typing.Any, ...]:
+        # bits are assigned per process, so masks are rebuilt when loading
+        return (
+            MetaKeyPacket,
+            (
+                self.operator_keys,
+                self.molecule_keys,
+                self.live_operator,
+                self.live_molecule,
+            ),
+        )
+
+    def covers(self, other: "MetaKeyPacket") -> bool:
+        """
+        Check whether this packet includes every requirement of another.
+
+        Parameters
+        ----------
+        other : MetaKeyPacket
+            Requirements to be checked.
+
+        Returns
+        -------
+        bool
+            True if every key and live object required by `other` is also
+            required by `self`.
+        """
+        return (
+            (self.live_operator or not other.live_operator)
+            and (self.live_molecule or not other.live_molecule)
+            and not other._operator_mask & ~self._operator_mask
+            and not other._molecule_mask & ~self._molecule_mask
+        )
 
     def __add__(self, other: "MetaKeyPacket") -> "MetaKeyPacket":
         """
@@ -565,6 +742,13 @@ class MetaKeyPacket:
         MetaKeyPacket
             The combined requirements of both original MetaKeyPackets.
         """
+        # keysets are small and mostly repeat (e.g. when accumulating the
+        # requirements of many filters), so skip building new sets when one
+        # packet already covers the other
+        if self.covers(other):
+            return self
+        if other.covers(self):
+            return other
         return MetaKeyPacket(
             self.operator_keys | other.operator_keys,
             self.molecule_keys | other.molecule_keys,
@@ -609,8 +793,13 @@ class MolFilter(abc.ABC):
 
     Attributes
     ----------
+    cost : float
+        Relative evaluation cost, used when compiling filter expressions.
     meta_required : MetaKeyPacket
         Metadata required in order for filter to evaluate molecule.
+    selectivity : float
+        Estimated fraction of molecules passing, used when compiling filter
+        expressions.
 
     Notes
     -----
@@ -621,6 +810,9 @@ class MolFilter(abc.ABC):
 
     __slots__ = ()
 
+    cost: typing.ClassVar[float] = 1.0
+    selectivity: typing.ClassVar[float] = 0.5
+
     @abc.abstractmethod
     def __call__(
         self,
@@ -647,6 +839,35 @@ class MolFilter(abc.ABC):
             filter.
         """
 
+    def filter_batch(
+        self,
+        mols: collections.abc.Sequence[DataPacket[MolDatBase]],
+        op: typing.Optional[DataPacket[OpDatBase]] = None,
+        arg_num: typing.Optional[int] = None,
+    ) -> list[bool]:
+        """
+        Evaluate many possible molecule arguments using filter function.
+
+        Subclasses may override this to vectorize over the whole batch;
+        results must match calling the filter on each molecule.
+
+        Parameters
+        ----------
+        mols : collections.abc.Sequence[DataPacket[MolDatBase]]
+            DataPackets containing information about molecules.
+        op : typing.Optional[DataPacket[OpDatBase]] (default: None)
+            DataPacket containing information about a particular operator.
+        arg_num : typing.Optional[int] (default: None)
+            The argument of the operator the molecules are being considered
+            for.
+
+        Returns
+        -------
+        list[bool]
+            Whether or not each molecule passes the filter.
+        """
+        return [self(mol, op, arg_num) for mol in mols]
+
     @property
     @abc.abstractmethod
     def meta_required(self) -> MetaKeyPacket:
@@ -711,6 +932,27 @@ class MolFilter(abc.ABC):
         """
         return MolFilterXor(self, other)
 
+    @typing.final
+    def compile(self) -> "MolFilter":
+        """
+        Flatten a composed MolFilter into a single call.
+
+        Each node of a composed filter otherwise re-enters Python for every
+        molecule.  The compiled filter evaluates the whole expression in one
+        frame, and its meta_required is computed once here.
+
+        Returns
+        -------
+        MolFilter
+            MolFilter equivalent to `self`.
+        """
+        return _compile_filter(
+            self,
+            _CompiledMolFilter,
+            "mol, op=None, arg_num=None",
+            (MolFilterAnd, MolFilterOr, MolFilterXor, MolFilterInv),
+        )
+
 
 @typing.final
 @dataclasses.dataclass(frozen=True, slots=True)
@@ -726,6 +968,17 @@ class MolFilterAnd(MolFilter):
 
     _filter1: MolFilter
     _filter2: MolFilter
+    _meta_required: MetaKeyPacket = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # composed filters are immutable, so the union is computed once
+        object.__setattr__(
+            self,
+            "_meta_required",
+            self._filter1.meta_required + self._filter2.meta_required,
+        )
 
     def __call__(
         self,
@@ -755,6 +1008,23 @@ class MolFilterAnd(MolFilter):
             mol, op, arg_num
         )
 
+    def filter_batch(
+        self,
+        mols: collections.abc.Sequence[DataPacket[MolDatBase]],
+        op: typing.Optional[DataPacket[OpDatBase]] = None,
+        arg_num: typing.Optional[int] = None,
+    ) -> list[bool]:
+        # the second filter only sees molecules which passed the first
+        results = self._filter1.filter_batch(mols, op, arg_num)
+        passed = [i for i, ok in enumerate(results) if ok]
+        if passed:
+            second = self._filter2.filter_batch(
+                [mols[i] for i in passed], op, arg_num
+            )
+            for i, ok in zip(passed, second, strict=True):
+                results[i] = ok
+        return results
+
     @property
     def meta_required(self) -> MetaKeyPacket:
         """
@@ -765,13 +1035,19 @@ class MolFilterAnd(MolFilter):
         MetaKeyPacket
             The combined metadata key packet for both composed filter functions.
         """
-        return self._filter1.meta_required + self._filter2.meta_required
+        return self._meta_required
 
 
 @typing.final
 @dataclasses.dataclass(frozen=True, slots=True)
 class MolFilterInv(MolFilter):
     _filter: MolFilter
+    _meta_required: MetaKeyPacket = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_meta_required", self._filter.meta_required)
 
     def __call__(
         self,
@@ -799,6 +1075,14 @@ class MolFilterInv(MolFilter):
         """
         return not self._filter(mol, op, arg_num)
 
+    def filter_batch(
+        self,
+        mols: collections.abc.Sequence[DataPacket[MolDatBase]],
+        op: typing.Optional[DataPacket[OpDatBase]] = None,
+        arg_num: typing.Optional[int] = None,
+    ) -> list[bool]:
+        return [not ok for ok in self._filter.filter_batch(mols, op, arg_num)]
+
     @property
     def meta_required(self) -> MetaKeyPacket:
         """
@@ -809,7 +1093,7 @@ class MolFilterInv(MolFilter):
         MetaKeyPacket
             The metadata key packet of the composed filter function.
         """
-        return self._filter.meta_required
+        return self._meta_required
 
 
 @typing.final
@@ -826,6 +1110,16 @@ class MolFilterOr(MolFilter):
 
     _filter1: MolFilter
     _filter2: MolFilter
+    _meta_required: MetaKeyPacket = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_meta_required",
+            self._filter1.meta_required + self._filter2.meta_required,
+        )
 
     def __call__(
         self,
@@ -855,6 +1149,23 @@ class MolFilterOr(MolFilter):
             mol, op, arg_num
         )
 
+    def filter_batch(
+        self,
+        mols: collections.abc.Sequence[DataPacket[MolDatBase]],
+        op: typing.Optional[DataPacket[OpDatBase]] = None,
+        arg_num: typing.Optional[int] = None,
+    ) -> list[bool]:
+        # the second filter only sees molecules which failed the first
+        results = self._filter1.filter_batch(mols, op, arg_num)
+        failed = [i for i, ok in enumerate(results) if not ok]
+        if failed:
+            second = self._filter2.filter_batch(
+                [mols[i] for i in failed], op, arg_num
+            )
+            for i, ok in zip(failed, second, strict=True):
+                results[i] = ok
+        return results
+
     @property
     def meta_required(self) -> MetaKeyPacket:
         """
@@ -865,7 +1176,7 @@ class MolFilterOr(MolFilter):
         MetaKeyPacket
             The combined metadata key packet for both composed filter functions.
         """
-        return self._filter1.meta_required + self._filter2.meta_required
+        return self._meta_required
 
 
 @typing.final
@@ -882,6 +1193,16 @@ class MolFilterXor(MolFilter):
 
     _filter1: MolFilter
     _filter2: MolFilter
+    _meta_required: MetaKeyPacket = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_meta_required",
+            self._filter1.meta_required + self._filter2.meta_required,
+        )
 
     def __call__(
         self,
@@ -911,6 +1232,21 @@ class MolFilterXor(MolFilter):
             mol, op, arg_num
         )
 
+    def filter_batch(
+        self,
+        mols: collections.abc.Sequence[DataPacket[MolDatBase]],
+        op: typing.Optional[DataPacket[OpDatBase]] = None,
+        arg_num: typing.Optional[int] = None,
+    ) -> list[bool]:
+        return [
+            ok1 != ok2
+            for ok1, ok2 in zip(
+                self._filter1.filter_batch(mols, op, arg_num),
+                self._filter2.filter_batch(mols, op, arg_num),
+                strict=True,
+            )
+        ]
+
     @property
     def meta_required(self) -> MetaKeyPacket:
         """
@@ -921,7 +1257,7 @@ class MolFilterXor(MolFilter):
         MetaKeyPacket
             The combined metadata key packet for both composed filter functions.
         """
-        return self._filter1.meta_required + self._filter2.meta_required
+        return self._meta_required
 
 
 @typing.final
@@ -946,6 +1282,23 @@ class Reaction:
     products: tuple[MolIndex, ...]
 
 
+@functools.cache
+def _reaction_uid_func(
+    num_reactants: int, num_products: int
+) -> collections.abc.Callable[..., Identifier]:
+    # unrolled per arity; most operators have one to three reactants and
+    # products, so this is cheaper than iterating over the packet tuples
+    reactants = "".join(f"r[{i}].item.uid, " for i in range(num_reactants))
+    products = "".join(f"p[{i}].item.uid, " for i in range(num_products))
+    source = (
+        "def reaction_uid(op, r, p):\n"
+        f"    return (op.item.uid, ({reactants}), ({products}))\n"
+    )
+    namespace: dict[str, typing.Any] = {}
+    exec(source, namespace)
+    return namespace["reaction_uid"]
+
+
 @dataclasses.dataclass(frozen=True, slots=True, order=True)
 class ReactionExplicit:
     """Unused???."""
@@ -954,16 +1307,24 @@ class ReactionExplicit:
     reactants: tuple[DataPacketE[MolDatBase], ...]
     products: tuple[DataPacketE[MolDatBase], ...]
     reaction_meta: typing.Optional[collections.abc.Mapping]
+    _uid: typing.Optional[Identifier] = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def uid(
         self,
     ) -> Identifier:
-        return (
-            self.operator.item.uid,
-            tuple(mol.item.uid for mol in self.reactants),
-            tuple(mol.item.uid for mol in self.products),
-        )
+        # built on first use; reaction analysis looks it up repeatedly
+        uid = self._uid
+        if uid is None:
+            reactants = self.reactants
+            products = self.products
+            uid = _reaction_uid_func(len(reactants), len(products))(
+                self.operator, reactants, products
+            )
+            object.__setattr__(self, "_uid", uid)
+        return uid
 
 
 @typing.final
@@ -986,6 +1347,25 @@ class Recipe:
 
     operator: OpIndex
     reactants: tuple[MolIndex, ...]
+    _key: tuple[float, ...] = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # recipes are compared many times while in a heap, so the ordering
+        # described in __lt__ is encoded once as a plain tuple; values are
+        # negated since higher indices rank lower, and the infinite sentinel
+        # ranks longer reactant sets lower when one is a prefix of the other
+        object.__setattr__(
+            self,
+            "_key",
+            (
+                *(-i for i in sorted(self.reactants, reverse=True)),
+                math.inf,
+                -self.operator,
+                *(-i for i in self.reactants),
+            ),
+        )
 
     def __eq__(self, other: object) -> bool:
         """
@@ -1032,22 +1412,7 @@ class Recipe:
         bool
             Returns True if other should be ranked higher than self.
         """
-        self_order = sorted(self.reactants, reverse=True)
-        other_order = sorted(other.reactants, reverse=True)
-        for val_self, val_other in zip(self_order, other_order, strict=False):
-            if val_self < val_other:
-                return False
-            elif val_other < val_self:
-                return True
-        if len(self.reactants) < len(other.reactants):
-            return False
-        elif len(other.reactants) < len(self.reactants):
-            return True
-        if self.operator < other.operator:
-            return False
-        elif other.operator < self.operator:
-            return True
-        return other.reactants < self.reactants
+        return self._key < other._key
 
 
 @typing.final
@@ -1175,8 +1540,13 @@ class RecipeFilter(abc.ABC):
 
     Attributes
     ----------
+    cost : float
+        Relative evaluation cost, used when compiling filter expressions.
     meta_required : MetaKeyPacket
         Metadata required in order for filter to evaluate recipe.
+    selectivity : float
+        Estimated fraction of recipes passing, used when compiling filter
+        expressions.
 
     Notes
     -----
@@ -1187,6 +1557,9 @@ class RecipeFilter(abc.ABC):
 
     __slots__ = ()
 
+    cost: typing.ClassVar[float] = 1.0
+    selectivity: typing.ClassVar[float] = 0.5
+
     @abc.abstractmethod
     def __call__(self, recipe: RecipeExplicit) -> bool:
         """
@@ -1204,6 +1577,27 @@ class RecipeFilter(abc.ABC):
             filter.
         """
 
+    def filter_batch(
+        self, recipes: collections.abc.Sequence[RecipeExplicit]
+    ) -> list[bool]:
+        """
+        Evaluate many RecipeExplicits using filter function.
+
+        Subclasses may override this to vectorize over the whole batch;
+        results must match calling the filter on each recipe.
+
+        Parameters
+        ----------
+        recipes : collections.abc.Sequence[RecipeExplicit]
+            RecipeExplicits containing information about recipes.
+
+        Returns
+        -------
+        list[bool]
+            Whether or not each recipe passes the filter.
+        """
+        return [self(recipe) for recipe in recipes]
+
     @property
     @abc.abstractmethod
     def meta_required(self) -> MetaKeyPacket:
@@ -1269,6 +1663,27 @@ class RecipeFilter(abc.ABC):
         """
         return RecipeFilterXor(self, other)
 
+    @typing.final
+    def compile(self) -> "RecipeFilter":
+        """
+        Flatten a composed RecipeFilter into a single call.
+
+        Each node of a composed filter otherwise re-enters Python for every
+        recipe.  The compiled filter evaluates the whole expression in one
+        frame, and its meta_required is computed once here.
+
+        Returns
+        -------
+        RecipeFilter
+            RecipeFilter equivalent to `self`.
+        """
+        return _compile_filter(
+            self,
+            _CompiledRecipeFilter,
+            "recipe",
+            (RecipeFilterAnd, RecipeFilterOr, RecipeFilterXor, RecipeFilterInv),
+        )
+
 
 @dataclasses.dataclass(frozen=True, slots=True)
 class RecipeFilterAnd(RecipeFilter):
@@ -1283,6 +1698,16 @@ class RecipeFilterAnd(RecipeFilter):
 
     _filter1: RecipeFilter
     _filter2: RecipeFilter
+    _meta_required: MetaKeyPacket = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_meta_required",
+            self._filter1.meta_required + self._filter2.meta_required,
+        )
 
     def __call__(self, recipe: RecipeExplicit) -> bool:
         """
@@ -1311,12 +1736,18 @@ class RecipeFilterAnd(RecipeFilter):
         MetaKeyPacket
             The combined metadata key packet for both composed filter functions.
         """
-        return self._filter1.meta_required + self._filter2.meta_required
+        return self._meta_required
 
 
 @dataclasses.dataclass(frozen=True, slots=True)
 class RecipeFilterInv(RecipeFilter):
     _filter: RecipeFilter
+    _meta_required: MetaKeyPacket = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_meta_required", self._filter.meta_required)
 
     def __call__(self, recipe: RecipeExplicit) -> bool:
         """
@@ -1345,7 +1776,7 @@ class RecipeFilterInv(RecipeFilter):
         MetaKeyPacket
             The metadata key packet of the composed filter function.
         """
-        return self._filter.meta_required
+        return self._meta_required
 
 
 @dataclasses.dataclass(frozen=True, slots=True)
@@ -1361,6 +1792,16 @@ class RecipeFilterOr(RecipeFilter):
 
     _filter1: RecipeFilter
     _filter2: RecipeFilter
+    _meta_required: MetaKeyPacket = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_meta_required",
+            self._filter1.meta_required + self._filter2.meta_required,
+        )
 
     def __call__(self, recipe: RecipeExplicit) -> bool:
         """
@@ -1389,7 +1830,7 @@ class RecipeFilterOr(RecipeFilter):
         MetaKeyPacket
             The combined metadata key packet for both composed filter functions.
         """
-        return self._filter1.meta_required + self._filter2.meta_required
+        return self._meta_required
 
 
 @dataclasses.dataclass(frozen=True, slots=True)
@@ -1405,6 +1846,16 @@ class RecipeFilterXor(RecipeFilter):
 
     _filter1: RecipeFilter
     _filter2: RecipeFilter
+    _meta_required: MetaKeyPacket = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "_meta_required",
+            self._filter1.meta_required + self._filter2.meta_required,
+        )
 
     def __call__(self, recipe: RecipeExplicit) -> bool:
         """
@@ -1433,7 +1884,176 @@ class RecipeFilterXor(RecipeFilter):
         MetaKeyPacket
             The combined metadata key packet for both composed filter functions.
         """
-        return self._filter1.meta_required + self._filter2.meta_required
+        return self._meta_required
+
+
+class _CompiledMolFilter(MolFilter):
+    __slots__ = ("_filters", "_meta_required", "_source")
+
+    def __init__(
+        self,
+        filters: tuple[MolFilter, ...],
+        meta_required: MetaKeyPacket,
+        source: MolFilter,
+    ) -> None:
+        self._filters = filters
+        self._meta_required = meta_required
+        self._source = source
+
+    def filter_batch(
+        self,
+        mols: collections.abc.Sequence[DataPacket[MolDatBase]],
+        op: typing.Optional[DataPacket[OpDatBase]] = None,
+        arg_num: typing.Optional[int] = None,
+    ) -> list[bool]:
+        # keep any vectorized implementations of the composed filters
+        return self._source.filter_batch(mols, op, arg_num)
+
+    @property
+    def meta_required(self) -> MetaKeyPacket:
+        return self._meta_required
+
+    def __reduce__(self):
+        # generated subclasses cannot be pickled by reference
+        return (operator.methodcaller("compile"), (self._source,))
+
+
+class _CompiledRecipeFilter(RecipeFilter):
+    __slots__ = ("_filters", "_meta_required", "_source")
+
+    def __init__(
+        self,
+        filters: tuple[RecipeFilter, ...],
+        meta_required: MetaKeyPacket,
+        source: RecipeFilter,
+    ) -> None:
+        self._filters = filters
+        self._meta_required = meta_required
+        self._source = source
+
+    @property
+    def meta_required(self) -> MetaKeyPacket:
+        return self._meta_required
+
+    def __reduce__(self):
+        return (operator.methodcaller("compile"), (self._source,))
+
+
+def _flatten_filter(f: typing.Any, node_type: type) -> list:
+    if type(f) is node_type:
+        return [
+            *_flatten_filter(f._filter1, node_type),
+            *_flatten_filter(f._filter2, node_type),
+        ]
+    return [f]
+
+
+def _filter_stats(
+    f: typing.Any, node_types: tuple[type, type, type, type]
+) -> tuple[float, float]:
+    # expected cost and fraction passing of a filter expression, treating
+    # operands as independent
+    and_type, or_type, xor_type, inv_type = node_types
+    if isinstance(f, inv_type):
+        cost, sel = _filter_stats(f._filter, node_types)
+        return cost, 1.0 - sel
+    if isinstance(f, (and_type, or_type, xor_type)):
+        cost1, sel1 = _filter_stats(f._filter1, node_types)
+        cost2, sel2 = _filter_stats(f._filter2, node_types)
+        if isinstance(f, and_type):
+            return cost1 + sel1 * cost2, sel1 * sel2
+        if isinstance(f, or_type):
+            return cost1 + (1.0 - sel1) * cost2, sel1 + sel2 - sel1 * sel2
+        return cost1 + cost2, sel1 + sel2 - 2.0 * sel1 * sel2
+    return f.cost, f.selectivity
+
+
+def _filter_expr(
+    f: typing.Any,
+    args: str,
+    node_types: tuple[type, type, type, type],
+    leaves: list,
+) -> str:
+    and_type, or_type, xor_type, inv_type = node_types
+    if isinstance(f, (and_type, or_type)):
+        # operands of a chain of ands (ors) are run in ascending order of
+        # expected cost per rejection (acceptance), which short-circuits on
+        # cheap, selective filters first; ties keep the written order
+        operands = _flatten_filter(f, type(f))
+        stats = [_filter_stats(operand, node_types) for operand in operands]
+        if isinstance(f, and_type):
+            op_str = " and "
+            ranks = [
+                cost / (1.0 - sel) if sel < 1.0 else math.inf
+                for cost, sel in stats
+            ]
+        else:
+            op_str = " or "
+            ranks = [
+                cost / sel if sel > 0.0 else math.inf for cost, sel in stats
+            ]
+        order = sorted(range(len(operands)), key=ranks.__getitem__)
+        return (
+            "("
+            + op_str.join(
+                _filter_expr(operands[i], args, node_types, leaves)
+                for i in order
+            )
+            + ")"
+        )
+    if isinstance(f, xor_type):
+        return (
+            f"({_filter_expr(f._filter1, args, node_types, leaves)} != "
+            f"{_filter_expr(f._filter2, args, node_types, leaves)})"
+        )
+    if isinstance(f, inv_type):
+        return f"(not {_filter_expr(f._filter, args, node_types, leaves)})"
+    leaves.append(f)
+    return f"f{len(leaves) - 1}({args})"
+
+
+@functools.cache
+def _compiled_filter_type(
+    base: type[T], params: str, expr: str, num_leaves: int
+) -> type[T]:
+    # one class is generated per expression shape and shared by every
+    # filter tree of that shape; the leaves are kept on the instance
+    names = ", ".join(f"f{i}" for i in range(num_leaves))
+    source = (
+        f"def __call__(self, {params}):\n"
+        f"    {names}, = self._filters\n"
+        f"    return {expr}\n"
+    )
+    namespace: dict[str, typing.Any] = {}
+    exec(source, namespace)
+    return type(base)(
+        base.__name__,
+        (base,),
+        {
+            "__slots__": (),
+            "__call__": namespace["__call__"],
+            "__module__": base.__module__,
+            "__qualname__": base.__qualname__,
+        },
+    )
+
+
+def _compile_filter(
+    f: typing.Any,
+    base: type,
+    params: str,
+    node_types: tuple[type, type, type, type],
+) -> typing.Any:
+    if not isinstance(f, node_types):
+        return f
+    leaves: list = []
+    args = ", ".join(param.split("=")[0] for param in params.split(", "))
+    expr = _filter_expr(f, args, node_types, leaves)
+    compiled_type = _compiled_filter_type(base, params, expr, len(leaves))
+    meta_required = functools.reduce(
+        operator.add, (leaf.meta_required for leaf in leaves), MetaKeyPacket()
+    )
+    return compiled_type(tuple(leaves), meta_required, f)
 
 
 @typing.final
@@ -1447,7 +2067,33 @@ class MoleculeTypes(typing.NamedTuple):
         A molecule object which manages a single RDKit molecule.
     """
 
-    rdkit: type[MolDatRDKit]
+    rdkit: "_mol_init_type_rdkit"
+
+
+class _mol_init_type_rdkit(typing.Protocol):
+    @abc.abstractmethod
+    def __call__(
+        self,
+        molecule: rdkit.Chem.rdchem.Mol | str | bytes,
+        sanitize: bool = True,
+        neutralize: bool = False,
+        assign_stereo: bool = True,
+    ) -> MolDatRDKit:
+        """
+        Create an object which manages an RDKit molecule.
+
+        Parameters
+        ----------
+        molecule : rdkit.Chem.rdchem.Mol | str | bytes
+            SMILES string which is used to generate molecule data, otherwise
+            an RDKit molecule or its binary representation.
+        sanitize : bool (default: True)
+            Whether to sanitize the molecule.
+        neutralize : bool (default: False)
+            Whether to neutralize the molecule.
+        assign_stereo : bool (default: True)
+            Whether to assign stereochemistry while sanitizing.
+        """
 
 
 class _op_init_type_rdkit(typing.Protocol):
@@ -1624,6 +2270,14 @@ class _max_atoms_from_num(typing.Protocol):
     ) -> "filters.ReactionFilterMaxAtoms": ...
 
 
+class _max_elements_from_limits(typing.Protocol):
+    @classmethod
+    @abc.abstractmethod
+    def __call__(
+        cls, limits: collections.abc.Mapping[int, int]
+    ) -> "filters.ReactionFilterMaxElements": ...
+
+
 @typing.final
 class ReactionFilterTypes(typing.NamedTuple):
     """
@@ -1637,10 +2291,14 @@ class ReactionFilterTypes(typing.NamedTuple):
     generation : filters.GenerationFilter
         Filter which limits the maximum number of "generations" based on integer
         metadata.
+    max_elements : filters.ReactionFilterMaxElements
+        Filter which limits reactions producing molecules with more atoms of
+        several elements than per-element thresholds.
     """
 
     max_atoms: _max_atoms_from_num
     generation: type["filters.GenerationFilter"]
+    max_elements: _max_elements_from_limits
 
 
 @typing.final
@@ -1857,6 +2515,8 @@ class ValueQueryData(typing.Protocol[T_data, T_int]):
     information.
     """
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def __contains__(self, item: typing.Union[Identifier, T_data]) -> bool:
         """
@@ -1984,6 +2644,43 @@ class ValueQueryData(typing.Protocol[T_data, T_int]):
         not appear in the returned Mappings.
         """
 
+    @abc.abstractmethod
+    def meta_array(
+        self,
+        indices: typing.Optional[collections.abc.Iterable[T_int]],
+        keys: collections.abc.Sequence[collections.abc.Hashable],
+        dtypes: typing.Optional[
+            collections.abc.Mapping[collections.abc.Hashable, numpy.dtype]
+        ] = None,
+        fill: typing.Any = numpy.nan,
+    ) -> numpy.recarray:
+        """
+        Retrieve metadata for contained objects as a record array.
+
+        Each key becomes one field, so that numeric metadata can be compared
+        for many objects at once, e.g. ``(arr.mw < 500) & (arr.logp > 2)``.
+
+        Parameters
+        ----------
+        indices : typing.Optional[collections.abc.Iterable[T_int]]
+            Indices of objects to be queried.  `None` indicates all objects are
+            to be queried.
+        keys : collections.abc.Sequence[collections.abc.Hashable]
+            Keys to be queried, in field order.  Field names are `str(key)`.
+        dtypes : typing.Optional[collections.abc.Mapping[
+                 collections.abc.Hashable, numpy.dtype]] (default: None)
+
+            Field dtypes by key.  Keys not listed have their dtype inferred
+            from the values; sequence values produce an object field.
+        fill : typing.Any (default: numpy.nan)
+            Value used where an object has no value under a key.
+
+        Returns
+        -------
+        numpy.recarray
+            Array with one record per queried object.
+        """
+
     @abc.abstractmethod
     def set_meta(self, index: T_int, values: collections.abc.Mapping) -> None:
         """
@@ -2138,6 +2835,43 @@ class ValueQueryAssoc(typing.Protocol[T_id, T_int]):
         not appear in the returned Mappings.
         """
 
+    @abc.abstractmethod
+    def meta_array(
+        self,
+        indices: typing.Optional[collections.abc.Iterable[T_int]],
+        keys: collections.abc.Sequence[collections.abc.Hashable],
+        dtypes: typing.Optional[
+            collections.abc.Mapping[collections.abc.Hashable, numpy.dtype]
+        ] = None,
+        fill: typing.Any = numpy.nan,
+    ) -> numpy.recarray:
+        """
+        Retrieve metadata for contained objects as a record array.
+
+        Each key becomes one field, so that numeric metadata can be compared
+        for many objects at once, e.g. ``(arr.mw < 500) & (arr.logp > 2)``.
+
+        Parameters
+        ----------
+        indices : typing.Optional[collections.abc.Iterable[T_int]]
+            Indices of objects to be queried.  `None` indicates all objects are
+            to be queried.
+        keys : collections.abc.Sequence[collections.abc.Hashable]
+            Keys to be queried, in field order.  Field names are `str(key)`.
+        dtypes : typing.Optional[collections.abc.Mapping[
+                 collections.abc.Hashable, numpy.dtype]] (default: None)
+
+            Field dtypes by key.  Keys not listed have their dtype inferred
+            from the values; sequence values produce an object field.
+        fill : typing.Any (default: numpy.nan)
+            Value used where an object has no value under a key.
+
+        Returns
+        -------
+        numpy.recarray
+            Array with one record per queried object.
+        """
+
     @abc.abstractmethod
     def set_meta(self, index: T_int, values: collections.abc.Mapping) -> None:
         """
@@ -2287,6 +3021,76 @@ class ChemNetwork(abc.ABC):
             Indices of reactions which produce this molecule.
         """
 
+    def consumers_top(
+        self,
+        mol: typing.Union[int, MolDatBase, Identifier],
+        k: int,
+        key: typing.Optional[
+            collections.abc.Callable[[RxnIndex], typing.Any]
+        ] = None,
+    ) -> list[RxnIndex]:
+        """
+        Return at most `k` reactions which consume a particular molecule.
+
+        Only the `k` smallest reactions are kept while scanning, so this is
+        cheaper than sorting the full result of `consumers` for molecules
+        involved in many reactions.
+
+        Parameters
+        ----------
+        mol : typing.Union[int, Identifier, MolDatBase]
+            A molecule, represented by either its index in the network, its UID,
+            or the molecule object itself.
+        k : int
+            Maximum number of reactions to return.
+        key : typing.Optional[collections.abc.Callable[[RxnIndex],
+              typing.Any]] (default: None)
+
+            Sort key for reactions; smaller keys are returned first.  If None,
+            reactions with the lowest indices are returned.
+
+        Returns
+        -------
+        list[RxnIndex]
+            Indices of up to `k` reactions, in increasing key order.
+        """
+        return heapq.nsmallest(k, self.consumers(mol), key=key)
+
+    def producers_top(
+        self,
+        mol: typing.Union[int, MolDatBase, Identifier],
+        k: int,
+        key: typing.Optional[
+            collections.abc.Callable[[RxnIndex], typing.Any]
+        ] = None,
+    ) -> list[RxnIndex]:
+        """
+        Return at most `k` reactions which produce a particular molecule.
+
+        Only the `k` smallest reactions are kept while scanning, so this is
+        cheaper than sorting the full result of `producers` for molecules
+        involved in many reactions.
+
+        Parameters
+        ----------
+        mol : typing.Union[int, Identifier, MolDatBase]
+            A molecule, represented by either its index in the network, its UID,
+            or the molecule object itself.
+        k : int
+            Maximum number of reactions to return.
+        key : typing.Optional[collections.abc.Callable[[RxnIndex],
+              typing.Any]] (default: None)
+
+            Sort key for reactions; smaller keys are returned first.  If None,
+            reactions with the lowest indices are returned.
+
+        Returns
+        -------
+        list[RxnIndex]
+            Indices of up to `k` reactions, in increasing key order.
+        """
+        return heapq.nsmallest(k, self.producers(mol), key=key)
+
     @abc.abstractmethod
     def add_mol(
         self,
@@ -2399,6 +3203,121 @@ class ChemNetwork(abc.ABC):
             Index of reaction in table.
         """
 
+    def add_rxn_triple(
+        self,
+        operator: OpIndex,
+        reactants: tuple[MolIndex, ...],
+        products: tuple[MolIndex, ...],
+        meta: typing.Optional[collections.abc.Mapping] = None,
+    ) -> RxnIndex:
+        """
+        Add a reaction to the network from its component indices.
+
+        Equivalent to `add_rxn(operator, reactants, products, meta)`, but
+        without normalizing the alternative input forms.  Intended for callers
+        which add many reactions whose indices are already tuples.
+
+        Parameters
+        ----------
+        operator : OpIndex
+            Index of operator involved in reaction.
+        reactants : tuple[MolIndex, ...]
+            Indices of reactants involved in the reaction.
+        products : tuple[MolIndex, ...]
+            Indices of products involved in the reaction.
+        meta : typing.Optional[collections.abc.Mapping] (default: None)
+            Metadata associated with reaction.
+
+        Returns
+        -------
+        RxnIndex
+            Index of reaction in table.
+        """
+        return self.add_rxn(operator, reactants, products, meta)
+
+    def add_mols(
+        self,
+        mols: collections.abc.Sequence[MolDatBase],
+        metas: typing.Optional[
+            collections.abc.Sequence[typing.Optional[collections.abc.Mapping]]
+        ] = None,
+        reactive: typing.Optional[bool] = None,
+    ) -> list[MolIndex]:
+        """
+        Add several molecules to the network.
+
+        Equivalent to calling `add_mol` on each molecule in order, but
+        implementations may allocate and index the whole batch at once.
+
+        Parameters
+        ----------
+        mols : collections.abc.Sequence[MolDatBase]
+            Molecules to be added.
+        metas : typing.Optional[collections.abc.Sequence[
+                typing.Optional[collections.abc.Mapping]]] (default: None)
+
+            Metadata associated with each molecule.
+        reactive : typing.Optional[bool] (default: None)
+            Reactivity applied to every molecule, as in `add_mol`.
+
+        Returns
+        -------
+        list[MolIndex]
+            Index of each molecule in table.
+        """
+        if metas is None:
+            metas = [None] * len(mols)
+        return [
+            self.add_mol(mol, meta, reactive)
+            for mol, meta in zip(mols, metas, strict=True)
+        ]
+
+    def add_rxns(
+        self,
+        operators: collections.abc.Sequence[OpIndex],
+        reactants: collections.abc.Sequence[collections.abc.Sequence[MolIndex]],
+        products: collections.abc.Sequence[collections.abc.Sequence[MolIndex]],
+        metas: typing.Optional[
+            collections.abc.Sequence[typing.Optional[collections.abc.Mapping]]
+        ] = None,
+    ) -> list[RxnIndex]:
+        """
+        Add several reactions to the network.
+
+        Equivalent to calling `add_rxn` on each reaction in order, but
+        implementations may validate and index the whole batch at once.
+
+        Parameters
+        ----------
+        operators : collections.abc.Sequence[OpIndex]
+            Operator index of each reaction.
+        reactants : collections.abc.Sequence[collections.abc.Sequence[
+                    MolIndex]]
+
+            Reactant indices of each reaction.
+        products : collections.abc.Sequence[collections.abc.Sequence[
+                   MolIndex]]
+
+            Product indices of each reaction.
+        metas : typing.Optional[collections.abc.Sequence[
+                typing.Optional[collections.abc.Mapping]]] (default: None)
+
+            Metadata associated with each reaction.
+
+        Returns
+        -------
+        list[RxnIndex]
+            Index of each reaction in table.
+        """
+        if metas is None:
+            metas = [None] * len(operators)
+        return [
+            self.add_rxn(op, r, p, meta)
+            for op, r, p, meta in zip(
+                operators, reactants, products, metas, strict=True
+            )
+        ]
+
     @property
     @abc.abstractmethod
     def reactivity(self) -> collections.abc.Sequence[bool]:
@@ -2454,7 +3373,10 @@ class ChemNetwork(abc.ABC):
             },
         )
         data.text = str(
-            base64.urlsafe_b64encode(pickle.dumps(self)), encoding="ascii"
+            base64.urlsafe_b64encode(
+                pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+            ),
+            encoding="ascii",
         )
         tree = ET.ElementTree(data)
         with gzip.open(temp_filepath, "w", compress_level) as fout:
@@ -2583,29 +3505,45 @@ class RecipeRanker(abc.ABC, typing.Generic[T_rank]):
 @dataclasses.dataclass(frozen=True, slots=True)
 class CompositeRecipeRanker(RecipeRanker[SizedTuple]):
     _internal_rankers: tuple[RecipeRanker, ...]
+    _meta_required: MetaKeyPacket = dataclasses.field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # composed rankers are immutable, so the union is computed once
+        object.__setattr__(
+            self,
+            "_meta_required",
+            functools.reduce(
+                operator.add,
+                (r.meta_required for r in self._internal_rankers),
+                MetaKeyPacket(),
+            ),
+        )
 
     def __call__(
         self,
         recipe: RecipeExplicit,
         min_rank: typing.Optional[SizedTuple] = None,
     ) -> typing.Optional[SizedTuple]:
+        # list comprehensions avoid creating a generator frame on every call
         if min_rank is None:
-            return SizedTuple(r(recipe) for r in self._internal_rankers)
+            return SizedTuple([r(recipe) for r in self._internal_rankers])
         if not isinstance(min_rank, SizedTuple):
             raise NotImplementedError(
                 f"""Invalid min_rank type: {type(min_rank)}; have you mixed
                     ranking functions?"""
             )
         return SizedTuple(
-            r(recipe, m)
-            for r, m in zip(self._internal_rankers, min_rank, strict=True)
+            [
+                r(recipe, m)
+                for r, m in zip(self._internal_rankers, min_rank, strict=True)
+            ]
         )
 
     @property
     def meta_required(self) -> MetaKeyPacket:
-        return functools.reduce(
-            operator.add, (r.meta_required for r in self._internal_rankers)
-        )
+        return self._meta_required
 
     def append(self, other: "RecipeRanker") -> "CompositeRecipeRanker":
         if isinstance(other, CompositeRecipeRanker):
@@ -2629,6 +3567,8 @@ class GlobalHookReturnValue(enum.Enum):
 
 
 class GlobalUpdateHook(abc.ABC):
+    __slots__ = ()
+
     @abc.abstractmethod
     def __call__(self, network: ChemNetwork) -> GlobalHookReturnValue:
         """
@@ -2692,6 +3632,8 @@ class PriorityQueueStrategy(abc.ABC):
         beam_size: typing.Optional[int] = 1,
         batch_size: typing.Optional[int] = None,
         save_unreactive: bool = True,
+        *,
+        branching_factor: typing.Optional[int] = None,
     ) -> None:
         """
         Expand the network according to certain parameters.
@@ -2763,6 +3705,13 @@ class PriorityQueueStrategy(abc.ABC):
             False, reactions which are rejected will simply be deleted, along
             with their products, instead of stored.  Depending on the
             proportion of rejected reactions, this may save a lot of memory.
+        branching_factor : typing.Optional[int] (default: None)
+            Turns the expansion into a pruned beam search.  Each cycle, at most
+            beam_size * branching_factor of the newly generated recipes are
+            kept in the queue; the best beam_size of them are evaluated and the
+            rest are discarded permanently.  Requires beam_size to be set and
+            heap_size to be `None`.  Value of `None` indicates that recipes
+            are never pruned.
 
         Notes
         -----
@@ -2788,6 +3737,8 @@ class RxnTracker(abc.ABC):
         reagent_table.
     """
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def getParentChains(
         self,
@@ -2820,6 +3771,8 @@ class RxnTrackerNetwork(abc.ABC):
     based on a precalculated reaction network tree.
     """
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def getParentChains(
         self,
@@ -2827,6 +3780,8 @@ class RxnTrackerNetwork(abc.ABC):
         reagent_table: collections.abc.Container[MolIndex] = tuple(),
         fail_on_unknown_reagent: bool = False,
         max_depth: typing.Optional[int] = None,
+        *,
+        branching_factor: typing.Optional[int] = None,
     ) -> collections.abc.Iterable[
         collections.abc.Iterable[collections.abc.Iterable[RxnIndex]]
     ]:
@@ -2842,8 +3797,64 @@ class RxnTrackerNetwork(abc.ABC):
             search will consider leaf nodes.
         fail_on_unknown_reagent : bool
             If tree requires unlisted reagents, do not return.
+        max_depth : typing.Optional[int] (default: None)
+            Maximum number of reaction steps in a chain.
+        branching_factor : typing.Optional[int] (default: None)
+            If given, only the first `branching_factor` reactions producing
+            each molecule (by index) are explored.
         """
 
+    def getParentChainsBatch(
+        self,
+        targets: collections.abc.Iterable[MolIndex],
+        reagent_table: collections.abc.Container[MolIndex] = tuple(),
+        fail_on_unknown_reagent: bool = False,
+        max_depth: typing.Optional[int] = None,
+        *,
+        branching_factor: typing.Optional[int] = None,
+    ) -> collections.abc.Mapping[
+        MolIndex,
+        collections.abc.Iterable[
+            collections.abc.Iterable[collections.abc.Iterable[RxnIndex]]
+        ],
+    ]:
+        """
+        Get parent chains for several target molecules.
+
+        Implementations may share work between targets which have
+        intermediates in common.
+
+        Parameters
+        ----------
+        targets : collections.abc.Iterable[MolIndex]
+            Indices of target molecules.
+        reagent_table : collections.abc.Collection[MolIndex]
+            Sequence of reagents which are considered "basic" and which the tree
+            search will consider leaf nodes.
+        fail_on_unknown_reagent : bool
+            If tree requires unlisted reagents, do not return.
+        max_depth : typing.Optional[int] (default: None)
+            Maximum number of reaction steps in a chain.
+        branching_factor : typing.Optional[int] (default: None)
+            If given, only the first `branching_factor` reactions producing
+            each molecule (by index) are explored.
+
+        Returns
+        -------
+        collections.abc.Mapping[MolIndex, collections.abc.Iterable[...]]
+            Parent chains of each target, as returned by getParentChains.
+        """
+        return {
+            target: self.getParentChains(
+                target,
+                reagent_table,
+                fail_on_unknown_reagent,
+                max_depth,
+                branching_factor=branching_factor,
+            )
+            for target in targets
+        }
+
 
 class MetaDataCalculatorLocal(typing.Protocol):
     @abc.abstractmethod
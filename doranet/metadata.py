@@ -28,6 +28,8 @@ def TrivialMetaDataResolverFunc(a: _T, b: _T) -> _T:
 
 
 class LocalPropertyCalc(abc.ABC, typing.Generic[_T]):
+    __slots__ = ()
+
     @property
     @abc.abstractmethod
     def key(self) -> collections.abc.Hashable: ...
@@ -112,6 +114,8 @@ class LocalPropertyCalc(abc.ABC, typing.Generic[_T]):
 
 
 class MolPropertyCalc(LocalPropertyCalc[_T]):
+    __slots__ = ()
+
     @abc.abstractmethod
     def __call__(
         self,
@@ -121,6 +125,8 @@ class MolPropertyCalc(LocalPropertyCalc[_T]):
 
 
 class MolPropertyFromRxnCalc(LocalPropertyCalc[_T]):
+    __slots__ = ()
+
     @abc.abstractmethod
     def __call__(
         self,
@@ -131,6 +137,8 @@ class MolPropertyFromRxnCalc(LocalPropertyCalc[_T]):
 
 
 class OpPropertyCalc(LocalPropertyCalc[_T]):
+    __slots__ = ()
+
     @abc.abstractmethod
     def __call__(
         self,
@@ -140,6 +148,8 @@ class OpPropertyCalc(LocalPropertyCalc[_T]):
 
 
 class OpPropertyFromRxnCalc(LocalPropertyCalc[_T]):
+    __slots__ = ()
+
     @abc.abstractmethod
     def __call__(
         self,
@@ -150,6 +160,8 @@ class OpPropertyFromRxnCalc(LocalPropertyCalc[_T]):
 
 
 class RxnPropertyCalc(LocalPropertyCalc[_T]):
+    __slots__ = ()
+
     @abc.abstractmethod
     def __call__(
         self,
@@ -158,7 +170,7 @@ class RxnPropertyCalc(LocalPropertyCalc[_T]):
     ) -> typing.Optional[_T]: ...
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class KeyOutput:
     mol_keys: frozenset[collections.abc.Hashable]
     op_keys: frozenset[collections.abc.Hashable]
@@ -199,15 +211,54 @@ class KeyOutput:
 class ReactionFilterBase(abc.ABC):
     __slots__ = ()
 
+    # relative evaluation cost and estimated fraction of reactions passing;
+    # used as hints when reordering filters in a chain
+    cost: typing.ClassVar[float] = 1.0
+    selectivity: typing.ClassVar[float] = 0.5
+
     @abc.abstractmethod
     def __call__(self, recipe: interfaces.ReactionExplicit) -> bool: ...
 
+    def filter_batch(
+        self, recipes: collections.abc.Sequence[interfaces.ReactionExplicit]
+    ) -> list[bool]:
+        """
+        Evaluate the filter over many reactions at once.
+
+        Subclasses may override this to share work between reactions of the
+        same batch; results must match calling the filter on each reaction.
+
+        Parameters
+        ----------
+        recipes : collections.abc.Sequence[interfaces.ReactionExplicit]
+            Reactions to be filtered.
+
+        Returns
+        -------
+        list[bool]
+            Whether each reaction passes the filter.
+        """
+        return [self(recipe) for recipe in recipes]
+
+    def is_always_true(self) -> bool:
+        """Return True if the filter is known to pass every reaction."""
+        return False
+
+    def is_always_false(self) -> bool:
+        """Return True if the filter is known to reject every reaction."""
+        return False
+
     @property
     def meta_required(self) -> interfaces.MetaKeyPacket:
         return interfaces.MetaKeyPacket()
 
     @typing.final
     def __and__(self, other: "ReactionFilterBase") -> "ReactionFilterBase":
+        # a filter which always passes never changes a conjunction
+        if self.is_always_true():
+            return other
+        if other.is_always_true():
+            return self
         return ReactionFilterAnd(self, other)
 
     @typing.final
@@ -245,6 +296,17 @@ class ReactionFilterAnd(ReactionFilterBase):
     def __call__(self, recipe: interfaces.ReactionExplicit) -> bool:
         return self._filter1(recipe) and self._filter2(recipe)
 
+    def filter_batch(
+        self, recipes: collections.abc.Sequence[interfaces.ReactionExplicit]
+    ) -> list[bool]:
+        results = self._filter1.filter_batch(recipes)
+        passed = [i for i, ok in enumerate(results) if ok]
+        if passed:
+            second = self._filter2.filter_batch([recipes[i] for i in passed])
+            for i, ok in zip(passed, second, strict=True):
+                results[i] = ok
+        return results
+
     @property
     def meta_required(self) -> interfaces.MetaKeyPacket:
         return self._filter1.meta_required + self._filter2.meta_required
@@ -258,6 +320,11 @@ class ReactionFilterInv(ReactionFilterBase):
     def __call__(self, recipe: interfaces.ReactionExplicit) -> bool:
         return not self._filter(recipe)
 
+    def filter_batch(
+        self, recipes: collections.abc.Sequence[interfaces.ReactionExplicit]
+    ) -> list[bool]:
+        return [not ok for ok in self._filter.filter_batch(recipes)]
+
     @property
     def meta_required(self) -> interfaces.MetaKeyPacket:
         return self._filter.meta_required
@@ -272,6 +339,17 @@ class ReactionFilterOr(ReactionFilterBase):
     def __call__(self, recipe: interfaces.ReactionExplicit) -> bool:
         return self._filter1(recipe) or self._filter2(recipe)
 
+    def filter_batch(
+        self, recipes: collections.abc.Sequence[interfaces.ReactionExplicit]
+    ) -> list[bool]:
+        results = self._filter1.filter_batch(recipes)
+        failed = [i for i, ok in enumerate(results) if not ok]
+        if failed:
+            second = self._filter2.filter_batch([recipes[i] for i in failed])
+            for i, ok in zip(failed, second, strict=True):
+                results[i] = ok
+        return results
+
     @property
     def meta_required(self) -> interfaces.MetaKeyPacket:
         return self._filter1.meta_required + self._filter2.meta_required
@@ -286,12 +364,26 @@ class ReactionFilterXor(ReactionFilterBase):
     def __call__(self, recipe: interfaces.ReactionExplicit) -> bool:
         return self._filter1(recipe) != self._filter2(recipe)
 
+    def filter_batch(
+        self, recipes: collections.abc.Sequence[interfaces.ReactionExplicit]
+    ) -> list[bool]:
+        return [
+            ok1 != ok2
+            for ok1, ok2 in zip(
+                self._filter1.filter_batch(recipes),
+                self._filter2.filter_batch(recipes),
+                strict=True,
+            )
+        ]
+
     @property
     def meta_required(self) -> interfaces.MetaKeyPacket:
         return self._filter1.meta_required + self._filter2.meta_required
 
 
 class PropertyCompositor(abc.ABC):
+    __slots__ = ()
+
     @abc.abstractmethod
     def __call__(
         self, rxn: interfaces.ReactionExplicit
@@ -705,6 +797,8 @@ class MetaPropertyState:
 
 
 class RxnAnalysisStep(abc.ABC):
+    __slots__ = ()
+
     @abc.abstractmethod
     def execute(
         self,
@@ -878,6 +972,8 @@ class RxnAnalysisStepProp(RxnAnalysisStep):
 class RxnAnalysisStepFilter(RxnAnalysisStep):
     __slots__ = ("_arg",)
 
+    _arg: ReactionFilterBase
+
     def __init__(self, arg: ReactionFilterBase) -> None:
         self._arg = arg
 
@@ -887,11 +983,20 @@ class RxnAnalysisStepFilter(RxnAnalysisStep):
             tuple[interfaces.ReactionExplicit, bool]
         ],
     ) -> collections.abc.Iterable[tuple[interfaces.ReactionExplicit, bool]]:
-        for rxn, pass_filter in rxns:
-            if not pass_filter:
-                yield rxn, False
-            else:
-                yield rxn, self._arg(rxn)
+        rxn_list = list(rxns)
+        passed = [
+            i for i, (_, pass_filter) in enumerate(rxn_list) if pass_filter
+        ]
+        results = [False] * len(rxn_list)
+        for i, ok in zip(
+            passed,
+            self._arg.filter_batch([rxn_list[i][0] for i in passed]),
+            strict=True,
+        ):
+            results[i] = ok
+        return [
+            (rxn, ok) for (rxn, _), ok in zip(rxn_list, results, strict=True)
+        ]
 
     @property
     def meta_required(self) -> interfaces.MetaKeyPacket:
@@ -3,9 +3,14 @@
 import collections.abc
 import dataclasses
 import gzip
+import heapq
+import itertools
 import pickle
+import sys
 import typing
 
+import numpy
+
 from doranet import interfaces
 
 
@@ -37,13 +42,213 @@ def index_iterable_guard(
     return hasattr(item, "__iter__")
 
 
+class _MissingType:
+    __slots__ = ()
+
+    def __reduce__(self) -> str:
+        return "_MISSING"
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+# placeholder for rows which have no value under a metadata key
+_MISSING = _MissingType()
+
+
+class _MetaRow(collections.abc.MutableMapping):
+    """Live mapping view of the metadata of a single item."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "_MetaColumns", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key: collections.abc.Hashable) -> typing.Any:
+        column = self._table._columns.get(key)
+        if column is None or column[self._index] is _MISSING:
+            raise KeyError(key)
+        return column[self._index]
+
+    def __setitem__(
+        self, key: collections.abc.Hashable, value: typing.Any
+    ) -> None:
+        self._table.update(self._index, {key: value})
+
+    def __delitem__(self, key: collections.abc.Hashable) -> None:
+        column = self._table._columns.get(key)
+        if column is None or column[self._index] is _MISSING:
+            raise KeyError(key)
+        column[self._index] = _MISSING
+
+    def __iter__(self) -> collections.abc.Iterator[collections.abc.Hashable]:
+        i = self._index
+        return iter(
+            [
+                key
+                for key, column in self._table._columns.items()
+                if column[i] is not _MISSING
+            ]
+        )
+
+    def __len__(self) -> int:
+        i = self._index
+        return sum(
+            column[i] is not _MISSING
+            for column in self._table._columns.values()
+        )
+
+    def __repr__(self) -> str:
+        return repr(self._table.row(self._index))
+
+
+class _MetaColumns(collections.abc.Sequence[_MetaRow]):
+    """
+    Metadata table stored as one column per key.
+
+    Each key owns a list holding its value for every item, so that asking
+    for a few keys of many items reads only those columns instead of
+    visiting one dictionary per item.  Indexing returns a live mapping view
+    of a row, which keeps the table usable wherever a sequence of
+    dictionaries was expected.
+    """
+
+    __slots__ = ("_columns", "_len")
+
+    def __init__(
+        self,
+        rows: collections.abc.Iterable[collections.abc.Mapping] = (),
+    ) -> None:
+        self._columns: dict[collections.abc.Hashable, list] = {}
+        self._len = 0
+        for row in rows:
+            self.append(row)
+
+    def append(self, values: typing.Optional[collections.abc.Mapping]) -> None:
+        for column in self._columns.values():
+            column.append(_MISSING)
+        self._len += 1
+        if values:
+            self.update(self._len - 1, values)
+
+    def extend(
+        self,
+        rows: collections.abc.Sequence[
+            typing.Optional[collections.abc.Mapping]
+        ],
+    ) -> None:
+        start = self._len
+        padding = [_MISSING] * len(rows)
+        for column in self._columns.values():
+            column.extend(padding)
+        self._len += len(rows)
+        for index, values in enumerate(rows, start):
+            if values:
+                self.update(index, values)
+
+    def update(self, index: int, values: collections.abc.Mapping) -> None:
+        columns = self._columns
+        for key, value in values.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [_MISSING] * self._len
+            column[index] = value
+
+    def row(
+        self,
+        index: int,
+        keys: typing.Optional[
+            collections.abc.Iterable[collections.abc.Hashable]
+        ] = None,
+    ) -> dict[collections.abc.Hashable, typing.Any]:
+        if keys is None:
+            items = self._columns.items()
+        else:
+            items = (
+                (key, self._columns[key])
+                for key in keys
+                if key in self._columns
+            )
+        return {
+            key: column[index]
+            for key, column in items
+            if column[index] is not _MISSING
+        }
+
+    def rows(
+        self,
+        indices: collections.abc.Iterable[int],
+        keys: collections.abc.Iterable[collections.abc.Hashable],
+    ) -> tuple[dict[collections.abc.Hashable, typing.Any], ...]:
+        targets = list(indices)
+        result: tuple[dict[collections.abc.Hashable, typing.Any], ...] = tuple(
+            {} for _ in targets
+        )
+        for key in keys:
+            column = self._columns.get(key)
+            if column is None:
+                continue
+            for row, value in zip(
+                result, [column[i] for i in targets], strict=True
+            ):
+                if value is not _MISSING:
+                    row[key] = value
+        return result
+
+    def array(
+        self,
+        indices: typing.Optional[collections.abc.Iterable[int]],
+        keys: collections.abc.Sequence[collections.abc.Hashable],
+        dtypes: typing.Optional[
+            collections.abc.Mapping[collections.abc.Hashable, numpy.dtype]
+        ] = None,
+        fill: typing.Any = numpy.nan,
+    ) -> numpy.recarray:
+        targets = range(self._len) if indices is None else list(indices)
+        fields = []
+        for key in keys:
+            column = self._columns.get(key)
+            if column is None:
+                values = [fill] * len(targets)
+            else:
+                values = [column[i] for i in targets]
+                values = [fill if v is _MISSING else v for v in values]
+            dtype = None if dtypes is None else dtypes.get(key)
+            field = numpy.asarray(values, dtype=dtype)
+            if field.ndim != 1:
+                # sequence-valued metadata cannot form a scalar column
+                field = numpy.empty(len(values), dtype=object)
+                field[:] = values
+            fields.append(field)
+        if not fields:
+            return numpy.recarray((len(targets),), dtype=[])
+        return numpy.rec.fromarrays(fields, names=[str(key) for key in keys])
+
+    @typing.overload
+    def __getitem__(self, item: int) -> _MetaRow: ...
+
+    @typing.overload
+    def __getitem__(
+        self, item: slice
+    ) -> collections.abc.Sequence[_MetaRow]: ...
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [_MetaRow(self, i) for i in range(self._len)[item]]
+        return _MetaRow(self, range(self._len)[item])
+
+    def __len__(self) -> int:
+        return self._len
+
+
 @dataclasses.dataclass(frozen=True, slots=True)
 class _ValueQueryData(
     interfaces.ValueQueryData[interfaces.T_data, interfaces.T_int]
 ):
     _list: collections.abc.Sequence[interfaces.T_data]
     _map: collections.abc.Mapping[interfaces.Identifier, interfaces.T_int]
-    _meta: collections.abc.Sequence[collections.abc.MutableMapping]
+    _meta: _MetaColumns
 
     def __contains__(
         self, item: typing.Union[interfaces.Identifier, interfaces.T_data]
@@ -121,26 +326,30 @@ class _ValueQueryData(
         elif index_iterable_guard(indices):
             targets = indices
         elif isinstance(indices, int):
-            if keys is None:
-                return self._meta[indices]
-            else:
-                m: collections.abc.Mapping = self._meta[indices]
-                return {key: m[key] for key in keys if key in m}
+            return self._meta.row(indices, keys)
         else:
             raise TypeError(
                 f"Invalid argument type for `indices`: {type(indices)}"
             )
         if keys is None:
-            return tuple(self._meta[i] for i in targets)
-        mt = self._meta
-        return tuple(
-            {key: mt[i][key] for key in keys if key in mt[i]} for i in targets
-        )
+            return tuple(self._meta.row(i) for i in targets)
+        return self._meta.rows(targets, keys)
+
+    def meta_array(
+        self,
+        indices: typing.Optional[collections.abc.Iterable[interfaces.T_int]],
+        keys: collections.abc.Sequence[collections.abc.Hashable],
+        dtypes: typing.Optional[
+            collections.abc.Mapping[collections.abc.Hashable, numpy.dtype]
+        ] = None,
+        fill: typing.Any = numpy.nan,
+    ) -> numpy.recarray:
+        return self._meta.array(indices, keys, dtypes, fill)
 
     def set_meta(
         self, index: interfaces.T_int, values: collections.abc.Mapping
     ) -> None:
-        self._meta[index].update(values)
+        self._meta.update(index, values)
 
     def uid(self, i: interfaces.T_int) -> interfaces.Identifier:
         return self._list[i].uid
@@ -156,7 +365,7 @@ class _ValueQueryData(
 class _ValueQueryAssoc(typing.Generic[interfaces.T_id, interfaces.T_int]):
     _list: collections.abc.Sequence[interfaces.T_id]
     _map: collections.abc.Mapping[interfaces.T_id, interfaces.T_int]
-    _meta: collections.abc.Sequence[collections.abc.MutableMapping]
+    _meta: _MetaColumns
 
     @typing.overload
     def __getitem__(
@@ -218,26 +427,30 @@ class _ValueQueryAssoc(typing.Generic[interfaces.T_id, interfaces.T_int]):
         elif index_iterable_guard(indices):
             targets = indices
         elif isinstance(indices, int):
-            if keys is None:
-                return self._meta[indices]
-            else:
-                m: collections.abc.Mapping = self._meta[indices]
-                return {key: m[key] for key in keys if key in m}
+            return self._meta.row(indices, keys)
         else:
             raise TypeError(
                 f"Invalid argument type for `indices`: {type(indices)}"
             )
         if keys is None:
-            return tuple(self._meta[i] for i in targets)
-        mt = self._meta
-        return tuple(
-            {key: mt[i][key] for key in keys if key in mt[i]} for i in targets
-        )
+            return tuple(self._meta.row(i) for i in targets)
+        return self._meta.rows(targets, keys)
+
+    def meta_array(
+        self,
+        indices: typing.Optional[collections.abc.Iterable[interfaces.T_int]],
+        keys: collections.abc.Sequence[collections.abc.Hashable],
+        dtypes: typing.Optional[
+            collections.abc.Mapping[collections.abc.Hashable, numpy.dtype]
+        ] = None,
+        fill: typing.Any = numpy.nan,
+    ) -> numpy.recarray:
+        return self._meta.array(indices, keys, dtypes, fill)
 
     def set_meta(
         self, index: interfaces.T_int, values: collections.abc.Mapping
     ) -> None:
-        self._meta[index].update(values)
+        self._meta.update(index, values)
 
     def __len__(self) -> int:
         return len(self._list)
@@ -246,6 +459,517 @@ class _ValueQueryAssoc(typing.Generic[interfaces.T_id, interfaces.T_int]):
         return iter(self._list)
 
 
+def _readonly(arr: numpy.ndarray) -> numpy.ndarray:
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
+def _reserve(arr: numpy.ndarray, size: int) -> numpy.ndarray:
+    # geometric growth keeps appends amortized O(1); views handed out before
+    # a reallocation keep pointing at the old (still valid) buffer
+    if size <= len(arr):
+        return arr
+    new_arr = numpy.empty(max(size, 2 * len(arr)), dtype=arr.dtype)
+    new_arr[: len(arr)] = arr
+    return new_arr
+
+
+# pending entries above which a reverse index is rebuilt, as a fraction of
+# the entries already in its arrays (with a floor for small networks)
+_REVERSE_FOLD_FRACTION = 4
+_REVERSE_FOLD_MIN = 1024
+
+
+class _ReverseIndex:
+    """
+    Molecule -> reaction index over one CSR column of a reaction store.
+
+    The index is built as CSR arrays by a stable sort.  Reactions appended
+    after that are kept in a per-molecule overflow dict, so lookups
+    interleaved with additions only touch the new reactions; the overflow is
+    folded into the arrays once it outgrows a fraction of them.
+    """
+
+    __slots__ = ("_built", "_indptr", "_indices", "_pending", "_pending_end")
+
+    def __init__(self) -> None:
+        # reactions [0, _built) are in the arrays, [_built, _pending_end) in
+        # the overflow dict
+        self._built = 0
+        self._indptr = numpy.zeros(1, dtype=numpy.int64)
+        self._indices = numpy.empty(0, dtype=numpy.int32)
+        self._pending: dict[int, list[interfaces.RxnIndex]] = {}
+        self._pending_end = 0
+
+    def _rebuild(
+        self, offsets: numpy.ndarray, flat: numpy.ndarray, n: int
+    ) -> None:
+        offsets = offsets[: n + 1]
+        flat = flat[: offsets[-1]]
+        rxn_of_entry = numpy.repeat(
+            numpy.arange(n, dtype=numpy.int32), numpy.diff(offsets)
+        )
+        # a stable sort keeps the reactions of each molecule in index order
+        self._indices = rxn_of_entry[numpy.argsort(flat, kind="stable")]
+        self._indptr = numpy.zeros(
+            (numpy.max(flat) + 2) if len(flat) else 1, dtype=numpy.int64
+        )
+        numpy.cumsum(numpy.bincount(flat), out=self._indptr[1:])
+        self._built = self._pending_end = n
+        self._pending = {}
+
+    def _sync(
+        self, offsets: numpy.ndarray, flat: numpy.ndarray, n: int
+    ) -> None:
+        start = self._pending_end
+        if n == start:
+            return
+        num_pending = offsets[n] - offsets[self._built]
+        if num_pending > max(
+            _REVERSE_FOLD_MIN, len(self._indices) // _REVERSE_FOLD_FRACTION
+        ):
+            self._rebuild(offsets, flat, n)
+            return
+        bounds = offsets[start : n + 1].tolist()
+        base = bounds[0]
+        mols = flat[base : bounds[-1]].tolist()
+        pending = self._pending
+        for rxn, (lo, hi) in zip(
+            range(start, n), itertools.pairwise(bounds), strict=True
+        ):
+            for mol in mols[lo - base : hi - base]:
+                pending.setdefault(mol, []).append(interfaces.RxnIndex(rxn))
+        self._pending_end = n
+
+    def row(
+        self, offsets: numpy.ndarray, flat: numpy.ndarray, n: int, mol: int
+    ) -> list[interfaces.RxnIndex]:
+        self._sync(offsets, flat, n)
+        indptr = self._indptr
+        if mol + 1 < len(indptr):
+            rxns = self._indices[indptr[mol] : indptr[mol + 1]].tolist()
+        else:
+            rxns = []
+        pending = self._pending.get(mol)
+        if pending:
+            # overflow reactions are newer, so they sort after the arrays
+            rxns.extend(pending)
+        return rxns
+
+    def csr(
+        self,
+        offsets: numpy.ndarray,
+        flat: numpy.ndarray,
+        n: int,
+        num_mols: int,
+    ) -> tuple[numpy.ndarray, numpy.ndarray]:
+        if self._built != n:
+            self._rebuild(offsets, flat, n)
+        if len(self._indptr) <= num_mols:
+            # molecules above the highest index used by a reaction have none
+            self._indptr = numpy.concatenate(
+                (
+                    self._indptr,
+                    numpy.full(
+                        num_mols + 1 - len(self._indptr), self._indptr[-1]
+                    ),
+                )
+            )
+        return _readonly(self._indptr), _readonly(self._indices)
+
+
+class _ColumnarReactionStore(collections.abc.Sequence[interfaces.Reaction]):
+    """
+    Reaction list which mirrors its indices into numpy columns.
+
+    Reactions are kept as rows for lookup by index, while operators,
+    reactants, and products are also stored as contiguous arrays (reactants
+    and products in CSR layout).  Predicates over a single field can then
+    scan a column for every reaction at once instead of visiting each
+    Reaction object.
+
+    A network rarely holds more than a few hundred operators, so the
+    operator column is dictionary encoded: each row stores a code into the
+    table of distinct operators, using the narrowest unsigned integer type
+    which fits the number of codes.
+    """
+
+    __slots__ = (
+        "_rows",
+        "_op_codes",
+        "_op_dict",
+        "_op_code_map",
+        "_reactant_offsets",
+        "_reactant_flat",
+        "_product_offsets",
+        "_product_flat",
+        "_consumer_index",
+        "_producer_index",
+    )
+
+    def __init__(
+        self, rxns: collections.abc.Iterable[interfaces.Reaction] = ()
+    ) -> None:
+        self._rows: list[interfaces.Reaction] = []
+        self._op_codes = numpy.empty(16, dtype=numpy.uint8)
+        self._op_dict: list[interfaces.OpIndex] = []
+        self._op_code_map: dict[interfaces.OpIndex, int] = {}
+        self._reactant_offsets = numpy.zeros(17, dtype=numpy.int64)
+        self._reactant_flat = numpy.empty(32, dtype=numpy.int32)
+        self._product_offsets = numpy.zeros(17, dtype=numpy.int64)
+        self._product_flat = numpy.empty(32, dtype=numpy.int32)
+        # molecule -> reaction transposes, built on demand
+        self._consumer_index = _ReverseIndex()
+        self._producer_index = _ReverseIndex()
+        self.extend(rxns)
+
+    def _op_code(self, op: interfaces.OpIndex) -> int:
+        code = self._op_code_map.get(op)
+        if code is None:
+            code = len(self._op_dict)
+            if code > numpy.iinfo(self._op_codes.dtype).max:
+                self._op_codes = self._op_codes.astype(
+                    numpy.min_scalar_type(2 * code)
+                )
+            self._op_dict.append(op)
+            self._op_code_map[op] = code
+        return code
+
+    def append(self, rxn: interfaces.Reaction) -> None:
+        n = len(self._rows)
+        code = self._op_code(rxn.operator)
+        self._op_codes = _reserve(self._op_codes, n + 1)
+        self._op_codes[n] = code
+        self._reactant_offsets, self._reactant_flat = self._append_csr(
+            self._reactant_offsets, self._reactant_flat, n, rxn.reactants
+        )
+        self._product_offsets, self._product_flat = self._append_csr(
+            self._product_offsets, self._product_flat, n, rxn.products
+        )
+        self._rows.append(rxn)
+
+    def extend(
+        self, rxns: collections.abc.Iterable[interfaces.Reaction]
+    ) -> None:
+        new_rows = list(rxns)
+        if not new_rows:
+            return
+        n = len(self._rows)
+        end = n + len(new_rows)
+        codes = [self._op_code(rxn.operator) for rxn in new_rows]
+        self._op_codes = _reserve(self._op_codes, end)
+        self._op_codes[n:end] = codes
+        self._reactant_offsets, self._reactant_flat = self._extend_csr(
+            self._reactant_offsets,
+            self._reactant_flat,
+            n,
+            [rxn.reactants for rxn in new_rows],
+        )
+        self._product_offsets, self._product_flat = self._extend_csr(
+            self._product_offsets,
+            self._product_flat,
+            n,
+            [rxn.products for rxn in new_rows],
+        )
+        self._rows.extend(new_rows)
+
+    @staticmethod
+    def _extend_csr(
+        offsets: numpy.ndarray,
+        flat: numpy.ndarray,
+        n: int,
+        index_lists: collections.abc.Sequence[
+            collections.abc.Sequence[interfaces.MolIndex]
+        ],
+    ) -> tuple[numpy.ndarray, numpy.ndarray]:
+        start = offsets[n]
+        new_offsets = start + numpy.cumsum(
+            [len(indices) for indices in index_lists], dtype=numpy.int64
+        )
+        end = new_offsets[-1]
+        offsets = _reserve(offsets, n + len(index_lists) + 1)
+        flat = _reserve(flat, end)
+        flat[start:end] = numpy.fromiter(
+            itertools.chain.from_iterable(index_lists),
+            dtype=flat.dtype,
+            count=end - start,
+        )
+        offsets[n + 1 : n + len(index_lists) + 1] = new_offsets
+        return offsets, flat
+
+    @staticmethod
+    def _append_csr(
+        offsets: numpy.ndarray,
+        flat: numpy.ndarray,
+        n: int,
+        indices: collections.abc.Sequence[interfaces.MolIndex],
+    ) -> tuple[numpy.ndarray, numpy.ndarray]:
+        start = offsets[n]
+        end = start + len(indices)
+        offsets = _reserve(offsets, n + 2)
+        flat = _reserve(flat, end)
+        flat[start:end] = indices
+        offsets[n + 1] = end
+        return offsets, flat
+
+    @typing.overload
+    def __getitem__(self, item: int) -> interfaces.Reaction: ...
+
+    @typing.overload
+    def __getitem__(
+        self, item: slice
+    ) -> collections.abc.Sequence[interfaces.Reaction]: ...
+
+    def __getitem__(self, item):
+        return self._rows[item]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> collections.abc.Iterator[interfaces.Reaction]:
+        return iter(self._rows)
+
+    def operators(self) -> numpy.ndarray:
+        """
+        Return the operator index of every reaction.
+
+        Returns
+        -------
+        numpy.ndarray
+            Int32 array of length equal to the number of reactions.
+        """
+        op_dict = numpy.array(self._op_dict, dtype=numpy.int32)
+        return op_dict[self._op_codes[: len(self._rows)]]
+
+    def with_operator(self, op: interfaces.OpIndex) -> numpy.ndarray:
+        """
+        Return the indices of all reactions which use an operator.
+
+        Parameters
+        ----------
+        op : interfaces.OpIndex
+            Operator index.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted int32 array of reaction indices.
+        """
+        code = self._op_code_map.get(op)
+        if code is None:
+            return numpy.empty(0, dtype=numpy.int32)
+        return numpy.flatnonzero(
+            self._op_codes[: len(self._rows)] == code
+        ).astype(numpy.int32)
+
+    def reactant_view(self, i: interfaces.RxnIndex) -> numpy.ndarray:
+        """
+        Return the reactant indices of a single reaction without copying.
+
+        Parameters
+        ----------
+        i : interfaces.RxnIndex
+            Reaction index.
+
+        Returns
+        -------
+        numpy.ndarray
+            Read-only int32 array of molecule indices.
+        """
+        offsets = self._reactant_offsets
+        return _readonly(self._reactant_flat[offsets[i] : offsets[i + 1]])
+
+    def product_view(self, i: interfaces.RxnIndex) -> numpy.ndarray:
+        """
+        Return the product indices of a single reaction without copying.
+
+        Parameters
+        ----------
+        i : interfaces.RxnIndex
+            Reaction index.
+
+        Returns
+        -------
+        numpy.ndarray
+            Read-only int32 array of molecule indices.
+        """
+        offsets = self._product_offsets
+        return _readonly(self._product_flat[offsets[i] : offsets[i + 1]])
+
+    def reactants_csr(self) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Return the reactants of every reaction in CSR layout.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            Offsets (length # reactions + 1) and flattened molecule indices;
+            the reactants of reaction i are flat[offsets[i]:offsets[i+1]].
+        """
+        n = len(self._rows)
+        offsets = self._reactant_offsets[: n + 1]
+        return (
+            _readonly(offsets),
+            _readonly(self._reactant_flat[: offsets[-1]]),
+        )
+
+    def products_csr(self) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Return the products of every reaction in CSR layout.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            Offsets (length # reactions + 1) and flattened molecule indices;
+            the products of reaction i are flat[offsets[i]:offsets[i+1]].
+        """
+        n = len(self._rows)
+        offsets = self._product_offsets[: n + 1]
+        return (
+            _readonly(offsets),
+            _readonly(self._product_flat[: offsets[-1]]),
+        )
+
+    def consumers_csr(
+        self, num_mols: int
+    ) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Return the reactions consuming each molecule in CSR layout.
+
+        Parameters
+        ----------
+        num_mols : int
+            Number of molecules in the network.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            Offsets (length at least num_mols + 1) and flattened int32 reaction
+            indices; the reactions consuming molecule i are
+            flat[offsets[i]:offsets[i+1]], in ascending order.
+        """
+        return self._consumer_index.csr(
+            self._reactant_offsets,
+            self._reactant_flat,
+            len(self._rows),
+            num_mols,
+        )
+
+    def producers_csr(
+        self, num_mols: int
+    ) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Return the reactions producing each molecule in CSR layout.
+
+        Parameters
+        ----------
+        num_mols : int
+            Number of molecules in the network.
+
+        Returns
+        -------
+        tuple[numpy.ndarray, numpy.ndarray]
+            Offsets (length at least num_mols + 1) and flattened int32 reaction
+            indices; the reactions producing molecule i are
+            flat[offsets[i]:offsets[i+1]], in ascending order.
+        """
+        return self._producer_index.csr(
+            self._product_offsets,
+            self._product_flat,
+            len(self._rows),
+            num_mols,
+        )
+
+    def consumers_of(self, mol: int) -> list[interfaces.RxnIndex]:
+        """
+        Return the reactions consuming one molecule.
+
+        Unlike consumers_csr, this does not rebuild the index after every
+        added reaction, so it stays cheap when interleaved with additions.
+
+        Parameters
+        ----------
+        mol : int
+            Molecule index.
+
+        Returns
+        -------
+        list[interfaces.RxnIndex]
+            Reaction indices, in ascending order.
+        """
+        return self._consumer_index.row(
+            self._reactant_offsets, self._reactant_flat, len(self._rows), mol
+        )
+
+    def producers_of(self, mol: int) -> list[interfaces.RxnIndex]:
+        """
+        Return the reactions producing one molecule.
+
+        Unlike producers_csr, this does not rebuild the index after every
+        added reaction, so it stays cheap when interleaved with additions.
+
+        Parameters
+        ----------
+        mol : int
+            Molecule index.
+
+        Returns
+        -------
+        list[interfaces.RxnIndex]
+            Reaction indices, in ascending order.
+        """
+        return self._producer_index.row(
+            self._product_offsets, self._product_flat, len(self._rows), mol
+        )
+
+    def __getstate__(self) -> tuple[numpy.ndarray, ...]:
+        # pickle the packed int32 columns (without spare capacity) instead of
+        # one Reaction object and two index tuples per row
+        return (
+            self.operators(),
+            *(arr.copy() for arr in self.reactants_csr()),
+            *(arr.copy() for arr in self.products_csr()),
+        )
+
+    def __setstate__(self, state: tuple[numpy.ndarray, ...]) -> None:
+        op_col, r_offsets, r_flat, p_offsets, p_flat = state
+        r_bounds = r_offsets.tolist()
+        p_bounds = p_offsets.tolist()
+        r_list = r_flat.tolist()
+        p_list = p_flat.tolist()
+        self.__init__(  # type: ignore [misc]
+            interfaces.Reaction(
+                interfaces.OpIndex(op),
+                tuple(r_list[r_bounds[i] : r_bounds[i + 1]]),
+                tuple(p_list[p_bounds[i] : p_bounds[i + 1]]),
+            )
+            for i, op in enumerate(op_col.tolist())
+        )
+
+
+def _top_rxns(
+    rxns: list[interfaces.RxnIndex],
+    k: int,
+    key: typing.Optional[
+        collections.abc.Callable[[interfaces.RxnIndex], typing.Any]
+    ],
+) -> list[interfaces.RxnIndex]:
+    # rows are in increasing reaction order, so without a key the smallest
+    # reactions are a prefix of the row
+    if key is None:
+        return rxns[: max(k, 0)]
+    return heapq.nsmallest(k, rxns, key=key)
+
+
+def _intern_uid(uid: interfaces.Identifier) -> interfaces.Identifier:
+    # string identifiers (e.g. SMILES) are stored interned, so lookups with the
+    # molecule's own uid resolve by identity rather than string comparison
+    if type(uid) is str:
+        return sys.intern(uid)
+    return uid
+
+
 class ChemNetworkBasic(interfaces.ChemNetwork):
     __slots__ = (
         "_mol_list",
@@ -257,9 +981,9 @@ class ChemNetworkBasic(interfaces.ChemNetwork):
         "_mol_meta",
         "_op_meta",
         "_rxn_meta",
-        "_mol_producers",
-        "_mol_consumers",
         "_compat_table",
+        "_compat_log",
+        "_compat_seen",
         "_mol_query",
         "_op_query",
         "_rxn_query",
@@ -269,22 +993,29 @@ class ChemNetworkBasic(interfaces.ChemNetwork):
     def __init__(self) -> None:
         self._mol_list: list[interfaces.MolDatBase] = []
         self._op_list: list[interfaces.OpDatBase] = []
-        self._rxn_list: list[interfaces.Reaction] = []
+        self._rxn_list = _ColumnarReactionStore()
 
         self._mol_map: dict[interfaces.Identifier, interfaces.MolIndex] = {}
         self._op_map: dict[interfaces.Identifier, interfaces.OpIndex] = {}
         self._rxn_map: dict[interfaces.Reaction, interfaces.RxnIndex] = {}
 
-        self._mol_meta: list[dict] = []
-        self._op_meta: list[dict] = []
-        self._rxn_meta: list[dict] = []
-
-        self._mol_producers: list[list[interfaces.RxnIndex]] = []
-        self._mol_consumers: list[list[interfaces.RxnIndex]] = []
+        self._mol_meta = _MetaColumns()
+        self._op_meta = _MetaColumns()
+        self._rxn_meta = _MetaColumns()
 
         self._compat_table: list[
             collections.abc.Sequence[list[interfaces.MolIndex]]
         ] = []
+        # molecules awaiting compatibility tests, with their custom (operator,
+        # argument) slots if given; each operator records how far into the
+        # log its table is current
+        self._compat_log: list[
+            tuple[
+                interfaces.MolIndex,
+                typing.Optional[frozenset[tuple[interfaces.OpIndex, int]]],
+            ]
+        ] = []
+        self._compat_seen: list[int] = []
 
         self._mol_query: typing.Optional[
             _ValueQueryData[interfaces.MolDatBase, interfaces.MolIndex]
@@ -298,6 +1029,44 @@ class ChemNetworkBasic(interfaces.ChemNetwork):
 
         self._reactive_list: list[bool] = []
 
+    def __getstate__(self) -> tuple[None, dict[str, typing.Any]]:
+        # the reaction map is rebuilt from the reaction columns on load, and
+        # query objects are recreated lazily
+        excluded = {"_rxn_map", "_mol_query", "_op_query", "_rxn_query"}
+        return None, {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if name not in excluded
+        }
+
+    def __setstate__(self, state: tuple[None, dict[str, typing.Any]]) -> None:
+        for name, value in state[1].items():
+            if name in ("_mol_producers", "_mol_consumers"):
+                # older networks stored one reaction list per molecule
+                continue
+            if name in ("_mol_meta", "_op_meta", "_rxn_meta") and isinstance(
+                value, list
+            ):
+                # networks saved with one metadata dict per item
+                setattr(self, name, _MetaColumns(value))
+            elif name == "_rxn_list" and not isinstance(
+                value, _ColumnarReactionStore
+            ):
+                # networks saved with a plain list of reactions
+                self._rxn_list = _ColumnarReactionStore(value)
+            else:
+                setattr(self, name, value)
+        if "_compat_log" not in state[1]:
+            # networks saved with fully computed compatibility tables
+            self._compat_log = []
+            self._compat_seen = [0] * len(self._op_list)
+        self._rxn_map = {
+            rxn: interfaces.RxnIndex(i) for i, rxn in enumerate(self._rxn_list)
+        }
+        self._mol_query = None
+        self._op_query = None
+        self._rxn_query = None
+
     @property
     def mols(
         self,
@@ -326,32 +1095,79 @@ class ChemNetworkBasic(interfaces.ChemNetwork):
             )
         return self._rxn_query
 
+    @property
+    def rxn_columns(self) -> _ColumnarReactionStore:
+        """Reactions with their indices stored as numpy columns."""
+        return self._rxn_list
+
     def compat_table(
         self, index: interfaces.OpIndex
     ) -> collections.abc.Sequence[
         collections.abc.Sequence[interfaces.MolIndex]
     ]:
-        return self._compat_table[index]
+        table = self._compat_table[index]
+        log = self._compat_log
+        seen = self._compat_seen[index]
+        if seen < len(log):
+            op = self._op_list[index]
+            for mol_index, custom in itertools.islice(log, seen, None):
+                if custom is None:
+                    mol = self._mol_list[mol_index]
+                    for argnum, mol_list in enumerate(table):
+                        if op.compat(mol, argnum):
+                            mol_list.append(mol_index)
+                else:
+                    for argnum, mol_list in enumerate(table):
+                        if (index, argnum) in custom:
+                            mol_list.append(mol_index)
+            self._compat_seen[index] = len(log)
+        return table
+
+    def _mol_index(
+        self,
+        mol: typing.Union[int, interfaces.MolDatBase, interfaces.Identifier],
+    ) -> int:
+        if isinstance(mol, int):
+            return mol
+        if isinstance(mol, interfaces.MolDatBase):
+            return self._mol_map[mol.uid]
+        return self._mol_map[mol]
 
     def consumers(
         self,
         mol: typing.Union[int, interfaces.MolDatBase, interfaces.Identifier],
     ) -> collections.abc.Collection[interfaces.RxnIndex]:
-        if isinstance(mol, int):
-            return self._mol_consumers[interfaces.MolIndex(mol)]
-        elif isinstance(mol, interfaces.MolDatBase):
-            return self._mol_consumers[self._mol_map[mol.uid]]
-        return self._mol_consumers[self._mol_map[mol]]
+        return self._rxn_list.consumers_of(self._mol_index(mol))
 
     def producers(
         self,
         mol: typing.Union[int, interfaces.MolDatBase, interfaces.Identifier],
     ) -> collections.abc.Collection[interfaces.RxnIndex]:
-        if isinstance(mol, int):
-            return self._mol_producers[interfaces.MolIndex(mol)]
-        elif isinstance(mol, interfaces.MolDatBase):
-            return self._mol_producers[self._mol_map[mol.uid]]
-        return self._mol_producers[self._mol_map[mol]]
+        return self._rxn_list.producers_of(self._mol_index(mol))
+
+    def consumers_top(
+        self,
+        mol: typing.Union[int, interfaces.MolDatBase, interfaces.Identifier],
+        k: int,
+        key: typing.Optional[
+            collections.abc.Callable[[interfaces.RxnIndex], typing.Any]
+        ] = None,
+    ) -> list[interfaces.RxnIndex]:
+        return _top_rxns(
+            self._rxn_list.consumers_of(self._mol_index(mol)), k, key
+        )
+
+    def producers_top(
+        self,
+        mol: typing.Union[int, interfaces.MolDatBase, interfaces.Identifier],
+        k: int,
+        key: typing.Optional[
+            collections.abc.Callable[[interfaces.RxnIndex], typing.Any]
+        ] = None,
+    ) -> list[interfaces.RxnIndex]:
+        return _top_rxns(
+            self._rxn_list.producers_of(self._mol_index(mol)), k, key
+        )
 
     def add_mol(
         self,
@@ -366,27 +1182,21 @@ class ChemNetworkBasic(interfaces.ChemNetwork):
             raise ValueError(
                 "`_custom_compat` cannot be specified when `reactive` is False"
             )
-        # if already in database, return existing index
+        # if already in database, return existing index; a single probe
+        # serves both the membership test and the lookup
         mol_uid = mol.uid
-        if mol_uid in self._mol_map:
-            mol_index = self._mol_map[mol_uid]
+        mol_index = self._mol_map.get(mol_uid)
+        if mol_index is not None:
             if meta is not None:
-                self._mol_meta[mol_index].update(meta)
+                self._mol_meta.update(mol_index, meta)
 
             if reactive is not True:
                 return mol_index
 
-            # if newly reactive, fill in compat table
+            # if newly reactive, queue it for the compat tables
             if not self._reactive_list[mol_index]:
                 self._reactive_list[mol_index] = True
-                if _custom_compat is None:
-                    for i, op in enumerate(self.ops):
-                        for argnum in range(len(op)):
-                            if op.compat(mol, argnum):
-                                self._compat_table[i][argnum].append(mol_index)
-                else:
-                    for op_index, argnum in _custom_compat:
-                        self._compat_table[op_index][argnum].append(mol_index)
+                self._log_compat(mol_index, _custom_compat)
             return mol_index
 
         # add mol to main mol list
@@ -394,32 +1204,29 @@ class ChemNetworkBasic(interfaces.ChemNetwork):
         self._mol_list.append(mol)
 
         # add mol id to UID mapping
-        self._mol_map[mol_uid] = mol_index
-
-        # extend consumer/producer table
-        self._mol_consumers.append([])
-        self._mol_producers.append([])
+        self._mol_map[_intern_uid(mol_uid)] = mol_index
 
         # add mol metadata to table
-        if meta is None:
-            self._mol_meta.append({})
-        else:
-            self._mol_meta.append(dict(meta))
+        self._mol_meta.append(meta)
 
         self._reactive_list.append(reactive is not False)
         if reactive is not False:
-            if _custom_compat is None:
-                # test operator compatibility and add to table
-                for i, op in enumerate(self.ops):
-                    for argnum in range(len(op)):
-                        if op.compat(mol, argnum):
-                            self._compat_table[i][argnum].append(mol_index)
-            else:
-                for op_index, argnum in _custom_compat:
-                    self._compat_table[op_index][argnum].append(mol_index)
+            self._log_compat(mol_index, _custom_compat)
 
         return mol_index
 
+    def _log_compat(
+        self,
+        mol_index: interfaces.MolIndex,
+        custom: typing.Optional[
+            collections.abc.Collection[tuple[interfaces.OpIndex, int]]
+        ],
+    ) -> None:
+        # operator compatibility is only tested once a table is read
+        if custom is not None:
+            custom = frozenset(custom)
+        self._compat_log.append((mol_index, custom))
+
     def add_op(
         self,
         op: interfaces.OpDatBase,
@@ -427,10 +1234,10 @@ class ChemNetworkBasic(interfaces.ChemNetwork):
     ) -> interfaces.OpIndex:
         # if already in database, return existing index
         op_uid = op.uid
-        if op_uid in self._op_map:
-            op_index = self._op_map[op_uid]
+        op_index = self._op_map.get(op_uid)
+        if op_index is not None:
             if meta is not None:
-                self._op_meta[op_index].update(meta)
+                self._op_meta.update(op_index, meta)
             return op_index
 
         # add op to main op list
@@ -441,12 +1248,11 @@ class ChemNetworkBasic(interfaces.ChemNetwork):
         self._op_map[op_uid] = op_index
 
         # add mol metadata to table
-        if meta is None:
-            self._op_meta.append({})
-        else:
-            self._op_meta.append(dict(meta))
+        self._op_meta.append(meta)
 
-        # test operator compatibility and add to table
+        # test operator compatibility and add to table; molecules already
+        # queued are covered here, so the table starts current
+        self._compat_seen.append(len(self._compat_log))
         self._compat_table.append(
             tuple(
                 [
@@ -485,12 +1291,29 @@ class ChemNetworkBasic(interfaces.ChemNetwork):
             rxn = interfaces.Reaction(
                 operator, tuple(reactants), tuple(products)
             )
+        return self._add_reaction(rxn, meta)
+
+    def add_rxn_triple(
+        self,
+        operator: interfaces.OpIndex,
+        reactants: tuple[interfaces.MolIndex, ...],
+        products: tuple[interfaces.MolIndex, ...],
+        meta: typing.Optional[collections.abc.Mapping] = None,
+    ) -> interfaces.RxnIndex:
+        return self._add_reaction(
+            interfaces.Reaction(operator, reactants, products), meta
+        )
 
+    def _add_reaction(
+        self,
+        rxn: interfaces.Reaction,
+        meta: typing.Optional[collections.abc.Mapping],
+    ) -> interfaces.RxnIndex:
         # if already in database, return existing index
-        if rxn in self._rxn_map:
-            rxn_index = self._rxn_map[rxn]
+        rxn_index = self._rxn_map.get(rxn)
+        if rxn_index is not None:
             if meta is not None:
-                self._rxn_meta[rxn_index].update(meta)
+                self._rxn_meta.update(rxn_index, meta)
             return rxn_index
 
         # sanity check that all reactants and products exist in the network
@@ -515,25 +1338,191 @@ class ChemNetworkBasic(interfaces.ChemNetwork):
         # add rxn to index mapping
         self._rxn_map[rxn] = rxn_index
 
-        # add consumption/production mappings
-        for i in rxn.reactants:
-            self._mol_consumers[i].append(rxn_index)
-        for i in rxn.products:
-            self._mol_producers[i].append(rxn_index)
-
         # add rxn metadata to table
-        if meta is None:
-            self._rxn_meta.append({})
-        else:
-            self._rxn_meta.append(dict(meta))
+        self._rxn_meta.append(meta)
 
         return rxn_index
 
+    def add_mols(
+        self,
+        mols: collections.abc.Sequence[interfaces.MolDatBase],
+        metas: typing.Optional[
+            collections.abc.Sequence[typing.Optional[collections.abc.Mapping]]
+        ] = None,
+        reactive: typing.Optional[bool] = None,
+    ) -> list[interfaces.MolIndex]:
+        if metas is None:
+            metas = [None] * len(mols)
+        elif len(metas) != len(mols):
+            raise ValueError(
+                f"Number of metadata entries ({len(metas)}) does not match "
+                f"number of molecules ({len(mols)})"
+            )
+
+        # molecules not yet in the network are appended in one block; the
+        # rest (and repeats within the batch) go through add_mol afterwards
+        mol_map = self._mol_map
+        start = len(self._mol_list)
+        new_mols: dict[interfaces.Identifier, interfaces.MolDatBase] = {}
+        new_metas: list[typing.Optional[collections.abc.Mapping]] = []
+        deferred: list[int] = []
+        for j, mol in enumerate(mols):
+            uid = mol.uid
+            mol_index = mol_map.get(uid)
+            if (
+                mol_index is not None
+                and reactive
+                and not self._reactive_list[mol_index]
+            ):
+                # an existing molecule becomes reactive, so its compatibility
+                # entries must land in batch order
+                return [
+                    self.add_mol(mol, meta, reactive)
+                    for mol, meta in zip(mols, metas, strict=True)
+                ]
+            if mol_index is not None or uid in new_mols:
+                deferred.append(j)
+            else:
+                new_mols[uid] = mol
+                new_metas.append(metas[j])
+
+        self._mol_list.extend(new_mols.values())
+        mol_map.update(
+            (_intern_uid(uid), interfaces.MolIndex(i))
+            for i, uid in enumerate(new_mols, start)
+        )
+        self._mol_meta.extend(new_metas)
+        self._reactive_list.extend([reactive is not False] * len(new_mols))
+        if reactive is not False:
+            self._compat_log.extend(
+                (interfaces.MolIndex(mol_index), None)
+                for mol_index in range(start, len(self._mol_list))
+            )
+
+        for j in deferred:
+            self.add_mol(mols[j], metas[j], reactive)
+        return [mol_map[mol.uid] for mol in mols]
+
+    def add_rxns(
+        self,
+        operators: collections.abc.Sequence[interfaces.OpIndex],
+        reactants: collections.abc.Sequence[
+            collections.abc.Sequence[interfaces.MolIndex]
+        ],
+        products: collections.abc.Sequence[
+            collections.abc.Sequence[interfaces.MolIndex]
+        ],
+        metas: typing.Optional[
+            collections.abc.Sequence[typing.Optional[collections.abc.Mapping]]
+        ] = None,
+    ) -> list[interfaces.RxnIndex]:
+        if not len(operators) == len(reactants) == len(products):
+            raise ValueError(
+                f"Numbers of operators ({len(operators)}), reactant sets "
+                f"({len(reactants)}), and product sets ({len(products)}) do "
+                "not match"
+            )
+        if metas is None:
+            metas = [None] * len(operators)
+        elif len(metas) != len(operators):
+            raise ValueError(
+                f"Number of metadata entries ({len(metas)}) does not match "
+                f"number of reactions ({len(operators)})"
+            )
+        rxns = [
+            interfaces.Reaction(op, tuple(r), tuple(p))
+            for op, r, p in zip(operators, reactants, products, strict=True)
+        ]
+
+        # sanity check that all components exist, for the whole batch at once
+        if rxns:
+            mol_indices = numpy.fromiter(
+                itertools.chain.from_iterable(
+                    itertools.chain(rxn.reactants, rxn.products) for rxn in rxns
+                ),
+                dtype=numpy.int64,
+            )
+            if len(mol_indices) and (
+                mol_indices.max() >= len(self._mol_list)
+                or mol_indices.min() < 0
+            ):
+                raise IndexError(
+                    "One of the molecule components for a reaction is not in "
+                    "the network."
+                )
+            if max(operators) >= len(self._op_list):
+                raise IndexError(
+                    "The operator for a reaction is not in the network."
+                )
+
+        rxn_map = self._rxn_map
+        start = len(self._rxn_list)
+        new_rxns: dict[interfaces.Reaction, interfaces.RxnIndex] = {}
+        new_metas: list[typing.Optional[collections.abc.Mapping]] = []
+        indices: list[interfaces.RxnIndex] = []
+        for rxn, meta in zip(rxns, metas, strict=True):
+            rxn_index = rxn_map.get(rxn)
+            if rxn_index is None:
+                rxn_index = new_rxns.get(rxn)
+            if rxn_index is None:
+                rxn_index = interfaces.RxnIndex(start + len(new_rxns))
+                new_rxns[rxn] = rxn_index
+                new_metas.append(None if meta is None else dict(meta))
+            elif meta is not None:
+                if rxn_index < start:
+                    self._rxn_meta.update(rxn_index, meta)
+                else:
+                    pending = new_metas[rxn_index - start]
+                    if pending is None:
+                        new_metas[rxn_index - start] = dict(meta)
+                    else:
+                        pending.update(meta)
+            indices.append(rxn_index)
+
+        self._rxn_list.extend(new_rxns)
+        rxn_map.update(new_rxns)
+        self._rxn_meta.extend(new_metas)
+        return indices
+
     @property
     def reactivity(self) -> collections.abc.Sequence[bool]:
         return self._reactive_list
 
 
+class _MetaTriggerQuery:
+    """Query library which records the items whose metadata is changed."""
+
+    __slots__ = ("_query", "_updated")
+
+    def __init__(self, query: typing.Any, updated: set) -> None:
+        self._query = query
+        self._updated = updated
+
+    def set_meta(self, index: int, values: collections.abc.Mapping) -> None:
+        cur_vals = self._query.meta(index, values.keys())
+        if any(
+            key not in cur_vals or cur_vals[key] != value
+            for key, value in values.items()
+        ):
+            self._updated.add(index)
+        self._query.set_meta(index, values)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self._query, name)
+
+    def __contains__(self, item: typing.Any) -> bool:
+        return item in self._query
+
+    def __getitem__(self, item: typing.Any) -> typing.Any:
+        return self._query[item]
+
+    def __len__(self) -> int:
+        return len(self._query)
+
+    def __iter__(self) -> collections.abc.Iterator:
+        return iter(self._query)
+
+
 @dataclasses.dataclass(frozen=True, slots=True)
 class ChemNetworkFacadeMetaTrigger(interfaces.ChemNetwork):
     network: interfaces.ChemNetwork
@@ -545,13 +1534,14 @@ class ChemNetworkFacadeMetaTrigger(interfaces.ChemNetwork):
         default_factory=set
     )
 
+    # metadata written through the libraries is recorded like add_mol/add_op
     @property
     def mols(self):
-        return self.network.mols
+        return _MetaTriggerQuery(self.network.mols, self.updated_mol_meta)
 
     @property
     def ops(self):
-        return self.network.ops
+        return _MetaTriggerQuery(self.network.ops, self.updated_op_meta)
 
     @property
     def rxns(self):
@@ -566,6 +1556,12 @@ class ChemNetworkFacadeMetaTrigger(interfaces.ChemNetwork):
     def producers(self, mol):
         return self.network.producers(mol)
 
+    def consumers_top(self, mol, k, key=None):
+        return self.network.consumers_top(mol, k, key)
+
+    def producers_top(self, mol, k, key=None):
+        return self.network.producers_top(mol, k, key)
+
     def add_mol(self, mol, meta=None, reactive=None, _custom_compat=None):
         if meta is not None and mol in self.network.mols:
             i = self.network.mols.i(mol.uid)
@@ -591,6 +1587,9 @@ class ChemNetworkFacadeMetaTrigger(interfaces.ChemNetwork):
     ):
         return self.network.add_rxn(operator, reactants, products, meta, rxn)
 
+    def add_rxn_triple(self, operator, reactants, products, meta=None):
+        return self.network.add_rxn_triple(operator, reactants, products, meta)
+
     @property
     def reactivity(self):
         return self.network.reactivity
@@ -603,7 +1602,7 @@ def dump_network_to_file(
     network: interfaces.ChemNetwork, filepath: str = "network.dat"
 ) -> None:
     with gzip.open(filepath, "wb") as fout:
-        pickle.dump(network, fout)
+        pickle.dump(network, fout, protocol=pickle.HIGHEST_PROTOCOL)
 
 
 def load_network_from_file(
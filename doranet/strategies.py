@@ -1,12 +1,18 @@
 """Contains classes which define and implement network expansion strategies."""
 
+import bisect
 import collections.abc
+import concurrent.futures
+import contextlib
 import dataclasses
+import functools
 import heapq
 import itertools
 import math
 import typing
 
+import numpy
+
 from doranet import interfaces, metadata
 from doranet import network as pgnetworks
 
@@ -782,7 +788,7 @@ def assemble_reaction_job(
     return ReactionJob(op, reactants)
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class RecipePriorityItem:
     rank: typing.Optional[interfaces.RankValue]
     recipe: interfaces.Recipe
@@ -804,19 +810,211 @@ class RecipePriorityItem:
         )
 
 
+def _enumerate_recipes(
+    bundle_indices: collections.abc.Iterable[
+        collections.abc.Sequence[collections.abc.Sequence[int]]
+    ],
+    num_args: int,
+) -> numpy.ndarray:
+    """
+    Enumerate the reactant combinations of recipe bundles in recipe order.
+
+    Parameters
+    ----------
+    bundle_indices : collections.abc.Iterable[
+                     collections.abc.Sequence[collections.abc.Sequence[int]]]
+        For each bundle, the molecule indices available to each argument.
+    num_args : int
+        Number of operator arguments.
+
+    Returns
+    -------
+    numpy.ndarray
+        Int32 array with one row of reactant indices per combination, sorted
+        ascending by the ordering of interfaces.Recipe (for a fixed operator).
+    """
+    blocks = [
+        numpy.stack(
+            [
+                grid.ravel()
+                for grid in numpy.meshgrid(
+                    *(numpy.asarray(arg, dtype=numpy.int32) for arg in args),
+                    indexing="ij",
+                )
+            ],
+            axis=1,
+        )
+        if num_args
+        else numpy.empty((1, 0), dtype=numpy.int32)
+        for args in bundle_indices
+    ]
+    if not blocks:
+        return numpy.empty((0, num_args), dtype=numpy.int32)
+    rows = numpy.concatenate(blocks)
+    if not num_args:
+        return rows
+    # Recipe compares the reactants sorted from highest to lowest index
+    # first, then the reactants in argument order, with higher indices
+    # ranking lower; lexsort takes its primary key last
+    desc = numpy.sort(rows, axis=1)[:, ::-1]
+    keys = [-desc[:, j] for j in range(num_args)]
+    keys += [-rows[:, j] for j in range(num_args)]
+    return rows[numpy.lexsort(keys[::-1])]
+
+
+# ranks cached per expand call; the cache holds a few heaps' worth of recipes
+# so that regenerated recipes are not re-ranked, and is otherwise bounded
+_RANK_CACHE_FACTOR = 4
+_RANK_CACHE_SIZE = 1 << 16
+
+
+class _RankCache:
+    """LRU cache of recipe ranks with reverse indices for invalidation.
+
+    Recipes are also indexed by operator and by reactant, so that the ranks
+    depending on updated molecules or operators are dropped without scanning
+    the whole cache.
+    """
+
+    __slots__ = ("_by_mol", "_by_op", "_maxsize", "_ranks")
+
+    def __init__(self, maxsize: int) -> None:
+        self._ranks: dict[
+            interfaces.Recipe, typing.Optional[interfaces.RankValue]
+        ] = {}
+        self._by_mol: dict[interfaces.MolIndex, set[interfaces.Recipe]] = {}
+        self._by_op: dict[interfaces.OpIndex, set[interfaces.Recipe]] = {}
+        self._maxsize = maxsize
+
+    def __len__(self) -> int:
+        return len(self._ranks)
+
+    def rank(
+        self,
+        ranker: interfaces.RecipeRanker,
+        recipe_explicit: interfaces.RecipeExplicit,
+        recipe: interfaces.Recipe,
+    ) -> typing.Optional[interfaces.RankValue]:
+        ranks = self._ranks
+        if recipe in ranks:
+            # move to the most recently used end
+            rank = ranks[recipe] = ranks.pop(recipe)
+            return rank
+        rank = ranks[recipe] = ranker(recipe_explicit)
+        self._by_op.setdefault(recipe.operator, set()).add(recipe)
+        for mol in recipe.reactants:
+            self._by_mol.setdefault(mol, set()).add(recipe)
+        if len(ranks) > self._maxsize:
+            self._discard(next(iter(ranks)))
+        return rank
+
+    def invalidate(
+        self,
+        mols: collections.abc.Iterable[interfaces.MolIndex],
+        ops: collections.abc.Iterable[interfaces.OpIndex],
+    ) -> None:
+        for op in ops:
+            for recipe in tuple(self._by_op.get(op, ())):
+                self._discard(recipe)
+        for mol in mols:
+            for recipe in tuple(self._by_mol.get(mol, ())):
+                self._discard(recipe)
+
+    def _discard(self, recipe: interfaces.Recipe) -> None:
+        del self._ranks[recipe]
+        self._unindex(self._by_op, recipe.operator, recipe)
+        for mol in recipe.reactants:
+            self._unindex(self._by_mol, mol, recipe)
+
+    @staticmethod
+    def _unindex(
+        index: dict[typing.Any, set[interfaces.Recipe]],
+        key: typing.Any,
+        recipe: interfaces.Recipe,
+    ) -> None:
+        recipes = index.get(key)
+        if recipes is None:
+            return
+        recipes.discard(recipe)
+        if not recipes:
+            del index[key]
+
+
+# number of recipes handed to RecipeFilter.filter_batch at once
+_FILTER_BATCH_SIZE = 512
+
+
+def _filter_recipes(
+    recipe_filter: interfaces.RecipeFilter,
+    recipe_generator: collections.abc.Iterable[
+        tuple[interfaces.RecipeExplicit, interfaces.Recipe]
+    ],
+) -> collections.abc.Generator[
+    tuple[interfaces.RecipeExplicit, interfaces.Recipe], None, None
+]:
+    # recipes are filtered in batches, and the kept ones are compacted with
+    # itertools.compress rather than branching on each recipe in Python
+    for chunk in _chunk_generator(_FILTER_BATCH_SIZE, recipe_generator):
+        batch = list(chunk)
+        yield from itertools.compress(
+            batch,
+            recipe_filter.filter_batch(
+                [recipe_explicit for recipe_explicit, _ in batch]
+            ),
+        )
+
+
+def _rank_recipes(
+    recipe_generator: collections.abc.Iterable[
+        tuple[interfaces.RecipeExplicit, interfaces.Recipe]
+    ],
+    recipe_filter: typing.Optional[interfaces.RecipeFilter],
+    recipe_ranker: interfaces.RecipeRanker,
+    min_val: typing.Optional[RecipePriorityItem],
+    rank_cache: typing.Optional[_RankCache],
+) -> collections.abc.Generator[RecipePriorityItem, None, None]:
+    # filtering, ranking and the min_val cut share one loop per batch, so
+    # each surviving recipe passes through a single generator frame
+    for chunk in _chunk_generator(_FILTER_BATCH_SIZE, recipe_generator):
+        batch = list(chunk)
+        kept: collections.abc.Iterable[
+            tuple[interfaces.RecipeExplicit, interfaces.Recipe]
+        ] = batch
+        if recipe_filter is not None:
+            kept = itertools.compress(
+                batch,
+                recipe_filter.filter_batch(
+                    [recipe_explicit for recipe_explicit, _ in batch]
+                ),
+            )
+        for recipe_explicit, recipe in kept:
+            if rank_cache is None:
+                rank = recipe_ranker(recipe_explicit)
+            else:
+                rank = rank_cache.rank(recipe_ranker, recipe_explicit, recipe)
+            recipe_item = RecipePriorityItem(rank, recipe)
+            if min_val is None or not (recipe_item < min_val):
+                yield recipe_item
+
+
 def execute_recipe_ranking(
     job: RecipeRankingJob,
     min_val: typing.Optional[RecipePriorityItem],
     recipes_tested: collections.abc.Collection[interfaces.Recipe],
+    rank_cache: typing.Optional[_RankCache] = None,
 ) -> "RecipeHeap":
     # filter molecules
     args_edited: tuple[
         tuple[interfaces.DataPacket[interfaces.MolDatBase], ...], ...
     ]
     if job.mol_filter is not None:
+        mol_filter = job.mol_filter
         args_edited = tuple(
             tuple(
-                mol for mol in arg_mols if job.mol_filter(mol, job.operator, i)
+                itertools.compress(
+                    arg_mols,
+                    mol_filter.filter_batch(arg_mols, job.operator, i),
+                )
             )
             for i, arg_mols in enumerate(job.op_args)
         )
@@ -832,52 +1030,73 @@ def execute_recipe_ranking(
     else:
         bundles = (interfaces.RecipeBundle(job.operator, args_edited),)
 
-    recipe_generator = (
-        (interfaces.RecipeExplicit(job.operator, reactants_data), recipe)
-        for reactants_data, recipe in itertools.chain(
-            *(
-                (
-                    (
-                        reactants_data,
-                        interfaces.Recipe(
-                            interfaces.OpIndex(job.operator.i),
+    if job.recipe_ranker is None and job.recipe_filter is None:
+        # nothing inspects the reactant data, so the combinations are
+        # enumerated from molecule indices alone and come out already sorted,
+        # which lets the heap be built without comparing recipes
+        op_index = interfaces.OpIndex(job.operator.i)
+        rows = _enumerate_recipes(
+            (
+                [[reactant.i for reactant in arg] for arg in bundle.args]
+                for bundle in bundles
+            ),
+            len(job.op_args),
+        )
+        ordered = [
+            RecipePriorityItem(None, recipe)
+            for recipe in (
+                interfaces.Recipe(op_index, tuple(row)) for row in rows.tolist()
+            )
+            if recipe not in recipes_tested
+        ]
+        if min_val is not None:
+            del ordered[: bisect.bisect_left(ordered, min_val)]
+        return RecipeHeap.from_sorted(ordered, job.heap_size)
+
+    # molecule indices are gathered once per bundle argument and combined
+    # alongside the packets, rather than read back out of every combination
+    op_recipe = functools.partial(
+        interfaces.Recipe, interfaces.OpIndex(job.operator.i)
+    )
+    candidates = (
+        (reactants_data, recipe)
+        for reactants_data, recipe in itertools.chain.from_iterable(
+            zip(
+                itertools.product(*bundle.args),
+                map(
+                    op_recipe,
+                    itertools.product(
+                        *(
                             tuple(
                                 interfaces.MolIndex(reactant.i)
-                                for reactant in reactants_data
-                            ),
-                        ),
-                    )
-                    for reactants_data in itertools.product(*bundle.args)
-                )
-                for bundle in bundles
+                                for reactant in arg
+                            )
+                            for arg in bundle.args
+                        )
+                    ),
+                ),
+                strict=True,
             )
+            for bundle in bundles
         )
         if recipe not in recipes_tested
     )
 
+    recipe_generator = (
+        (interfaces.RecipeExplicit(job.operator, reactants_data), recipe)
+        for reactants_data, recipe in candidates
+    )
+
     if job.recipe_ranker is None:
-        if job.recipe_filter is None:
-            return RecipeHeap.from_iter(
-                (
-                    recipe_item
-                    for recipe_item in (
-                        RecipePriorityItem(
-                            None,
-                            recipe,
-                        )
-                        for _, recipe in recipe_generator
-                    )
-                    if min_val is None or not (recipe_item < min_val)
-                ),
-                maxsize=job.heap_size,
-            )
+        assert job.recipe_filter is not None
         return RecipeHeap.from_iter(
             (
                 recipe_item
                 for recipe_item in (
                     RecipePriorityItem(None, recipe)
-                    for recipe_explicit, recipe in recipe_generator
-                    if job.recipe_filter(recipe_explicit)
+                    for _, recipe in _filter_recipes(
+                        job.recipe_filter, recipe_generator
+                    )
                 )
                 if min_val is None or not (recipe_item < min_val)
             ),
@@ -887,23 +1106,16 @@ def execute_recipe_ranking(
     # ideally, pass the min_rank to recipe_ranker, but only if the heap is full;
     # strategy utilizing heap and parallel reduction is likely best
     # but difficult to implement
-    if job.recipe_filter is None:
-        rank_generator = (
-            RecipePriorityItem(job.recipe_ranker(recipe_explicit), recipe)
-            for recipe_explicit, recipe in recipe_generator
-        )
-    else:
-        rank_generator = (
-            RecipePriorityItem(job.recipe_ranker(recipe_explicit), recipe)
-            for recipe_explicit, recipe in recipe_generator
-            if job.recipe_filter(recipe_explicit)
-        )
-    priority_item_generator = (
-        recipe_item
-        for recipe_item in rank_generator
-        if (min_val is None) or not (recipe_item < min_val)
+    return RecipeHeap.from_iter(
+        _rank_recipes(
+            recipe_generator,
+            job.recipe_filter,
+            job.recipe_ranker,
+            min_val,
+            rank_cache,
+        ),
+        maxsize=job.heap_size,
     )
-    return RecipeHeap.from_iter(priority_item_generator, maxsize=job.heap_size)
 
 
 class RecipeHeap:
@@ -953,12 +1165,25 @@ class RecipeHeap:
             heap.add_recipe(item)
         return heap
 
+    @classmethod
+    def from_sorted(
+        cls,
+        data: list[RecipePriorityItem],
+        maxsize: typing.Optional[int] = None,
+    ) -> "RecipeHeap":
+        heap = RecipeHeap(maxsize)
+        if maxsize is not None and len(data) > maxsize:
+            data = data[len(data) - maxsize :]
+        if data:
+            heap._ordered = data
+        return heap
+
     @property
     def min(self) -> typing.Optional[RecipePriorityItem]:
         if self._heap is None:
             if self._ordered is None or len(self._ordered) == 0:
                 return None
-            return min(self._ordered)
+            return self._ordered[0]
         return self._heap[0]
 
     def popvals(
@@ -973,9 +1198,12 @@ class RecipeHeap:
             vals = tuple(reversed(self._ordered))
             self._ordered = None
             return vals
-        return tuple(
-            self._ordered.pop() for _ in range(min(len(self._ordered), n))
-        )
+        # the top n recipes are taken off the end of the ordered list in one
+        # slice rather than popped one at a time
+        split = max(len(self._ordered) - n, 0)
+        vals = tuple(reversed(self._ordered[split:]))
+        del self._ordered[split:]
+        return vals
 
     @typing.overload
     def __getitem__(self, item: slice) -> list[RecipePriorityItem]: ...
@@ -1024,6 +1252,64 @@ class RecipeHeap:
         elif self._heap[0] < recipe:
             heapq.heapreplace(self._heap, recipe)
 
+    def __getstate__(self) -> tuple[typing.Any, ...]:
+        # heaps travel between processes as packed int32 recipe columns, with
+        # only the ranks kept as objects (or dropped when all are None),
+        # instead of one item, recipe and comparison key per entry
+        if self._ordered is not None:
+            items = self._ordered
+        elif self._heap is not None:
+            items = sorted(self._heap)
+        else:
+            return (self._maxsize, None, None, None, None)
+        ranks: typing.Optional[list[typing.Optional[interfaces.RankValue]]]
+        ranks = [item.rank for item in items]
+        if all(rank is None for rank in ranks):
+            ranks = None
+        recipes = [item.recipe for item in items]
+        sizes = numpy.array(
+            [len(recipe.reactants) for recipe in recipes], dtype=numpy.int32
+        )
+        return (
+            self._maxsize,
+            ranks,
+            numpy.array(
+                [recipe.operator for recipe in recipes], dtype=numpy.int32
+            ),
+            sizes,
+            numpy.fromiter(
+                itertools.chain.from_iterable(
+                    recipe.reactants for recipe in recipes
+                ),
+                dtype=numpy.int32,
+                count=int(sizes.sum()),
+            ),
+        )
+
+    def __setstate__(self, state: tuple[typing.Any, ...]) -> None:
+        maxsize, ranks, operators, sizes, flat = state
+        self._maxsize = maxsize
+        self._heap = None
+        self._ordered = None
+        if operators is None:
+            return
+        bounds = [0, *itertools.accumulate(sizes.tolist())]
+        reactants = flat.tolist()
+        if ranks is None:
+            ranks = itertools.repeat(None)
+        self._ordered = [
+            RecipePriorityItem(
+                rank,
+                interfaces.Recipe(
+                    interfaces.OpIndex(op),
+                    tuple(reactants[bounds[i] : bounds[i + 1]]),
+                ),
+            )
+            for i, (op, rank) in enumerate(
+                zip(operators.tolist(), ranks, strict=False)
+            )
+        ]
+
     def __add__(self, other: "RecipeHeap") -> "RecipeHeap":
         if self._maxsize != other._maxsize:
             raise ValueError(
@@ -1038,10 +1324,27 @@ def execute_reaction(
 ) -> collections.abc.Generator[
     tuple[interfaces.ReactionExplicit, bool], None, None
 ]:
+    product_packets = rxn_job.operator.item(*_job_reactants(rxn_job))
+    return _job_reactions(rxn_job, product_packets)
+
+
+def _job_reactants(
+    rxn_job: ReactionJob,
+) -> tuple[interfaces.MolDatBase, ...]:
     reactants = tuple(mol.item for mol in rxn_job.op_args)
     if rxn_job.operator.item is None or any(mol is None for mol in reactants):
         raise ValueError("ReactionJob has non-None item components!")
-    product_packets = rxn_job.operator.item(*reactants)
+    return reactants
+
+
+def _job_reactions(
+    rxn_job: ReactionJob,
+    product_packets: collections.abc.Iterable[
+        collections.abc.Iterable[interfaces.MolDatBase]
+    ],
+) -> collections.abc.Generator[
+    tuple[interfaces.ReactionExplicit, bool], None, None
+]:
     reactant_datapackets = tuple(
         interfaces.DataPacketE(p.i, p.item, p.meta) for p in rxn_job.op_args
     )
@@ -1062,31 +1365,62 @@ def execute_reaction(
         yield rxn, True
 
 
+def _execute_reactions_batched(
+    rxn_jobs: collections.abc.Collection[ReactionJob],
+    executor: concurrent.futures.Executor,
+) -> collections.abc.Generator[
+    tuple[interfaces.ReactionExplicit, bool], None, None
+]:
+    # jobs are grouped by operator so that each operator is sent to the
+    # workers once per chunk of reactant sets; reactions are still yielded
+    # in job order
+    groups: dict[int, list[int]] = {}
+    for i, rxn_job in enumerate(rxn_jobs):
+        groups.setdefault(rxn_job.operator.i, []).append(i)
+    rxn_jobs = tuple(rxn_jobs)
+    job_products: list = [None] * len(rxn_jobs)
+    for job_indices in groups.values():
+        op = rxn_jobs[job_indices[0]].operator.item
+        results = op.call_batch(
+            [_job_reactants(rxn_jobs[i]) for i in job_indices], executor
+        )
+        for i, product_packets in zip(job_indices, results, strict=True):
+            job_products[i] = product_packets
+    for rxn_job, product_packets in zip(rxn_jobs, job_products, strict=True):
+        yield from _job_reactions(rxn_job, product_packets)
+
+
 def execute_reactions(
     rxn_jobs: collections.abc.Collection[ReactionJob],
     rxn_analysis: typing.Optional[metadata.RxnAnalysisStep] = None,
+    executor: typing.Optional[concurrent.futures.Executor] = None,
 ) -> collections.abc.Iterable[tuple[interfaces.ReactionExplicit, bool]]:
-    rxn_generator = itertools.chain.from_iterable(
-        execute_reaction(rxn_job) for rxn_job in rxn_jobs
-    )
+    rxn_generator: collections.abc.Iterable[
+        tuple[interfaces.ReactionExplicit, bool]
+    ]
+    if executor is None:
+        rxn_generator = itertools.chain.from_iterable(
+            execute_reaction(rxn_job) for rxn_job in rxn_jobs
+        )
+    else:
+        rxn_generator = _execute_reactions_batched(rxn_jobs, executor)
     if rxn_analysis is None:
         return rxn_generator
     return rxn_analysis.execute(rxn_generator)
 
 
 class PriorityQueueStrategyBasic(interfaces.PriorityQueueStrategy):
-    __slots__ = ("_network",)
+    __slots__ = ("_network", "_num_procs")
 
     def __init__(
         self,
         network: interfaces.ChemNetwork,
         num_procs: typing.Optional[int] = None,
     ) -> None:
-        if num_procs is not None:
-            raise NotImplementedError(
-                f"Parallel processing not yet supported on {type(self)}"
-            )
         self._network = network
+        # only operator calls are distributed, to a worker pool created for
+        # each expand call
+        self._num_procs = num_procs
 
     def expand(
         self,
@@ -1110,6 +1444,8 @@ class PriorityQueueStrategyBasic(interfaces.PriorityQueueStrategy):
         beam_size: typing.Optional[int] = 1,
         batch_size: typing.Optional[int] = None,
         save_unreactive: bool = True,
+        *,
+        branching_factor: typing.Optional[int] = None,
     ) -> None:
         rxn_analysis_task: typing.Optional[metadata.RxnAnalysisStep] = None
         if reaction_plan is not None:
@@ -1118,12 +1454,29 @@ class PriorityQueueStrategyBasic(interfaces.PriorityQueueStrategy):
         else:
             mc_update = metadata.MetaUpdateResolver({}, {}, {})
 
+        # flatten composed filters once instead of per molecule/recipe
+        if mol_filter is not None:
+            mol_filter = mol_filter.compile()
+        if recipe_filter is not None:
+            recipe_filter = recipe_filter.compile()
+
         if heap_size is not None and beam_size is not None:
             raise ValueError(
                 f"""Heap size ({heap_size}) must be greater than beam size
                     ({beam_size})"""
             )
 
+        if branching_factor is not None:
+            if beam_size is None:
+                raise ValueError("Branching factor requires a beam size")
+            if branching_factor < 1:
+                raise ValueError(
+                    f"Branching factor ({branching_factor}) must be positive"
+                )
+            # the frontier never holds more than beam_size * branching_factor
+            # recipes; everything it cannot hold is dropped during ranking
+            heap_size = beam_size * branching_factor
+
         # set keysets so that updated reactions may occur and parameters may be
         # passed to parallel processes
         recipe_keyset: interfaces.MetaKeyPacket = interfaces.MetaKeyPacket()
@@ -1150,213 +1503,273 @@ class PriorityQueueStrategyBasic(interfaces.PriorityQueueStrategy):
         updated_ops_set: set[interfaces.OpIndex] = set()
         recipe_heap: RecipeHeap = RecipeHeap(maxsize=heap_size)
         recipes_tested: set[interfaces.Recipe] = set()
-
-        while (max_recipes is None or max_recipes > 0) and (
-            any(
+        # ranks of recipes seen during this call; recipes are regenerated
+        # whenever metadata changes, and the ranker may differ between calls
+        rank_cache = _RankCache(
+            _RANK_CACHE_SIZE
+            if heap_size is None
+            else max(heap_size * _RANK_CACHE_FACTOR, 1)
+        )
+        stale_mols: set[interfaces.MolIndex] = set()
+        stale_ops: set[interfaces.OpIndex] = set()
+
+        # the worker pool only lives for this call, so no processes are left
+        # behind once expand returns
+        with (
+            concurrent.futures.ProcessPoolExecutor(self._num_procs)
+            if self._num_procs is not None and self._num_procs > 1
+            else contextlib.nullcontext()
+        ) as executor:
+            while (max_recipes is None or max_recipes > 0) and (
                 any(
-                    i_tested < len(compat_mols)
-                    for i_tested, compat_mols in zip(
-                        op_index_table,
-                        network.compat_table(interfaces.OpIndex(op_index)),
-                        strict=False,
+                    any(
+                        i_tested < len(compat_mols)
+                        for i_tested, compat_mols in zip(
+                            op_index_table,
+                            network.compat_table(interfaces.OpIndex(op_index)),
+                            strict=False,
+                        )
+                    )
+                    for op_index, op_index_table in enumerate(
+                        compat_indices_table
                     )
                 )
-                for op_index, op_index_table in enumerate(compat_indices_table)
-            )
-            or len(updated_mols_set) != 0
-            or len(updated_ops_set) != 0
-            or len(recipe_heap) > 0
-        ):
-            for op_index in updated_ops_set:
-                compat_indices_table[op_index] = [
-                    0 for _ in range(len(compat_indices_table[op_index]))
-                ]
+                or len(updated_mols_set) != 0
+                or len(updated_ops_set) != 0
+                or len(recipe_heap) > 0
+            ):
+                for op_index in updated_ops_set:
+                    compat_indices_table[op_index] = [
+                        0 for _ in range(len(compat_indices_table[op_index]))
+                    ]
 
-            # for each operator, create recipe batches
-            cur_min = recipe_heap.min
-            for opIndex, _ in enumerate(network.ops):
-                # for each argument, accumulate a total of old_mols and new_mols
-                compat_table = network.compat_table(interfaces.OpIndex(opIndex))
-                compat_indices = compat_indices_table[opIndex]
-                if not all(compat_table):
-                    continue
-                # generate recipe batches
-                for batch in _generate_recipe_batches(
-                    compat_table, compat_indices, batch_size, updated_mols_set
-                ):
-                    # assemble recipe ranking job
-                    recipejob = assemble_recipe_batch_job(
-                        interfaces.OpIndex(opIndex),
-                        batch,
-                        network,
-                        recipe_keyset,
-                        recipe_ranker,
-                        heap_size,
-                        recipe_filter,
-                        mol_filter,
-                        bundle_filter,
-                    )
-                    new_recipe_heap = execute_recipe_ranking(
-                        recipejob, cur_min, recipes_tested
+                if stale_mols or stale_ops:
+                    rank_cache.invalidate(stale_mols, stale_ops)
+                    stale_mols.clear()
+                    stale_ops.clear()
+
+                # for each operator, create recipe batches
+                cur_min = recipe_heap.min
+                for opIndex, _ in enumerate(network.ops):
+                    # for each argument, accumulate a total of old_mols and
+                    # new_mols
+                    compat_table = network.compat_table(
+                        interfaces.OpIndex(opIndex)
                     )
-                    recipe_heap = recipe_heap + new_recipe_heap
-
-                continue
-
-            # update compat_indices_table
-            compat_indices_table = [
-                [
-                    len(mol_list)
-                    for mol_list in network.compat_table(interfaces.OpIndex(i))
-                ]
-                for i in range(len(network.ops))
-            ]
-
-            # perform beam expansion
-            recipes_to_be_expanded = recipe_heap.popvals(beam_size)
+                    compat_indices = compat_indices_table[opIndex]
+                    if not all(compat_table):
+                        continue
+                    # generate recipe batches
+                    for batch in _generate_recipe_batches(
+                        compat_table,
+                        compat_indices,
+                        batch_size,
+                        updated_mols_set,
+                    ):
+                        # assemble recipe ranking job
+                        recipejob = assemble_recipe_batch_job(
+                            interfaces.OpIndex(opIndex),
+                            batch,
+                            network,
+                            recipe_keyset,
+                            recipe_ranker,
+                            heap_size,
+                            recipe_filter,
+                            mol_filter,
+                            bundle_filter,
+                        )
+                        new_recipe_heap = execute_recipe_ranking(
+                            recipejob, cur_min, recipes_tested, rank_cache
+                        )
+                        recipe_heap = recipe_heap + new_recipe_heap
 
-            if len(recipes_to_be_expanded) == 0:
-                break
+                    continue
 
-            if max_recipes is not None:
-                if len(recipes_to_be_expanded) > max_recipes:
-                    recipes_to_be_expanded = recipes_to_be_expanded[
-                        :max_recipes
+                # update compat_indices_table
+                compat_indices_table = [
+                    [
+                        len(mol_list)
+                        for mol_list in network.compat_table(
+                            interfaces.OpIndex(i)
+                        )
                     ]
-                max_recipes = max_recipes - len(recipes_to_be_expanded)
+                    for i in range(len(network.ops))
+                ]
 
-            reaction_jobs = tuple(
-                assemble_reaction_job(
-                    reciperank.recipe, network, reaction_keyset
+                # perform beam expansion
+                recipes_to_be_expanded = recipe_heap.popvals(beam_size)
+                if branching_factor is not None:
+                    # recipes left over from the beam are pruned for good
+                    recipe_heap = RecipeHeap(maxsize=heap_size)
+
+                if len(recipes_to_be_expanded) == 0:
+                    break
+
+                if max_recipes is not None:
+                    if len(recipes_to_be_expanded) > max_recipes:
+                        recipes_to_be_expanded = recipes_to_be_expanded[
+                            :max_recipes
+                        ]
+                    max_recipes = max_recipes - len(recipes_to_be_expanded)
+
+                reaction_jobs = tuple(
+                    assemble_reaction_job(
+                        reciperank.recipe, network, reaction_keyset
+                    )
+                    for reciperank in recipes_to_be_expanded
                 )
-                for reciperank in recipes_to_be_expanded
-            )
 
-            # execute reactions
-            for rxn, pass_filter in execute_reactions(
-                reaction_jobs, rxn_analysis_task
-            ):
-                if not save_unreactive and not pass_filter:
-                    continue
-                # add product mols to network
-                products_indices = tuple(
-                    network.add_mol(mol.item, None, pass_filter)
-                    for mol in rxn.products
-                    if mol.item is not None
-                )
+                # execute reactions
+                for rxn, pass_filter in execute_reactions(
+                    reaction_jobs, rxn_analysis_task, executor
+                ):
+                    if not save_unreactive and not pass_filter:
+                        continue
+                    # add product mols to network
+                    products_indices = tuple(
+                        network.add_mol(mol.item, None, pass_filter)
+                        for mol in rxn.products
+                        if mol.item is not None
+                    )
 
-                # build reaction
-                reactants_indices = tuple(
-                    interfaces.MolIndex(mol.i) for mol in rxn.reactants
-                )
-                rxn_implicit = interfaces.Reaction(
-                    interfaces.OpIndex(rxn.operator.i),
-                    reactants_indices,
-                    products_indices,
-                )
+                    # build reaction
+                    reactants_indices = tuple(
+                        interfaces.MolIndex(mol.i) for mol in rxn.reactants
+                    )
+                    op_index = interfaces.OpIndex(rxn.operator.i)
 
-                # add reaction to network
-                rxn_index = network.add_rxn(rxn=rxn_implicit)
+                    # add reaction to network
+                    rxn_index = network.add_rxn_triple(
+                        op_index, reactants_indices, products_indices
+                    )
 
-                updated_mols_set = set()
-                updated_ops_set = set()
+                    updated_mols_set = set()
+                    updated_ops_set = set()
 
-                # update reactant metadata
-                key: collections.abc.Hashable
-                for m_dat in zip(
-                    reactants_indices, rxn.reactants, strict=False
-                ):
-                    if m_dat[1].meta is not None:
-                        cur_vals = network.mols.meta(m_dat[0], m_dat[1].meta)
-                        for key, v in m_dat[1].meta.items():
+                    # update reactant metadata
+                    key: collections.abc.Hashable
+                    for m_dat in zip(
+                        reactants_indices, rxn.reactants, strict=False
+                    ):
+                        if m_dat[1].meta is not None:
+                            cur_vals = network.mols.meta(
+                                m_dat[0], m_dat[1].meta
+                            )
+                            for key, v in m_dat[1].meta.items():
+                                value = v
+                                if (
+                                    key in mc_update.mol_updates
+                                    and key in cur_vals
+                                ):
+                                    value = mc_update.mol_updates[key](
+                                        value, cur_vals[key]
+                                    )
+                                if (
+                                    key not in cur_vals
+                                    or cur_vals[key] != value
+                                ):
+                                    network.mols.set_meta(
+                                        m_dat[0], {key: value}
+                                    )
+                                    if key in total_keyset.molecule_keys:
+                                        updated_mols_set.add(m_dat[0])
+                                        stale_mols.add(m_dat[0])
+
+                    # update product metadata
+                    for m_dat in zip(
+                        products_indices, rxn.products, strict=False
+                    ):
+                        if m_dat[1].meta is not None:
+                            cur_vals = network.mols.meta(
+                                m_dat[0], m_dat[1].meta
+                            )
+                            for key, v in m_dat[1].meta.items():
+                                value = v
+                                if (
+                                    key in mc_update.mol_updates
+                                    and key in cur_vals
+                                ):
+                                    value = mc_update.mol_updates[key](
+                                        value, cur_vals[key]
+                                    )
+                                if (
+                                    key not in cur_vals
+                                    or cur_vals[key] != value
+                                ):
+                                    network.mols.set_meta(
+                                        m_dat[0], {key: value}
+                                    )
+                                    if key in total_keyset.molecule_keys:
+                                        updated_mols_set.add(m_dat[0])
+                                        stale_mols.add(m_dat[0])
+
+                    # update operator metadata
+                    if rxn.operator.meta is not None:
+                        cur_vals = network.ops.meta(op_index, rxn.operator.meta)
+                        for key, v in rxn.operator.meta.items():
                             value = v
-                            if key in mc_update.mol_updates and key in cur_vals:
-                                value = mc_update.mol_updates[key](
-                                    value, cur_vals[key]
+                            if key in mc_update.op_updates and key in cur_vals:
+                                value = mc_update.op_updates[key](
+                                    value,
+                                    cur_vals[key],
                                 )
                             if key not in cur_vals or cur_vals[key] != value:
-                                network.mols.set_meta(m_dat[0], {key: value})
-                                if key in total_keyset.molecule_keys:
-                                    updated_mols_set.add(m_dat[0])
-
-                # update product metadata
-                for m_dat in zip(products_indices, rxn.products, strict=False):
-                    if m_dat[1].meta is not None:
-                        cur_vals = network.mols.meta(m_dat[0], m_dat[1].meta)
-                        for key, v in m_dat[1].meta.items():
+                                network.ops.set_meta(op_index, {key: value})
+                                if key in total_keyset.operator_keys:
+                                    updated_ops_set.add(op_index)
+                                    stale_ops.add(op_index)
+
+                    # update reaction metadata
+                    if rxn.reaction_meta is not None:
+                        cur_vals = network.rxns.meta(
+                            rxn_index, rxn.reaction_meta
+                        )
+                        for key, v in rxn.reaction_meta.items():
                             value = v
-                            if key in mc_update.mol_updates and key in cur_vals:
-                                value = mc_update.mol_updates[key](
+                            if key in mc_update.rxn_updates and key in cur_vals:
+                                value = mc_update.rxn_updates[key](
                                     value, cur_vals[key]
                                 )
                             if key not in cur_vals or cur_vals[key] != value:
-                                network.mols.set_meta(m_dat[0], {key: value})
-                                if key in total_keyset.molecule_keys:
-                                    updated_mols_set.add(m_dat[0])
-
-                # update operator metadata
-                if rxn.operator.meta is not None:
-                    cur_vals = network.ops.meta(
-                        rxn_implicit.operator, rxn.operator.meta
-                    )
-                    for key, v in rxn.operator.meta.items():
-                        value = v
-                        if key in mc_update.op_updates and key in cur_vals:
-                            value = mc_update.op_updates[key](
-                                value,
-                                cur_vals[key],
-                            )
-                        if key not in cur_vals or cur_vals[key] != value:
-                            network.ops.set_meta(
-                                rxn_implicit.operator, {key: value}
-                            )
-                            if key in total_keyset.operator_keys:
-                                updated_ops_set.add(rxn_implicit.operator)
-
-                # update reaction metadata
-                if rxn.reaction_meta is not None:
-                    cur_vals = network.rxns.meta(rxn_index, rxn.reaction_meta)
-                    for key, v in rxn.reaction_meta.items():
-                        value = v
-                        if key in mc_update.rxn_updates and key in cur_vals:
-                            value = mc_update.rxn_updates[key](
-                                value, cur_vals[key]
-                            )
-                        if key not in cur_vals or cur_vals[key] != value:
-                            network.rxns.set_meta(rxn_index, {key: value})
+                                network.rxns.set_meta(rxn_index, {key: value})
 
-            recipes_tested.update(
-                (reciperank.recipe for reciperank in recipes_to_be_expanded)
-            )
+                recipes_tested.update(
+                    (reciperank.recipe for reciperank in recipes_to_be_expanded)
+                )
 
-            if len(recipe_heap) == 0:
-                compat_indices_table = [
-                    [0 for _ in network.compat_table(interfaces.OpIndex(i))]
-                    for i in range(len(network.ops))
-                ]
+                # pruned recipes must not be regenerated once the queue runs dry
+                if len(recipe_heap) == 0 and branching_factor is None:
+                    compat_indices_table = [
+                        [0 for _ in network.compat_table(interfaces.OpIndex(i))]
+                        for i in range(len(network.ops))
+                    ]
 
-            # run global hooks
-            if global_hooks is not None:
-                fake_network = pgnetworks.ChemNetworkFacadeMetaTrigger(
-                    self._network, total_keyset
-                )
-                end_on_completion: bool = False
-                for hook_func in global_hooks:
-                    rval = hook_func(fake_network)
-                    if (
-                        rval
-                        is interfaces.GlobalHookReturnValue.STOP_SHORTCIRCUIT
-                    ):
+                # run global hooks
+                if global_hooks is not None:
+                    fake_network = pgnetworks.ChemNetworkFacadeMetaTrigger(
+                        self._network, total_keyset
+                    )
+                    end_on_completion: bool = False
+                    for hook_func in global_hooks:
+                        rval = hook_func(fake_network)
+                        stop = (
+                            interfaces.GlobalHookReturnValue.STOP_SHORTCIRCUIT
+                        )
+                        if rval is stop:
+                            return
+                        if rval is interfaces.GlobalHookReturnValue.STOP:
+                            end_on_completion = True
+                    if end_on_completion:
                         return
-                    if rval is interfaces.GlobalHookReturnValue.STOP:
-                        end_on_completion = True
-                if end_on_completion:
-                    return
+                    stale_mols.update(fake_network.updated_mol_meta)
+                    stale_ops.update(fake_network.updated_op_meta)
 
-            continue
+                continue
 
 
 class CartesianStrategyUpdated:
+    __slots__ = ("_network", "_engine")
+
     def __init__(
         self,
         network: interfaces.ChemNetwork,
@@ -24,6 +24,14 @@ class RxnTrackerDepthFirstNetwork(interfaces.RxnTrackerNetwork):
         ] = None,
         fail_on_unknown_reagent: bool = False,
         depth: typing.Optional[int] = None,
+        *,
+        branching_factor: typing.Optional[int] = None,
+        frontier: typing.Optional[
+            dict[
+                interfaces.MolIndex,
+                dict[interfaces.RxnIndex, tuple[interfaces.MolIndex, ...]],
+            ]
+        ] = None,
     ) -> collections.abc.Generator[
         list[frozenset[interfaces.RxnIndex]], None, None
     ]:
@@ -45,22 +53,37 @@ class RxnTrackerDepthFirstNetwork(interfaces.RxnTrackerNetwork):
             prev_gens_rxns = set()
         if reagent_table is None:
             reagent_table = set()
+        if frontier is None:
+            frontier = {}
         rxnsets: list[list[interfaces.RxnIndex]] = []
+        rxn_reactants: dict[
+            interfaces.RxnIndex, tuple[interfaces.MolIndex, ...]
+        ] = {}
         for mol in cur_gen_mols:
             if mol in reagent_table:
                 continue
             elif mol >= n_mols:
                 rxnsets.append([])
                 continue
+            # each molecule's producing reactions are looked up once and
+            # shared by every branch (and target) which reaches it
+            producers = frontier.get(mol)
+            if producers is None:
+                producers = frontier[mol] = {
+                    rxn: network.rxns[rxn].reactants
+                    for rxn in (
+                        network.producers(mol)
+                        if branching_factor is None
+                        else network.producers_top(mol, branching_factor)
+                    )
+                }
             newrxnset: list[interfaces.RxnIndex] = [
                 rxn
-                for rxn in network.producers(mol)
+                for rxn, reactants in producers.items()
                 if rxn not in prev_gens_rxns
-                and all(
-                    mol not in prev_gens_mols
-                    for mol in network.rxns[rxn].reactants
-                )
+                and all(mol not in prev_gens_mols for mol in reactants)
             ]
+            rxn_reactants.update((rxn, producers[rxn]) for rxn in newrxnset)
             rxnsets.append(newrxnset)
         if not fail_on_unknown_reagent:
             rxnsets = [rxnset for rxnset in rxnsets if len(rxnset) > 0]
@@ -79,7 +102,7 @@ class RxnTrackerDepthFirstNetwork(interfaces.RxnTrackerNetwork):
             required_reagents = set(
                 mol
                 for mol in itertools.chain(
-                    *(network.rxns[rxn].reactants for rxn in rxncombo)
+                    *(rxn_reactants[rxn] for rxn in rxncombo)
                 )
                 if mol not in reagent_table
             )
@@ -93,6 +116,8 @@ class RxnTrackerDepthFirstNetwork(interfaces.RxnTrackerNetwork):
                 reagent_table,
                 fail_on_unknown_reagent,
                 new_depth,
+                branching_factor=branching_factor,
+                frontier=frontier,
             ):
                 path.append(rxncombo)
                 yield path
@@ -103,6 +128,8 @@ class RxnTrackerDepthFirstNetwork(interfaces.RxnTrackerNetwork):
         reagent_table: collections.abc.Container[interfaces.MolIndex] = tuple(),
         fail_on_unknown_reagent: bool = False,
         max_depth: typing.Optional[int] = None,
+        *,
+        branching_factor: typing.Optional[int] = None,
     ) -> collections.abc.Generator[
         list[frozenset[interfaces.RxnIndex]], None, None
     ]:
@@ -118,9 +145,45 @@ class RxnTrackerDepthFirstNetwork(interfaces.RxnTrackerNetwork):
                 reagent_table=reagent_table,
                 fail_on_unknown_reagent=fail_on_unknown_reagent,
                 depth=max_depth,
+                branching_factor=branching_factor,
             )
         )
 
+    def getParentChainsBatch(
+        self,
+        targets: collections.abc.Iterable[interfaces.MolIndex],
+        reagent_table: collections.abc.Container[interfaces.MolIndex] = tuple(),
+        fail_on_unknown_reagent: bool = False,
+        max_depth: typing.Optional[int] = None,
+        *,
+        branching_factor: typing.Optional[int] = None,
+    ) -> dict[
+        interfaces.MolIndex,
+        collections.abc.Generator[
+            list[frozenset[interfaces.RxnIndex]], None, None
+        ],
+    ]:
+        if fail_on_unknown_reagent and not reagent_table:
+            raise ValueError(
+                "reagent table must be specified if fail_on_unknown_reagent is "
+                "True"
+            )
+        frontier: dict[
+            interfaces.MolIndex,
+            dict[interfaces.RxnIndex, tuple[interfaces.MolIndex, ...]],
+        ] = {}
+        return {
+            target: self._getchains(
+                [target],
+                reagent_table=reagent_table,
+                fail_on_unknown_reagent=fail_on_unknown_reagent,
+                depth=max_depth,
+                branching_factor=branching_factor,
+                frontier=frontier,
+            )
+            for target in targets
+        }
+
 
 T = typing.TypeVar("T")
 
@@ -0,0 +1,236 @@
+"""Test reaction filters."""
+
+import pickle
+
+import doranet as dn
+
+
+class _CountingFilter(dn.metadata.ReactionFilterBase):
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self, recipe):
+        self.calls += 1
+        return self.result
+
+
+def test_chain_filter_short_circuit():
+    f1 = _CountingFilter(True)
+    f2 = _CountingFilter(False)
+    f3 = _CountingFilter(True)
+    chain = dn.filters.ChainFilter(iter((f1, f2, f3)))
+
+    assert not chain(None)
+    assert not chain(None)
+    assert (f1.calls, f2.calls, f3.calls) == (2, 2, 0)
+    assert dn.filters.ChainFilter(())(None)
+
+    long_filters = [_CountingFilter(True) for _ in range(20)]
+    assert dn.filters.ChainFilter(long_filters)(None)
+    long_filters[-1].result = False
+    assert not dn.filters.ChainFilter(long_filters)(None)
+
+
+class _InvertedChain(dn.filters.ChainFilter):
+    def __call__(self, recipe):
+        return not super().__call__(recipe)
+
+
+class _SlottedChain(_InvertedChain):
+    __slots__ = ()
+
+
+def test_chain_filter_subclass():
+    for chain_type in (_InvertedChain, _SlottedChain):
+        chain = chain_type((_CountingFilter(True), _CountingFilter(False)))
+        assert type(chain) is chain_type
+        assert chain(None)
+
+
+def test_chain_filter_reorder():
+    class _Cheap(_CountingFilter):
+        cost = 0.1
+
+    cheap = _Cheap(False)
+    costly = _CountingFilter(True)
+    chain = dn.filters.ChainFilter((costly, cheap), reorder="static")
+    assert chain.filters == (cheap, costly)
+    assert not chain(None)
+    assert costly.calls == 0
+
+    rejecting = _CountingFilter(False)
+    chain = dn.filters.ChainFilter(
+        (costly, rejecting), reorder="adaptive", adapt_interval=4
+    )
+    assert chain.filters == (costly, rejecting)
+    for _ in range(4):
+        assert not chain(None)
+    assert chain.filters == (rejecting, costly)
+
+
+def test_max_atoms_filter():
+    engine = dn.create_engine()
+    rxn = dn.interfaces.ReactionExplicit(
+        dn.interfaces.DataPacketE(0, engine.op.rdkit("[C:1]>>[*:1]O"), None),
+        (dn.interfaces.DataPacketE(0, engine.mol.rdkit("CC"), None),),
+        (dn.interfaces.DataPacketE(1, engine.mol.rdkit("CCO"), None),),
+        None,
+    )
+    assert engine.filter.reaction.max_atoms(2, 6)(rxn)
+    assert not engine.filter.reaction.max_atoms(1, 6)(rxn)
+    assert engine.filter.reaction.max_atoms(3)(rxn)
+    assert not engine.filter.reaction.max_atoms(2)(rxn)
+    f = pickle.loads(pickle.dumps(engine.filter.reaction.max_atoms(1, 6)))
+    assert not f(rxn)
+
+    # the operator adds an oxygen to every product, so no reaction passes
+    no_oxygen = engine.filter.reaction.max_elements({8: 0})
+    assert not no_oxygen(rxn)
+    assert no_oxygen.filter_batch([rxn]) == [False]
+
+
+def test_filter_batch():
+    engine = dn.create_engine()
+    op = dn.interfaces.DataPacketE(0, engine.op.rdkit("[C:1]>>[*:1]O"), None)
+    rxns = [
+        dn.interfaces.ReactionExplicit(
+            op,
+            (),
+            tuple(
+                dn.interfaces.DataPacketE(i, engine.mol.rdkit(smi), None)
+                for i, smi in enumerate(products)
+            ),
+            None,
+        )
+        for products in (("CCO", "O"), ("CCCO", "O"), ("CO",), ("NCCN",))
+    ]
+    max_carbons = engine.filter.reaction.max_atoms(2, 6)
+    max_nitrogens = engine.filter.reaction.max_atoms(1, 7)
+    for f in (
+        max_carbons,
+        engine.filter.reaction.max_elements({6: 2, 7: 1}),
+        max_carbons & max_nitrogens,
+        max_carbons | max_nitrogens,
+        ~max_carbons ^ max_nitrogens,
+        dn.filters.ChainFilter((max_carbons, max_nitrogens)),
+    ):
+        assert f.filter_batch(rxns) == [f(rxn) for rxn in rxns]
+
+
+def test_chain_filter_flatten():
+    f1 = _CountingFilter(True)
+    f2 = _CountingFilter(True)
+    f3 = _CountingFilter(False)
+    chain = dn.filters.ChainFilter((f1 & f2, dn.filters.ChainFilter((f3,))))
+    assert chain.filters == (f1, f2, f3)
+    assert isinstance(chain, dn.filters.ChainFilter)
+    assert not chain(None)
+
+    engine = dn.create_engine()
+    chain = dn.filters.ChainFilter(
+        (
+            engine.filter.reaction.max_atoms(2, 6),
+            engine.filter.reaction.max_atoms(1, 7),
+        )
+    )
+    assert pickle.loads(pickle.dumps(chain)).filters == chain.filters
+
+
+def test_chain_filter_dedupe():
+    f1 = _CountingFilter(True)
+    gen = dn.filters.GenerationFilter(3, "gen")
+    chain = dn.filters.ChainFilter(
+        (f1, gen, f1 & dn.filters.GenerationFilter(3, "gen"))
+    )
+    assert chain.filters == (f1, gen)
+
+
+def test_chain_filter_constant_fold():
+    class _Never(_CountingFilter):
+        def is_always_false(self):
+            return True
+
+    f1 = _CountingFilter(True)
+    never = _Never(False)
+    always = dn.filters.AlwaysTrueFilter()
+    assert dn.filters.ChainFilter((always, f1)).filters == (f1,)
+    assert (always & f1) is f1
+    assert (f1 & always) is f1
+    assert dn.filters.ChainFilter((always,)).is_always_true()
+    chain = dn.filters.ChainFilter((f1, never), reorder="adaptive")
+    assert chain.filters == (never,)
+    assert chain.is_always_false()
+    assert not chain(None)
+    assert f1.calls == 0
+
+
+def test_chain_filter_fuse_element_limits():
+    engine = dn.create_engine()
+    f1 = _CountingFilter(True)
+    chain = dn.filters.ChainFilter(
+        (
+            engine.filter.reaction.max_atoms(4, 6),
+            f1,
+            engine.filter.reaction.max_atoms(1, 7),
+            engine.filter.reaction.max_elements({6: 2, 8: 3}),
+        )
+    )
+    assert chain.filters == (
+        dn.filters.ReactionFilterMaxElements(((7, 1), (6, 2), (8, 3))),
+        f1,
+    )
+
+
+def test_mol_filter_compile():
+    class _Bit(dn.interfaces.MolFilter):
+        def __init__(self, bit):
+            self.bit = bit
+
+        def __call__(self, mol, op=None, arg_num=None):
+            return bool(mol >> self.bit & 1)
+
+        @property
+        def meta_required(self):
+            return dn.interfaces.MetaKeyPacket(molecule_keys={self.bit})
+
+    a, b, c = _Bit(0), _Bit(1), _Bit(2)
+    composed = (a & b) | ~c ^ (b & ~a)
+    compiled = composed.compile()
+    assert compiled.meta_required == composed.meta_required
+    assert [compiled(i, None, 0) for i in range(8)] == [
+        composed(i, None, 0) for i in range(8)
+    ]
+    assert a.compile() is a
+    for f in (composed, compiled, ~a, a ^ c):
+        assert f.filter_batch(range(8), None, 0) == [
+            f(i, None, 0) for i in range(8)
+        ]
+
+    class _Counting(_Bit):
+        calls = 0
+
+        def __call__(self, mol, op=None, arg_num=None):
+            type(self).calls += 1
+            return super().__call__(mol, op, arg_num)
+
+    class _Cheap(_Bit):
+        cost = 0.1
+
+    compiled = (_Counting(0) & _Cheap(1)).compile()
+    assert not compiled(1, None, 0)
+    assert _Counting.calls == 0
+
+
+def test_mol_filter_index_batch():
+    mols = [dn.interfaces.DataPacket(i, None, None) for i in range(0, 300, 3)]
+    for indices in (frozenset(range(0, 500, 7)), {0, 9, 21}, ()):
+        for whitelist in (False, True):
+            f = dn.filters.MolFilterIndex(indices, whitelist)
+            for batch in (mols, mols[:4]):
+                assert f.filter_batch(batch) == [
+                    f(mol, None, None) for mol in batch
+                ]
+            assert pickle.loads(pickle.dumps(f)).filter_batch(mols) == (
+                f.filter_batch(mols)
+            )
@@ -1,7 +1,37 @@
 """Test importing the module."""
 
+import enum
+import inspect
+
 import doranet as dn
 
 
 def test_import_package():
     assert dn
+
+
+def test_no_instance_dict():
+    # instances are created in bulk during expansion, so library classes
+    # (and the interfaces they implement) should all define __slots__
+    for module in (
+        dn.datatypes,
+        dn.engine,
+        dn.filters,
+        dn.hooks,
+        dn.interfaces,
+        dn.metacalc,
+        dn.metadata,
+        dn.network,
+        dn.strategies,
+        dn.utils,
+    ):
+        for name, cls in vars(module).items():
+            if (
+                not inspect.isclass(cls)
+                or cls.__module__ != module.__name__
+                or issubclass(cls, (BaseException, enum.Enum, tuple))
+                or getattr(cls, "_is_protocol", False)
+                or name.startswith("__")
+            ):
+                continue
+            assert not cls.__dictoffset__, f"{module.__name__}.{name}"
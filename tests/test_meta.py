@@ -1,5 +1,7 @@
 """Test metadata updates."""
 
+import pickle
+
 import doranet as dn
 
 
@@ -21,3 +23,17 @@ def test_meta_update():
     assert network.mols.meta(dn.interfaces.MolIndex(1), ("gen",))["gen"] == 1
     assert network.mols.meta(dn.interfaces.MolIndex(2), ("gen",))["gen"] == 1
     assert network.mols.meta(dn.interfaces.MolIndex(3), ("gen",))["gen"] == 2  # noqa: PLR2004
+
+
+def test_meta_key_packet_covers():
+    packet = dn.interfaces.MetaKeyPacket
+    both = packet(molecule_keys={"gen", "mw"}, live_molecule=True)
+    gen = packet(molecule_keys={"gen"})
+    assert both.covers(gen)
+    assert not gen.covers(both)
+    assert not both.covers(packet(operator_keys={"gen"}))
+    assert (both + gen) is both
+    assert (gen + packet(molecule_keys={"mw"})).covers(gen)
+    loaded = pickle.loads(pickle.dumps(both))
+    assert loaded == both
+    assert loaded.covers(gen)
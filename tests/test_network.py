@@ -0,0 +1,304 @@
+"""Test network storage."""
+
+import pickle
+
+import numpy
+
+import doranet as dn
+
+
+class _Legacy:
+    """Pickles as an instance of `cls` holding the default slot state."""
+
+    def __init__(self, cls, slots):
+        self.cls = cls
+        self.slots = slots
+
+    def __reduce__(self):
+        return object.__new__, (self.cls,), (None, self.slots)
+
+
+def _legacy_mol(mol):
+    return _Legacy(type(mol), {"_blob": mol.blob, "_smiles": mol.smiles})
+
+
+def _legacy_network(network):
+    # the slot state of a network pickled before its storage was reworked
+    num_mols = len(network.mols)
+    return _Legacy(
+        dn.network.ChemNetworkBasic,
+        {
+            "_mol_list": [_legacy_mol(mol) for mol in network.mols],
+            "_op_list": list(network.ops),
+            "_rxn_list": list(network.rxns),
+            "_mol_map": {mol.uid: i for i, mol in enumerate(network.mols)},
+            "_op_map": {op.uid: i for i, op in enumerate(network.ops)},
+            "_rxn_map": {rxn: i for i, rxn in enumerate(network.rxns)},
+            "_mol_meta": [dict(meta) for meta in network.mols.meta()],
+            "_op_meta": [dict(meta) for meta in network.ops.meta()],
+            "_rxn_meta": [dict(meta) for meta in network.rxns.meta()],
+            "_mol_producers": [
+                list(network.producers(i)) for i in range(num_mols)
+            ],
+            "_mol_consumers": [
+                list(network.consumers(i)) for i in range(num_mols)
+            ],
+            "_compat_table": [
+                tuple(list(arg) for arg in network.compat_table(i))
+                for i in range(len(network.ops))
+            ],
+            "_mol_query": None,
+            "_op_query": None,
+            "_rxn_query": None,
+            "_reactive_list": list(network.reactivity),
+        },
+    )
+
+
+def _tracker_network(engine):
+    network = engine.new_network()
+    for smi in ("CCO", "CC(C)=O", "O"):
+        network.add_mol(engine.mol.rdkit(smi), {"gen": 0})
+    network.add_op(engine.op.rdkit("[C;H2,H3:1]-[O;H1:2]>>[*:1]=[*:2]"))
+    engine.strat.cartesian(network).expand(num_iter=2)
+    return network
+
+
+def test_reaction_columns():
+    engine = dn.create_engine()
+    network = engine.new_network()
+    for smi in ("CC", "CCO", "O", "N", "CN"):
+        network.add_mol(engine.mol.rdkit(smi))
+    network.add_op(engine.op.rdkit("[C:1]>>[*:1]O"))
+    network.add_op(engine.op.rdkit("[C:1]>>[*:1]N"))
+    for i in range(5):
+        for j in range(5):
+            network.add_rxn(i % 2, (i,), (j, (i + j) % 5, 2))
+
+    for net in (network, pickle.loads(pickle.dumps(network))):
+        columns = net.rxn_columns
+        assert len(columns) == len(net.rxns)
+        assert columns.operators().tolist() == [
+            rxn.operator for rxn in net.rxns
+        ]
+        assert columns.with_operator(1).tolist() == [
+            i for i, rxn in enumerate(net.rxns) if rxn.operator == 1
+        ]
+        offsets, flat = columns.products_csr()
+        assert len(offsets) == len(columns) + 1
+        for i, rxn in enumerate(net.rxns):
+            assert net.rxns.i(rxn) == i
+            assert tuple(columns.reactant_view(i)) == rxn.reactants
+            assert tuple(columns.product_view(i)) == rxn.products
+            assert tuple(flat[offsets[i] : offsets[i + 1]]) == rxn.products
+        for mol in range(len(net.mols)):
+            assert net.consumers(mol) == [
+                i for i, rxn in enumerate(net.rxns) if mol in rxn.reactants
+            ]
+            assert net.producers(mol) == [
+                i
+                for i, rxn in enumerate(net.rxns)
+                for product in rxn.products
+                if product == mol
+            ]
+            assert net.producers_top(mol, 2) == net.producers(mol)[:2]
+            assert (
+                net.consumers_top(mol, 2, key=lambda r: -r)
+                == sorted(net.consumers(mol), reverse=True)[:2]
+            )
+
+
+def test_meta_columns():
+    engine = dn.create_engine()
+    network = engine.new_network()
+    network.add_mol(engine.mol.rdkit("CC"), {"gen": 0, "mw": 30.1})
+    network.add_mol(engine.mol.rdkit("CCO"))
+    network.add_mol(engine.mol.rdkit("O"), {"gen": 1})
+    network.mols.set_meta(1, {"mw": 46.1})
+    # meta returns snapshots; writes only go through set_meta
+    row = network.mols.meta(2)
+    rows = network.mols.meta([2])
+    row["mw"] = rows[0]["mw"] = 0.0
+    network.mols.set_meta(2, {"mw": 18.0})
+    assert type(row) is dict
+    assert row == rows[0] == {"gen": 1, "mw": 0.0}
+
+    for net in (network, pickle.loads(pickle.dumps(network))):
+        assert net.mols.meta(range(3), ["gen"]) == (
+            {"gen": 0},
+            {},
+            {"gen": 1},
+        )
+        assert net.mols.meta(1, ["gen", "mw"]) == {"mw": 46.1}
+        assert net.mols.meta(2) == {"gen": 1, "mw": 18.0}
+        assert list(net.mols.meta()) == [
+            {"gen": 0, "mw": 30.1},
+            {"mw": 46.1},
+            {"gen": 1, "mw": 18.0},
+        ]
+
+
+def test_bulk_add():
+    engine = dn.create_engine()
+    smiles = ("CC", "CCO", "O", "CC", "N", "CN")
+    metas = ({"gen": 0}, None, {"gen": 1}, {"mw": 30.1}, None, {"gen": 2})
+    rxns = ((0, (0,), (1,)), (1, (4,), (3, 1)), (0, (0,), (1,)))
+    networks = []
+    for bulk in (False, True):
+        network = engine.new_network()
+        network.add_op(engine.op.rdkit("[C:1]>>[*:1]O"))
+        network.add_mol(engine.mol.rdkit("N"), reactive=False)
+        network.add_op(engine.op.rdkit("[N:1]>>[*:1]C"))
+        mols = [engine.mol.rdkit(smi) for smi in smiles]
+        if bulk:
+            mol_indices = network.add_mols(mols, metas)
+            rxn_indices = network.add_rxns(
+                *zip(*rxns, strict=True), [None, {"a": 1}, {"b": 2}]
+            )
+        else:
+            mol_indices = [
+                network.add_mol(mol, meta)
+                for mol, meta in zip(mols, metas, strict=True)
+            ]
+            rxn_indices = [
+                network.add_rxn(*rxn, meta)
+                for rxn, meta in zip(
+                    rxns, [None, {"a": 1}, {"b": 2}], strict=True
+                )
+            ]
+        networks.append(network)
+        assert mol_indices == [1, 2, 3, 1, 0, 4]
+        assert rxn_indices == [0, 1, 0]
+    serial, bulk = networks
+    assert list(bulk.mols) == list(serial.mols)
+    assert list(bulk.rxns) == list(serial.rxns)
+    assert bulk.reactivity == serial.reactivity
+    for i in range(2):
+        assert bulk.compat_table(i) == serial.compat_table(i)
+    assert [dict(m) for m in bulk.mols.meta()] == [
+        dict(m) for m in serial.mols.meta()
+    ]
+    assert [dict(m) for m in bulk.rxns.meta()] == [
+        dict(m) for m in serial.rxns.meta()
+    ]
+    assert bulk.rxn_columns.products_csr()[1].tolist() == [1, 3, 1]
+
+
+def test_meta_array():
+    engine = dn.create_engine()
+    network = engine.new_network()
+    network.add_mol(engine.mol.rdkit("CC"), {"gen": 0, "mw": 30.1})
+    network.add_mol(engine.mol.rdkit("CCO"), {"gen": 1})
+    network.add_mol(engine.mol.rdkit("O"), {"gen": 1, "mw": 18.0})
+
+    arr = network.mols.meta_array(None, ["gen", "mw"], {"gen": "i8"}, fill=-1)
+    assert arr.gen.tolist() == [0, 1, 1]
+    assert arr.mw.tolist() == [30.1, -1, 18.0]
+    arr = network.mols.meta_array([2, 1], ["mw"])
+    assert arr.mw[0] == network.mols.meta(2)["mw"]
+    assert numpy.isnan(arr.mw[1])
+    assert len(network.mols.meta_array(None, [])) == len(network.mols)
+
+
+def test_load_legacy_pickles():
+    engine = dn.create_engine()
+    for mol_type in (dn.datatypes.MolDatBasicV1, dn.datatypes.MolDatBasicV2):
+        mol = mol_type("OCC")
+        loaded = pickle.loads(pickle.dumps(_legacy_mol(mol)))
+        assert type(loaded) is mol_type
+        assert loaded.uid == mol.uid
+        assert loaded.uid is loaded.smiles
+        assert loaded.blob == mol.blob
+        assert pickle.loads(pickle.dumps(loaded)) is loaded
+
+    network = _tracker_network(engine)
+    loaded = pickle.loads(pickle.dumps(_legacy_network(network)))
+    assert [mol.uid for mol in loaded.mols] == [mol.uid for mol in network.mols]
+    assert list(loaded.rxns) == list(network.rxns)
+    assert loaded.mols.i(network.mols[1].uid) == 1
+    assert [dict(m) for m in loaded.mols.meta()] == [
+        dict(m) for m in network.mols.meta()
+    ]
+    for i in range(len(network.mols)):
+        assert loaded.producers(i) == network.producers(i)
+        assert loaded.consumers(i) == network.consumers(i)
+    assert loaded.rxn_columns.operators().tolist() == [
+        rxn.operator for rxn in network.rxns
+    ]
+    rxn = loaded.add_rxn(0, (1,), (0, 2))
+    assert rxn == len(network.rxns)
+    assert rxn in loaded.producers(0)
+    assert rxn in loaded.consumers(1)
+    assert loaded.add_rxns([0], [(1,)], [(0, 2)]) == [rxn]
+
+
+def test_interleaved_rxn_queries():
+    engine = dn.create_engine()
+    network = engine.new_network()
+    for smi in ("CC", "CCO", "O", "N", "CN", "CCN"):
+        network.add_mol(engine.mol.rdkit(smi))
+    network.add_op(engine.op.rdkit("[C:1]>>[*:1]O"))
+    consumers = [[] for _ in network.mols]
+    producers = [[] for _ in network.mols]
+    # enough reactions that the reverse indices are rebuilt several times
+    for i in range(1500):
+        reactants = (i % 6, (i // 6) % 6, (i // 36) % 6, (i // 216) % 6)
+        products = (i % 5, (i // 5 + 1) % 6)
+        num_rxns = len(network.rxns)
+        rxn = network.add_rxn(0, reactants, products)
+        if rxn == num_rxns:
+            for mol in reactants:
+                consumers[mol].append(rxn)
+            for mol in products:
+                producers[mol].append(rxn)
+        mol = i % 6
+        assert network.consumers(mol) == consumers[mol]
+        assert network.producers(mol) == producers[mol]
+    indptr, indices = network.rxn_columns.producers_csr(len(network.mols))
+    for mol, rxns in enumerate(producers):
+        assert indices[indptr[mol] : indptr[mol + 1]].tolist() == rxns
+
+
+def _eager_compat_table(network, op_index):
+    op = network.ops[op_index]
+    return tuple(
+        [
+            i
+            for i, mol in enumerate(network.mols)
+            if network.reactivity[i] and op.compat(mol, argnum)
+        ]
+        for argnum in range(len(op))
+    )
+
+
+def test_lazy_compat_table():
+    engine = dn.create_engine()
+    network = engine.new_network()
+    network.add_mol(engine.mol.rdkit("CCO"))
+    network.add_op(engine.op.rdkit("[C;H2,H3:1]-[O;H1:2]>>[*:1]=[*:2]"))
+    network.add_mols([engine.mol.rdkit(smi) for smi in ("CC(C)=O", "OCCO")])
+    assert network.compat_table(0) == _eager_compat_table(network, 0)
+    network.add_mol(engine.mol.rdkit("CCCO"))
+    network.add_mol(engine.mol.rdkit("CO"), reactive=False)
+    network.add_mols([engine.mol.rdkit(smi) for smi in ("CC=O", "CCC=O")])
+    # molecules queued before the operator are not tested a second time
+    network.add_op(
+        engine.op.rdkit(
+            "[O:1]=[C:2]-[C;H2,H3:3].[C:4]=[O:5]>>[*:1]=[*:2]-[*:3]=[*:4].[*:5]"
+        )
+    )
+    network.add_mol(engine.mol.rdkit("CC(=O)CC"))
+    for i in range(len(network.ops)):
+        assert network.compat_table(i) == _eager_compat_table(network, i)
+        assert network.compat_table(i) == _eager_compat_table(network, i)
+
+    # networks saved with fully computed tables
+    network = _tracker_network(engine)
+    tables = [
+        tuple(list(arg) for arg in network.compat_table(i))
+        for i in range(len(network.ops))
+    ]
+    loaded = pickle.loads(pickle.dumps(_legacy_network(network)))
+    assert [loaded.compat_table(i) for i in range(len(loaded.ops))] == tables
+    loaded.add_mol(engine.mol.rdkit("CCCCO"))
+    assert loaded.compat_table(0) == _eager_compat_table(loaded, 0)
@@ -0,0 +1,171 @@
+"""Test expansion strategies."""
+
+import multiprocessing
+import pickle
+
+import pytest
+
+import doranet as dn
+
+
+def test_pq_parallel_matches_serial():
+    engine = dn.create_engine()
+    networks = []
+    for num_procs in (None, 2):
+        network = engine.new_network()
+        for smi in ("CCO", "CC(C)=O", "O"):
+            network.add_mol(engine.mol.rdkit(smi))
+        network.add_op(engine.op.rdkit("[C;H2,H3:1]-[O;H1:2]>>[*:1]=[*:2]"))
+        network.add_op(
+            engine.op.rdkit(
+                "[O:1]=[C:2]-[C;H2,H3:3].[C:4]=[O:5]>>[*:1]=[*:2]-[*:3]=[*:4].[*:5]"
+            )
+        )
+        strat = dn.strategies.PriorityQueueStrategyBasic(network, num_procs)
+        strat.expand(max_recipes=30, beam_size=None)
+        # the worker pool is shut down when expand returns
+        assert not multiprocessing.active_children()
+        networks.append(network)
+    serial, parallel = networks
+    assert [mol.uid for mol in parallel.mols] == [
+        mol.uid for mol in serial.mols
+    ]
+    assert list(parallel.rxns) == list(serial.rxns)
+
+
+class _IndexRanker(dn.interfaces.RecipeRanker):
+    def __call__(self, recipe, min_rank=None):
+        return recipe.reactants[0].i
+
+    @property
+    def meta_required(self):
+        return dn.interfaces.MetaKeyPacket()
+
+
+def test_pq_branching_factor_prunes():
+    engine = dn.create_engine()
+    reactions = []
+    for branching_factor in (None, 1):
+        network = engine.new_network()
+        for smi in ("CC", "CCC"):
+            network.add_mol(engine.mol.rdkit(smi))
+        network.add_op(engine.op.rdkit("[C;H3:1]>>[*:1]O"))
+        strat = dn.strategies.PriorityQueueStrategyBasic(network)
+        strat.expand(
+            beam_size=1,
+            recipe_ranker=_IndexRanker(),
+            branching_factor=branching_factor,
+        )
+        reactions.append({rxn.reactants for rxn in network.rxns})
+    # ethane loses to propane in the first beam and is never revisited
+    assert reactions == [{(0,), (1,), (2,), (4,)}, {(1,), (2,)}]
+    with pytest.raises(ValueError):
+        strat.expand(beam_size=None, branching_factor=2)
+
+
+class _ScoreRanker(dn.interfaces.RecipeRanker):
+    def __call__(self, recipe, min_rank=None):
+        return recipe.reactants[0].meta.get("score", -1)
+
+    @property
+    def meta_required(self):
+        return dn.interfaces.MetaKeyPacket(molecule_keys={"score"})
+
+
+class _DemoteHook(dn.interfaces.GlobalUpdateHook):
+    def __init__(self, mol):
+        self.mol = mol
+
+    def __call__(self, network):
+        if self.mol is not None:
+            network.mols.set_meta(self.mol, {"score": 0})
+            self.mol = None
+        return dn.interfaces.GlobalHookReturnValue.CONTINUE
+
+
+def test_pq_hook_meta_reranks():
+    engine = dn.create_engine()
+    network = engine.new_network()
+    for score, smi in enumerate(("CCCC", "CCC", "CC")):
+        network.add_mol(engine.mol.rdkit(smi), {"score": score})
+    network.add_op(engine.op.rdkit("[C;H3:1]>>[*:1]O"))
+    strat = dn.strategies.PriorityQueueStrategyBasic(network)
+    # the queue drains every round, so the remaining recipes are regenerated
+    # and must be ranked with the score the hook wrote
+    strat.expand(
+        max_recipes=2,
+        recipe_ranker=_ScoreRanker(),
+        global_hooks=[_DemoteHook(1)],
+        heap_size=1,
+        beam_size=None,
+    )
+    assert [rxn.reactants for rxn in network.rxns] == [(2,), (0,)]
+
+
+def test_composite_ranker_meta_required():
+    empty = dn.interfaces.CompositeRecipeRanker(())
+    assert empty.meta_required == dn.interfaces.MetaKeyPacket()
+    composite = _IndexRanker().append(_ScoreRanker())
+    assert composite.meta_required.molecule_keys == {"score"}
+
+
+def test_enumerate_recipes_order():
+    bundles = [[[4, 0, 7], [7, 2]], [[1], [3, 0, 5]]]
+    rows = dn.strategies._enumerate_recipes(bundles, 2).tolist()
+    recipes = [
+        dn.interfaces.Recipe(1, (a, b))
+        for args in bundles
+        for a in args[0]
+        for b in args[1]
+    ]
+    assert [dn.interfaces.Recipe(1, tuple(row)) for row in rows] == sorted(
+        recipes
+    )
+
+
+def test_recipe_heap_pickle():
+    recipes = [
+        dn.interfaces.Recipe(dn.interfaces.OpIndex(i % 3), reactants)
+        for i, reactants in enumerate(((0,), (2, 1), (1,), (0, 0, 4), (3,)))
+    ]
+    for ranks in ((None,) * 5, (0.5, None, 2.0, 1.0, -1.0)):
+        heap = dn.strategies.RecipeHeap.from_iter(
+            (
+                dn.strategies.RecipePriorityItem(rank, recipe)
+                for rank, recipe in zip(ranks, recipes, strict=True)
+            ),
+            4,
+        )
+        loaded = pickle.loads(pickle.dumps(heap))
+        assert list(loaded) == list(heap)
+        assert loaded.popvals(2) == heap.popvals(2)
+    assert len(pickle.loads(pickle.dumps(dn.strategies.RecipeHeap(4)))) == 0
+
+
+def test_rank_cache_invalidate_and_bound():
+    calls = []
+
+    def ranker(recipe):
+        calls.append(recipe)
+        return len(calls)
+
+    recipes = [
+        dn.interfaces.Recipe(dn.interfaces.OpIndex(op), reactants)
+        for op, reactants in ((0, (0,)), (0, (1, 2)), (1, (2,)), (1, (3,)))
+    ]
+    cache = dn.strategies._RankCache(len(recipes) - 1)
+    for recipe in recipes[:-1]:
+        cache.rank(ranker, recipe, recipe)
+    assert cache.rank(ranker, recipes[0], recipes[0]) == 1
+    # the least recently used recipe is evicted once the cache is full
+    cache.rank(ranker, recipes[-1], recipes[-1])
+    assert cache._ranks.keys() == {recipes[0], recipes[2], recipes[3]}
+    assert cache.rank(ranker, recipes[1], recipes[1]) == len(calls)
+    assert len(calls) == len(recipes) + 1
+    cache.invalidate([dn.interfaces.MolIndex(2)], [])
+    assert cache._ranks.keys() == {recipes[0], recipes[3]}
+    cache.invalidate([], [dn.interfaces.OpIndex(0)])
+    assert cache._ranks.keys() == {recipes[3]}
+    assert cache.rank(ranker, recipes[3], recipes[3]) == len(recipes)
+    assert cache._by_mol.keys() == {3}
+    assert cache._by_op.keys() == {1}
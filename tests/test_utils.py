@@ -0,0 +1,36 @@
+"""Test utility functions."""
+
+import doranet as dn
+
+
+def test_parent_chains_batch():
+    engine = dn.create_engine()
+    network = engine.new_network()
+    for smi in ("CCO", "CC(C)=O", "O"):
+        network.add_mol(engine.mol.rdkit(smi))
+    network.add_op(engine.op.rdkit("[C;H2,H3:1]-[O;H1:2]>>[*:1]=[*:2]"))
+    network.add_op(
+        engine.op.rdkit(
+            "[O:1]=[C:2]-[C;H2,H3:3].[C:4]=[O:5]>>[*:1]=[*:2]-[*:3]=[*:4].[*:5]"
+        )
+    )
+    engine.strat.cartesian(network).expand(num_iter=2)
+    tracker = dn.utils.RxnTrackerDepthFirstNetwork(network)
+    targets = range(3, len(network.mols))
+    batch = {
+        target: list(chains)
+        for target, chains in tracker.getParentChainsBatch(
+            targets, {0, 1, 2}, max_depth=3
+        ).items()
+    }
+    assert any(batch.values())
+    for target in targets:
+        assert batch[target] == list(
+            tracker.getParentChains(target, {0, 1, 2}, max_depth=3)
+        )
+        pruned = list(
+            tracker.getParentChains(
+                target, {0, 1, 2}, max_depth=3, branching_factor=1
+            )
+        )
+        assert all(chain in batch[target] for chain in pruned)